@@ -0,0 +1,96 @@
+
+from g2l import *
+from g2l import generators
+import klayout.db as kl
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+# technology definitions
+import sky130
+
+# ------------------------------------------------------------------
+
+# A synthetic benchmark suite
+#
+# Runs the scalable graph generators at different sizes and reports
+# build, solve and produce times, iterations and peak memory as
+# one JSON object per line, e.g.
+#
+#   python benchmark.py --sizes 10 100 --output bench_output.txt
+
+benchmarks = {
+  "inverter_chain": lambda size: generators.inverter_chain(size),
+  "mosfet_array":   lambda size: generators.mosfet_array(size, max(1, size // 4)),
+  "via_farm":       lambda size: generators.via_farm(size, size),
+  "routing_mesh":   lambda size: generators.routing_mesh(size, size, 3)
+}
+
+def run(name: str, size: int, max_iter: int) -> dict:
+  """
+  Runs one benchmark case and returns the timing results
+  """
+
+  start = time.perf_counter()
+  graph = benchmarks[name](size)
+  build_time = time.perf_counter() - start
+
+  solver = Solver(graph)
+  start = time.perf_counter()
+  stats = solver.solve(max_iter = max_iter)
+  solve_time = time.perf_counter() - start
+
+  layout = kl.Layout()
+  cell = layout.create_cell("TOP")
+  start = time.perf_counter()
+  solver.produce(layout, cell)
+  produce_time = time.perf_counter() - start
+
+  return {
+    "benchmark": name,
+    "size": size,
+    "components": len(graph.components),
+    "x_indexes": len(solver.ix),
+    "y_indexes": len(solver.iy),
+    "build_time": build_time,
+    "solve_time": solve_time,
+    "box_generation_time": stats.box_generation_time,
+    "produce_time": produce_time,
+    "iterations": stats.iterations,
+    "status": stats.status
+  }
+
+def peak_memory(name: str, size: int, max_iter: int) -> int:
+  """
+  Runs one benchmark case again under tracemalloc and returns the peak memory in bytes
+  """
+
+  tracemalloc.start()
+  try:
+    run(name, size, max_iter)
+    return tracemalloc.get_traced_memory()[1]
+  finally:
+    tracemalloc.stop()
+
+parser = argparse.ArgumentParser(description = "Runs the g2l benchmark suite")
+parser.add_argument("--benchmarks", nargs = "+", choices = sorted(benchmarks.keys()), default = sorted(benchmarks.keys()), help = "the benchmarks to run")
+parser.add_argument("--sizes", nargs = "+", type = int, default = [ 5, 10, 20 ], help = "the sizes to run each benchmark with")
+parser.add_argument("--max-iter", type = int, default = 10, help = "the maximum number of solver iterations")
+parser.add_argument("--no-memory", action = "store_true", help = "skips the (slower) peak memory measurement")
+parser.add_argument("--output", help = "writes the results to this file instead of stdout")
+args = parser.parse_args()
+
+output = open(args.output, "w") if args.output else sys.stdout
+
+for name in args.benchmarks:
+  for size in args.sizes:
+    result = run(name, size, args.max_iter)
+    # NOTE: tracemalloc slows down execution, hence the memory is measured in a separate run
+    result["peak_memory"] = None if args.no_memory else peak_memory(name, size, args.max_iter)
+    output.write(json.dumps(result) + "\n")
+    output.flush()
+
+if args.output:
+  output.close()
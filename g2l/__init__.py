@@ -1,13 +1,27 @@
 
+from .rect import Rect
 from .box import Box
 from .node import Node, n
 from .component import Component
-from .graph import Graph
+from .graph import Graph, FrozenGraph
 from .via import Via
 from .wire import Wire
 from .mosfet import MOSFET
 from .solver import Solver
-from .tech import Tech
+from .stats import SolverStats, TraceRecorder
+from .cancel import CancellationToken
+from .memory import MemoryProfiler
+from .tech import Tech, LayerInteractions
+from .batch import solve_batch
+from .block import Block, BlockInstance
+from .coordinates import write_coordinates, read_coordinates
+from .shards import build_sharded
+from .shared import SharedGraph
+from .simplify import simplify_graph
+from .sweep import solve_sweep
+from .tracker import ProduceTracker
+from .verify import verify, Violation
+from .serialize import register_component, graph_to_dict, graph_from_dict, dump_graph, load_graph
 
-__all__ = [ "Box", "Node", "n", "Component", "Graph", "MOSFET", "Solver", "Via", "Wire", "Tech" ]
+__all__ = [ "Block", "BlockInstance", "Box", "CancellationToken", "Node", "n", "Component", "FrozenGraph", "Graph", "LayerInteractions", "MemoryProfiler", "MOSFET", "ProduceTracker", "Rect", "SharedGraph", "Solver", "SolverStats", "TraceRecorder", "Via", "Violation", "Wire", "Tech", "build_sharded", "solve_batch", "register_component", "graph_to_dict", "graph_from_dict", "dump_graph", "load_graph", "read_coordinates", "simplify_graph", "solve_sweep", "verify", "write_coordinates" ]
 
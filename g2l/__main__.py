@@ -0,0 +1,130 @@
+
+# -------------------------------------------------------------
+# The g2l command line
+#
+# Solves graph files (see "dump_graph") and produces them as
+# cells of one GDS or OASIS file, e.g.
+#
+#   python -m g2l --tech sky130 --jobs 4 --cache .g2l-cache -o out.gds inv.json nand.json
+#
+# Each graph becomes a cell named after the graph file. With
+# "--cache", solutions are stored per graph, technology and
+# solve options (see "write_coordinates"), so unchanged graphs
+# are not solved again. The technology enters the cache key by
+# the name and the source of its module, so editing the rules
+# invalidates the cached solutions. With "--profile", the solver statistics
+# and a Chrome trace are written next to the output file.
+
+from .batch import _solve_all
+from .coordinates import write_coordinates
+from .serialize import load_graph, graph_to_dict, graph_key
+from .solver import Solver
+from .stats import TraceRecorder
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import sys
+
+def main(argv: [str] = None) -> int:
+  """
+  Runs the command line
+
+  :param argv: the command line arguments (default: sys.argv[1:])
+
+  :returns The exit code
+  """
+
+  parser = argparse.ArgumentParser(prog = "g2l", description = "Solves g2l graph files and produces layout")
+  parser.add_argument("graphs", nargs = "+", help = "the graph files (JSON, see g2l.dump_graph)")
+  parser.add_argument("--tech", required = True, help = "the technology module to import (e.g. sky130)")
+  parser.add_argument("-o", "--output", required = True, help = "the layout file to write (.gds or .oas)")
+  parser.add_argument("--jobs", type = int, default = 1, help = "the number of worker processes for solving (0: number of CPUs)")
+  parser.add_argument("--cache", help = "a directory for caching solutions")
+  parser.add_argument("--profile", action = "store_true", help = "write solver statistics and a Chrome trace next to the output file")
+  parser.add_argument("--max-iter", type = int, default = 10, help = "the maximum number of solver iterations")
+  parser.add_argument("--windowed", action = "store_true", help = "use the windowed sweep mode")
+  args = parser.parse_args(argv)
+
+  if not args.output.endswith((".gds", ".oas")):
+    parser.error(f"Output file needs to have a .gds or .oas suffix: {args.output}")
+
+  tech_module = importlib.import_module(args.tech)
+
+  import klayout.db as kl
+
+  solve_args = { "max_iter": args.max_iter, "windowed": args.windowed }
+
+  graphs = []
+  names = set()
+  for filename in args.graphs:
+    name = os.path.splitext(os.path.basename(filename))[0]
+    if name in names:
+      parser.error(f"Duplicate graph name: {name}")
+    names.add(name)
+    graphs.append((name, load_graph(filename)))
+
+  # look up cached solutions
+  solvers = {}
+  cache_files = {}
+  to_solve = []
+  for (name, graph) in graphs:
+    solver = Solver(graph)
+    solvers[name] = solver
+    if args.cache is not None:
+      key = graph_key(graph_to_dict(graph), solve = solve_args, tech = args.tech, tech_source = _source_hash(tech_module))
+      cache_files[name] = os.path.join(args.cache, key + ".g2lc")
+      if os.path.exists(cache_files[name]):
+        solver.read_coordinates(cache_files[name])
+        continue
+    to_solve.append((name, graph))
+
+  trace = TraceRecorder() if args.profile else None
+
+  jobs = args.jobs or None
+  for ((name, graph), (x_coordinates, y_coordinates, stats, worker_trace)) in zip(to_solve, _solve_all(to_solve, args.tech, jobs, solve_args, args.profile)):
+    solver = solvers[name]
+    solver.x_coordinates = x_coordinates
+    solver.y_coordinates = y_coordinates
+    solver.stats = stats
+    if worker_trace is not None:
+      trace.merge(worker_trace)
+    if name in cache_files:
+      os.makedirs(args.cache, exist_ok = True)
+      write_coordinates(cache_files[name], x_coordinates, y_coordinates, os.path.basename(cache_files[name])[:32])
+    if not stats.converged:
+      print(f"Warning: {name} did not converge ({stats.status})", file = sys.stderr)
+
+  layout = kl.Layout()
+  for (name, graph) in graphs:
+    if trace is not None:
+      with trace.span("produce", cat = "g2l", graph = name):
+        solvers[name].produce(layout, layout.create_cell(name))
+    else:
+      solvers[name].produce(layout, layout.create_cell(name))
+
+  layout.write(args.output)
+
+  if args.profile:
+    stats = { name: (s.stats.to_dict() if s.stats is not None else { "cached": True }) for (name, s) in solvers.items() }
+    with open(args.output + ".stats.json", "w") as file:
+      json.dump(stats, file, indent = 1)
+    trace.write(args.output + ".trace.json")
+
+  return 0
+
+
+def _source_hash(module) -> str:
+  """
+  Computes a hash of a module's source file (None if the module has no file)
+  """
+  filename = getattr(module, "__file__", None)
+  if filename is None:
+    return None
+  with open(filename, "rb") as file:
+    return hashlib.sha256(file.read()).hexdigest()
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,124 @@
+
+from .graph import Graph
+from .shared import SharedGraph
+from .solver import Solver
+from .stats import SolverStats, TraceRecorder
+import importlib
+import multiprocessing
+import typing
+
+if typing.TYPE_CHECKING:
+  import klayout.db as kl
+
+def solve_batch(graphs, layout: "kl.Layout", tech: str = None, jobs: int = None, shared: bool = False, **solve_args) -> { str: SolverStats }:
+  """
+  Solves many graphs in a process pool and produces them as cells of one layout
+
+  The graphs are solved in worker processes. The coordinates are
+  sent back and the graphs are produced into new cells of the given
+  layout, named after the graphs. Cells are created in the order
+  the graphs are given, regardless of the order in which the
+  workers finish.
+
+  Each worker imports the technology module once when it starts,
+  so the technology setup is paid once per worker rather than once
+  per graph. The graphs need to be picklable - this is the case for
+  the standard components if the technology module can be imported
+  by the workers.
+
+  With "shared", the graphs are not pickled. Instead, their boxes
+  and space rules are published in shared memory (see 
+  "SharedGraph") and the workers attach to them by name. The 
+  workers then neither need the component classes nor the 
+  technology. The boxes are generated in this process in that 
+  case.
+
+  :param graphs: a dict of name to Graph or an iterable of (name, Graph) pairs
+  :param layout: the layout to create the cells in
+  :param tech: the name of the technology module to import in the workers (e.g. "sky130")
+  :param jobs: the number of worker processes (default: number of CPUs, 1: solve in this process)
+  :param shared: if True, send the graphs to the workers through shared memory
+  :param solve_args: additional arguments passed to "Solver.solve" (need to be picklable)
+
+  :returns A dict of name to SolverStats in the order of the graphs
+  """
+
+  if isinstance(graphs, dict):
+    graphs = graphs.items()
+  graphs = list(graphs)
+
+  results = {}
+  for ((name, graph), (x_coordinates, y_coordinates, stats, trace)) in zip(graphs, _solve_all(graphs, tech, jobs, solve_args, shared = shared)):
+    solver = Solver(graph)
+    solver.x_coordinates = x_coordinates
+    solver.y_coordinates = y_coordinates
+    solver.stats = stats
+    solver.produce(layout, layout.create_cell(name))
+    results[name] = stats
+
+  return results
+
+
+def _solve_all(graphs: [ (str, Graph) ], tech: str, jobs: int, solve_args: dict, trace: bool = False, shared: bool = False):
+  """
+  Solves the graphs in a process pool and delivers the results in the order of the graphs
+
+  Each result is a tuple of x coordinates, y coordinates, the
+  statistics and the trace (a TraceRecorder if "trace" is True, 
+  otherwise None). With "shared", the graphs are sent to the 
+  workers as SharedGraph names.
+  """
+
+  if jobs is None:
+    jobs = multiprocessing.cpu_count()
+
+  tasks = [ (name, graph, solve_args, trace) for (name, graph) in graphs ]
+
+  if jobs <= 1 or len(tasks) <= 1:
+    if tech is not None:
+      importlib.import_module(tech)
+    yield from map(_solve_task, tasks)
+  else:
+    published = []
+    try:
+      if shared:
+        if tech is not None:
+          importlib.import_module(tech)
+        for (name, graph) in graphs:
+          published.append(SharedGraph.publish(graph))
+        tasks = [ (name, sg.name, solve_args, trace) for ((name, graph), sg) in zip(graphs, published) ]
+      with multiprocessing.Pool(min(jobs, len(tasks)), initializer = _init_worker, initargs = (tech, )) as pool:
+        # imap delivers the results in task order as they become available
+        yield from pool.imap(_solve_task, tasks)
+    finally:
+      for sg in published:
+        sg.close()
+
+
+def _init_worker(tech: str):
+  """
+  Prepares a worker process
+  """
+  if tech is not None:
+    importlib.import_module(tech)
+
+
+def _solve_task(task: (str, Graph, dict, bool)) -> ({ int: float }, { int: float }, SolverStats, TraceRecorder):
+  """
+  Solves one graph (in the worker process)
+
+  The graph is either a Graph object or the name of a SharedGraph.
+  """
+  (name, graph, solve_args, trace) = task
+  recorder = None
+  if trace:
+    recorder = TraceRecorder()
+    solve_args = dict(solve_args, trace = recorder)
+  if isinstance(graph, str):
+    with SharedGraph.attach(graph) as sg:
+      solver = sg.solver()
+      stats = solver.solve(**solve_args)
+  else:
+    solver = Solver(graph)
+    stats = solver.solve(**solve_args)
+  return (solver.x_coordinates, solver.y_coordinates, stats, recorder)
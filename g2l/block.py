@@ -0,0 +1,172 @@
+
+from .component import Component
+from .graph import Graph
+from .solver import Solver
+from .stats import SolverStats
+from .box import Box
+from .node import Node
+from .rect import Rect
+import typing
+import weakref
+
+if typing.TYPE_CHECKING:
+  import klayout.db as kl
+
+class Block(object):
+
+  """
+  A reusable sub-graph
+
+  A block wraps a graph which is solved once. It can then be
+  placed many times in parent graphs using "BlockInstance"
+  components. Inside the parent graph, the block is represented
+  by its footprint - one bounding box per layer. When the parent
+  is produced, the block is produced once into a cell of its own
+  and placed as a cell instance.
+
+  The block's origin is the physical 0,0 point of the solved
+  sub-graph, i.e. the location of the lowest grid indexes.
+
+  Public attributes:
+  * name: the block name (also the name of the block cell, see "cell")
+  * graph: the sub-graph
+  """
+
+  def __init__(self, name: str, graph: Graph, **solve_args):
+    """
+    Creates a block
+
+    :param name: the name of the block
+    :param graph: the sub-graph
+    :param solve_args: arguments passed to "Solver.solve" when the block is solved
+    """
+    self.name = name
+    self.graph = graph
+    self.solve_args = solve_args
+    self._solver = None
+    self._geometry = None
+    self._footprint = None
+    self._cells = weakref.WeakKeyDictionary()
+
+  def solve(self) -> SolverStats:
+    """
+    Solves the block
+
+    The block is solved only once. Subsequent calls will return
+    the statistics of the first run.
+    """
+    if self._solver is None:
+      solver = Solver(self.graph)
+      solver.solve(**self.solve_args)
+      self._solver = solver
+    return self._solver.stats
+
+  def geometry(self) -> [ [int, Rect] ]:
+    """
+    Gets the geometry of the solved block
+
+    The geometry is computed once and shared by all instances,
+    so the returned list must not be modified.
+
+    :returns A list of [ layer, physical box ] pairs relative to the block's origin
+    """
+    if self._geometry is None:
+      self.solve()
+      solver = self._solver
+      geometry = []
+      for c in self.graph.components:
+        geometry += c.geometry(self.graph, solver.x_coordinates, solver.y_coordinates)
+      self._geometry = geometry
+    return self._geometry
+
+  def footprint(self) -> { int: Rect }:
+    """
+    Gets the footprint of the block
+
+    :returns The bounding box per layer relative to the block's origin
+    """
+    if self._footprint is None:
+      footprint = {}
+      for (layer, box) in self.geometry():
+        if layer in footprint:
+          footprint[layer] += box
+        else:
+          footprint[layer] = Rect(box)
+      self._footprint = footprint
+    return self._footprint
+
+  def cell(self, layout: "kl.Layout") -> "kl.Cell":
+    """
+    Gets the block cell in the given layout
+
+    The cell is produced once per layout and block. It is named 
+    after the block. If the layout holds a cell of that name already
+    (e.g. from another block with the same name), a unique name is
+    derived from it.
+    """
+    cell_index = self._cells.get(layout)
+    if cell_index is not None:
+      return layout.cell(cell_index)
+    self.solve()
+    cell = layout.create_cell(layout.unique_cell_name(self.name))
+    self._solver.produce(layout, cell)
+    self._cells[layout] = cell.cell_index()
+    return cell
+
+
+class BlockInstance(Component):
+
+  """
+  Places a block inside a graph
+
+  The block instance is a macro component sitting on a single
+  node. The block's origin is placed at the node's location.
+  The footprint of the block determines the boxes the solver
+  considers.
+  """
+
+  def __init__(self, node: Node, block: Block):
+    """
+    Creates a block instance
+
+    :param node: the node where the block's origin is placed
+    :param block: the block to place
+    """
+    self.node = node
+    self.block = block
+
+  def nodes(self) -> [Node]:
+    """
+    Reimplementation of the Component interface
+    """
+    return [ self.node ]
+
+  def layers(self) -> [int]:
+    """
+    Reimplementation of the Component interface
+    """
+    return list(self.block.footprint().keys())
+
+  def boxes(self, graph) -> [Box]:
+    """
+    Delivers the footprint boxes of the block
+    """
+    v = self.node
+    return [ Box(v.ix, v.iy, v.ix, v.iy, box, layer) for (layer, box) in self.block.footprint().items() ]
+
+  def geometry(self, graph, x_coordinates: { int: float }, y_coordinates: { int: float }) -> [ [int, Rect] ]:
+    """
+    Delivers the flat geometry of the block at its final location
+    """
+    dx = x_coordinates[self.node.ix]
+    dy = y_coordinates[self.node.iy]
+    return [ [ layer, box.moved(dx, dy) ] for (layer, box) in self.block.geometry() ]
+
+  def produce(self, graph, x_coordinates: { int: float }, y_coordinates: { int: float }, layout: "kl.Layout", cell: "kl.Cell", layers: { int: int }) -> list:
+    """
+    Places the block cell as an instance
+    """
+    import klayout.db as kl
+    block_cell = self.block.cell(layout)
+    trans = kl.DCplxTrans(x_coordinates[self.node.ix], y_coordinates[self.node.iy])
+    return [ cell.insert(kl.DCellInstArray(block_cell.cell_index(), trans)) ]
@@ -1,7 +1,10 @@
 
-import klayout.db as kl
+from .rect import Rect
 import typing
 
+if typing.TYPE_CHECKING:
+  import klayout.db as kl
+
 class Box(object):
 
   """
@@ -15,7 +18,7 @@ class Box(object):
   The physical dimensions are determined finally by the 
   positions of these grid coordinates, folded with the footprint
   box. The footprint box is a box normalized to 0,0 grid location
-  and is given as a KLayout DBox object. The final dimensions
+  and is given as a Rect object. The final dimensions
   are determined by shifting and stretching this box according
   to the physical grid locations.
 
@@ -23,7 +26,7 @@ class Box(object):
   layer. The values are technology specific.
   """
   
-  def __init__(self, ix1: int, iy1: int, ix2: int, iy2: int, box: kl.DBox, layer: int):
+  def __init__(self, ix1: int, iy1: int, ix2: int, iy2: int, box: Rect, layer: int):
     """
     Creates a Box object
 
@@ -31,7 +34,7 @@ class Box(object):
     :param iy1: the bottom abstract grid coordinate
     :param ix2: the right abstract grid coordinate
     :param iy2: the top abstract grid coordinate
-    :param box: the footprint box
+    :param box: the footprint box (a KLayout DBox is converted into a Rect)
     :param layer: the layer the box sits at
     """
 
@@ -40,7 +43,7 @@ class Box(object):
     self.ix2 = ix2
     self.iy2 = iy2
     self.layer = layer
-    self.box = box
+    self.box = box if isinstance(box, Rect) else Rect(box)
 
   def ixory1(self, h: bool) -> int:
     """
@@ -96,7 +99,7 @@ class Box(object):
     """
     return f"{self.ix1}/{self.iy1}..{self.ix2}/{self.iy2} layer={self.layer} box={str(self.box)}"
 
-  def edge(self, sx: int, sy: int) -> kl.DEdge:
+  def edge(self, sx: int, sy: int) -> "kl.DEdge":
     """
     Gets one edge of the footprint box
 
@@ -109,10 +112,12 @@ class Box(object):
     * sx = 0, sy = -1: bottom side
     * sx = 0, sy = 1: top side
     """
+    import klayout.db as kl
+    box = self.box
     if sy == 0:
-      x = self.box.left + 0.5 * (sx + 1) * self.box.width
+      x = box.left + 0.5 * (sx + 1) * box.width()
       return kl.DEdge(x, box.bottom, x, box.top)
     else:
-      y = self.box.bottom + 0.5 * (sy + 1) * self.box.height
+      y = box.bottom + 0.5 * (sy + 1) * box.height()
       return kl.DEdge(box.left, y, box.right, y)
 
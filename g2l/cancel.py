@@ -0,0 +1,28 @@
+
+import threading
+
+class CancellationToken(object):
+
+  """
+  A token for cancelling a running solver
+
+  Pass the token to "Solver.solve" and call "cancel" from
+  another thread (e.g. a request handler) to make the solver
+  stop at the next column or row.
+  """
+
+  def __init__(self):
+    self._event = threading.Event()
+
+  def cancel(self):
+    """
+    Requests cancellation
+    """
+    self._event.set()
+
+  @property
+  def cancelled(self) -> bool:
+    """
+    Returns True, if cancellation was requested
+    """
+    return self._event.is_set()
@@ -1,7 +1,11 @@
 
 from .node import Node
 from .box import Box
-import klayout.db as kl
+from .rect import Rect
+import typing
+
+if typing.TYPE_CHECKING:
+  import klayout.db as kl
 
 class Component(object):
 
@@ -55,6 +59,24 @@ class Component(object):
     """
     return []
 
+  @classmethod
+  def boxes_for_all(cls, graph, components: ["Component"]) -> [ [Box] ]:
+    """
+    Returns the abstract boxes for many components of this class at once
+
+    The solver calls this method once per component class with
+    all components of exactly this class. Component classes can
+    reimplement it to share work between the instances, e.g. 
+    footprints which are identical for many instances. The 
+    default implementation calls "boxes" for each component.
+
+    :param graph: the graph object (Graph)
+    :param components: the components to deliver the boxes for
+
+    :returns A list with the boxes per component in the order of the components
+    """
+    return [ c.boxes(graph) for c in components ]
+
   def via_bottom_layer(self) -> int:
     """
     For via components: returns the bottom layer
@@ -67,6 +89,17 @@ class Component(object):
     """
     return None
 
+  def to_dict(self) -> dict:
+    """
+    Returns the component parameters as a plain dict for serialization
+
+    Components which can be serialized need to reimplement this
+    method and provide a "from_dict" class method which creates
+    the component from such a dict. The base implementation 
+    returns None, indicating that the component cannot be serialized.
+    """
+    return None
+
   def is_horizontal(self) -> bool:
     """
     Returns a value indicating whether the component has horizonal orientation
@@ -74,7 +107,7 @@ class Component(object):
     return self.nodes()[0].iy == self.nodes()[-1].iy;
 
   # default implementation, based on the outline boxes
-  def geometry(self, graph, x_coordinates: { int: float }, y_coordinates: { int: float }) -> [ [int, kl.DBox] ]:
+  def geometry(self, graph, x_coordinates: { int: float }, y_coordinates: { int: float }) -> [ [int, Rect] ]:
     """
     Renders a list of physical boxes
     :param graph: the graph object (Graph)
@@ -83,10 +116,29 @@ class Component(object):
 
     :returns A list of [ layer, physical box ] pairs with the final geometry
     """
-    return self.geometry_for_boxes(x_coordinates, y_coordinates, self.boxes(graph))
+    return self.geometry_for_boxes(x_coordinates, y_coordinates, graph.component_boxes(self))
+
+  def produce(self, graph, x_coordinates: { int: float }, y_coordinates: { int: float }, layout: "kl.Layout", cell: "kl.Cell", layers: { int: int }) -> list:
+    """
+    Inserts the final geometry into a cell
+
+    The default implementation inserts the boxes delivered
+    by "geometry". Components can reimplement this method to 
+    insert other objects, such as cell instances.
+
+    :param graph: the graph object (Graph)
+    :param x_coordinates: gives physical coordinates for abstract ones
+    :param y_coordinates: gives physical coordinates for abstract ones
+    :param layout: the layout to produce the geometry in
+    :param cell: the cell to produce the geometry in
+    :param layers: the KLayout layer indexes per layer number (see "Tech.rules.create_layers")
+
+    :returns A list of the objects (KLayout Shape or Instance objects) created
+    """
+    return [ cell.shapes(layers[layer]).insert(box.to_dbox()) for (layer, box) in self.geometry(graph, x_coordinates, y_coordinates) ]
 
   @staticmethod
-  def geometry_for_boxes(x_coordinates: { int: float }, y_coordinates: { int: float }, boxes: [Box]) -> [ [int, kl.DBox] ]:
+  def geometry_for_boxes(x_coordinates: { int: float }, y_coordinates: { int: float }, boxes: [Box]) -> [ [int, Rect] ]:
     """
     Renders a list of physical boxes from given abstract boxes
 
@@ -96,5 +148,5 @@ class Component(object):
 
     :returns A list of [ layer, physical box ] pairs with the final geometry
     """
-    return [ [ b.layer, b.box * kl.DBox(x_coordinates[b.ix1], y_coordinates[b.iy1], x_coordinates[b.ix2], y_coordinates[b.iy2]) ] for b in boxes ]
+    return [ [ b.layer, b.box * Rect(x_coordinates[b.ix1], y_coordinates[b.iy1], x_coordinates[b.ix2], y_coordinates[b.iy2]) ] for b in boxes ]
 
@@ -0,0 +1,128 @@
+
+import array
+import os
+import struct
+import sys
+
+# The raw coordinate file format (all values little-endian):
+#
+#   offset  size      content
+#   0       4         magic "G2LC"
+#   4       4         format version (uint32, currently 1)
+#   8       8         number of x indexes NX (uint64)
+#   16      8         number of y indexes NY (uint64)
+#   24      32        key (e.g. a graph hash), zero-padded
+#   56      8*NX      x indexes (int64, ascending)
+#   ...     8*NX      x coordinates (float64)
+#   ...     8*NY      y indexes (int64, ascending)
+#   ...     8*NY      y coordinates (float64)
+#
+# All arrays are 8-byte aligned, so they can be memory-mapped
+# directly, e.g. with numpy:
+#
+#   nx = ...  # from the header
+#   x_indexes = numpy.memmap(filename, dtype = "<i8", mode = "r", offset = 56, shape = (nx, ))
+
+_MAGIC = b"G2LC"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIQQ32s")
+
+
+def write_coordinates(filename: str, x_coordinates: { int: float }, y_coordinates: { int: float }, key: str = None):
+  """
+  Writes solved coordinates to a file
+
+  By default, a compact raw binary file is written (see the format
+  description in this module). If the file name ends with ".npz",
+  a numpy archive with "x_index", "x", "y_index", "y" and "key"
+  arrays is written instead. This requires numpy.
+
+  :param filename: the file to write
+  :param x_coordinates: the x coordinates per grid index
+  :param y_coordinates: the y coordinates per grid index
+  :param key: an optional key (up to 32 bytes in UTF-8 encoding), e.g. the graph hash
+  """
+
+  key_bytes = (key or "").encode("utf-8")
+  if len(key_bytes) > 32:
+    raise Exception(f"Key too long (max. 32 bytes): {key}")
+
+  ix = sorted(x_coordinates.keys())
+  iy = sorted(y_coordinates.keys())
+
+  if filename.endswith(".npz"):
+    numpy = _import_numpy()
+    numpy.savez(filename,
+                x_index = numpy.array(ix, dtype = "<i8"), x = numpy.array([ x_coordinates[i] for i in ix ], dtype = "<f8"),
+                y_index = numpy.array(iy, dtype = "<i8"), y = numpy.array([ y_coordinates[i] for i in iy ], dtype = "<f8"),
+                key = numpy.array(key or ""))
+    return
+
+  with open(filename, "wb") as file:
+    file.write(_HEADER.pack(_MAGIC, _VERSION, len(ix), len(iy), key_bytes))
+    for (indexes, coordinates) in ((ix, x_coordinates), (iy, y_coordinates)):
+      _write_array(file, array.array("q", indexes))
+      _write_array(file, array.array("d", [ coordinates[i] for i in indexes ]))
+
+
+def read_coordinates(filename: str) -> ({ int: float }, { int: float }, str):
+  """
+  Reads coordinates from a file written by "write_coordinates"
+
+  :returns A tuple of x coordinates, y coordinates and the key (None if no key was given)
+  """
+
+  if filename.endswith(".npz"):
+    numpy = _import_numpy()
+    with numpy.load(filename) as data:
+      x_coordinates = dict(zip(data["x_index"].tolist(), data["x"].tolist()))
+      y_coordinates = dict(zip(data["y_index"].tolist(), data["y"].tolist()))
+      key = str(data["key"])
+    return (x_coordinates, y_coordinates, key or None)
+
+  with open(filename, "rb") as file:
+
+    header = file.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+      raise Exception(f"Not a coordinate file (too short): {filename}")
+    (magic, version, nx, ny, key_bytes) = _HEADER.unpack(header)
+    if magic != _MAGIC:
+      raise Exception(f"Not a coordinate file (invalid magic): {filename}")
+    if version != _VERSION:
+      raise Exception(f"Unsupported coordinate file version {version}: {filename}")
+
+    size = _HEADER.size + 16 * (nx + ny)
+    actual_size = os.fstat(file.fileno()).st_size
+    if actual_size != size:
+      raise Exception(f"Invalid coordinate file (expected {size} bytes for {nx} x and {ny} y indexes, got {actual_size}): {filename}")
+
+    coordinates = []
+    for n in (nx, ny):
+      indexes = _read_array(file, "q", n)
+      values = _read_array(file, "d", n)
+      coordinates.append(dict(zip(indexes, values)))
+
+  key = key_bytes.rstrip(b"\0").decode("utf-8")
+  return (coordinates[0], coordinates[1], key or None)
+
+
+def _write_array(file, a: array.array):
+  if sys.byteorder != "little":
+    a.byteswap()
+  a.tofile(file)
+
+
+def _read_array(file, typecode: str, n: int) -> array.array:
+  a = array.array(typecode)
+  a.fromfile(file, n)
+  if sys.byteorder != "little":
+    a.byteswap()
+  return a
+
+
+def _import_numpy():
+  try:
+    import numpy
+  except ImportError:
+    raise Exception("NPZ format requires numpy")
+  return numpy
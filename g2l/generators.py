@@ -0,0 +1,180 @@
+
+from .graph import Graph
+from .node import n
+from .wire import Wire
+from .via import Via
+from .mosfet import MOSFET
+from .tech import Tech
+
+# Scalable graph generators
+#
+# These functions build synthetic graphs of configurable size
+# from the basic components. They are intended for benchmarking
+# and scaling tests. The layers are taken from the technology
+# singleton (Tech.rules) by their generic names, so a technology
+# needs to be installed before the generators are used.
+
+def inverter_chain(count: int) -> Graph:
+  """
+  Generates a chain of inverters
+
+  Each inverter is made from a PMOS and a NMOS device with
+  contacted source and drain, a poly gate with a contact and
+  a metal1 connection from the previous inverter's output.
+  VDD and VSS are metal1 rails running along the chain.
+
+  :param count: the number of inverters
+  """
+
+  diff    = Tech.rules.layer("diff")
+  contact = Tech.rules.layer("contact")
+  poly    = Tech.rules.layer("poly")
+  metal1  = Tech.rules.layer("metal1")
+
+  metal1w = Tech.rules.default_wire_width(metal1)
+  polyw   = Tech.rules.default_wire_width(poly)
+
+  l       = Tech.mosfets.default_mos_length()
+  wp      = Tech.mosfets.min_pmos_width() * 2
+  wn      = Tech.mosfets.min_nmos_width() * 2
+
+  graph = Graph()
+
+  for k in range(0, count):
+
+    (s, g, d) = (3 * k, 3 * k + 1, 3 * k + 2)
+
+    graph.add(MOSFET(n(g, 3), n(s, 3), n(d, 3), wp, l))
+    graph.add(MOSFET(n(g, 1), n(s, 1), n(d, 1), wn, l))
+
+    # supply
+    for (y, rail) in ((3, 4), (1, 0)):
+      graph.add(Via(n(s, y), diff, contact, metal1))
+      graph.add(Wire(metal1w, metal1, n(s, y), n(s, rail)))
+      graph.add(Wire(0.5, metal1, n(s, rail), n(s + 3, rail)))
+
+    # output
+    graph.add(Via(n(d, 3), diff, contact, metal1))
+    graph.add(Via(n(d, 1), diff, contact, metal1))
+    graph.add(Wire(metal1w, metal1, n(d, 1), n(d, 2)))
+    graph.add(Wire(metal1w, metal1, n(d, 2), n(d, 3)))
+
+    # gate and input
+    graph.add(Wire(polyw, poly, n(g, 1), n(g, 2)))
+    graph.add(Wire(polyw, poly, n(g, 2), n(g, 3)))
+    graph.add(Via(n(g, 2), poly, contact, metal1))
+    if k > 0:
+      graph.add(Wire(metal1w, metal1, n(s - 1, 2), n(g, 2)))
+
+  return graph
+
+
+def mosfet_array(nx: int, ny: int) -> Graph:
+  """
+  Generates an array of MOSFET devices
+
+  The array has "ny" rows of "nx" devices each. The devices
+  of one row share source and drain areas. Every source/drain
+  node has a contact and every gate a vertical poly stub.
+
+  :param nx: the number of devices per row
+  :param ny: the number of rows
+  """
+
+  diff    = Tech.rules.layer("diff")
+  contact = Tech.rules.layer("contact")
+  poly    = Tech.rules.layer("poly")
+  metal1  = Tech.rules.layer("metal1")
+
+  polyw   = Tech.rules.default_wire_width(poly)
+
+  l       = Tech.mosfets.default_mos_length()
+  w       = Tech.mosfets.min_nmos_width() * 2
+
+  graph = Graph()
+
+  for j in range(0, ny):
+
+    y = 2 * j
+
+    for i in range(0, nx):
+      graph.add(MOSFET(n(2 * i + 1, y), n(2 * i, y), n(2 * i + 2, y), w, l))
+      graph.add(Wire(polyw, poly, n(2 * i + 1, y), n(2 * i + 1, y + 1)))
+
+    for i in range(0, nx + 1):
+      graph.add(Via(n(2 * i, y), diff, contact, metal1))
+
+  return graph
+
+
+def via_farm(nx: int, ny: int) -> Graph:
+  """
+  Generates a grid of crossing metal1/metal2 wires with vias at each crossing
+
+  :param nx: the number of vertical metal2 wires
+  :param ny: the number of horizontal metal1 wires
+  """
+
+  metal1  = Tech.rules.layer("metal1")
+  via1    = Tech.rules.layer("via1")
+  metal2  = Tech.rules.layer("metal2")
+
+  metal1w = Tech.rules.default_wire_width(metal1)
+  metal2w = Tech.rules.default_wire_width(metal2)
+
+  graph = Graph()
+
+  for j in range(0, ny):
+    for i in range(0, nx - 1):
+      graph.add(Wire(metal1w, metal1, n(i, j), n(i + 1, j)))
+
+  for i in range(0, nx):
+    for j in range(0, ny - 1):
+      graph.add(Wire(metal2w, metal2, n(i, j), n(i, j + 1)))
+
+  for i in range(0, nx):
+    for j in range(0, ny):
+      graph.add(Via(n(i, j), metal1, via1, metal2))
+
+  return graph
+
+
+def routing_mesh(nx: int, ny: int, levels: int = 3) -> Graph:
+  """
+  Generates a multi-layer routing mesh
+
+  The mesh uses the metal layers "metal1" to "metal<levels>" with
+  alternating horizontal and vertical wire direction. Every
+  layer is split into wire segments between adjacent nodes.
+  Vias connect adjacent metal layers on a checkerboard pattern.
+
+  :param nx: the number of columns
+  :param ny: the number of rows
+  :param levels: the number of metal layers (2 to 5)
+  """
+
+  metals = [ Tech.rules.layer(f"metal{k}") for k in range(1, levels + 1) ]
+  vias = [ Tech.rules.layer(f"via{k}") for k in range(1, levels) ]
+
+  graph = Graph()
+
+  for (k, metal) in enumerate(metals):
+
+    width = Tech.rules.default_wire_width(metal) or 0.2
+
+    if k % 2 == 0:
+      for j in range(0, ny):
+        for i in range(0, nx - 1):
+          graph.add(Wire(width, metal, n(i, j), n(i + 1, j)))
+    else:
+      for i in range(0, nx):
+        for j in range(0, ny - 1):
+          graph.add(Wire(width, metal, n(i, j), n(i, j + 1)))
+
+  for (k, via) in enumerate(vias):
+    for i in range(0, nx):
+      for j in range(0, ny):
+        if (i + j + k) % 2 == 0:
+          graph.add(Via(n(i, j), metals[k], via, metals[k + 1]))
+
+  return graph
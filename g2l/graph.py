@@ -1,5 +1,7 @@
 
+from .box import Box
 from .component import Component
+from .node import Node
 
 class Graph(object):
 
@@ -10,6 +12,15 @@ class Graph(object):
   which connect to each other through abstract layout
   nodes.
 
+  A graph must not be filled from multiple threads at the same
+  time. To build a graph concurrently, build independent shards
+  and merge them (see "merge" and "build_sharded").
+
+  Once complete, a graph can be compiled into an immutable form
+  which computes per-component data such as node lists and
+  abstract boxes only once (see "freeze"). The solver works from
+  that form.
+
   Public attributes:
   * components: The list of components
   """
@@ -47,6 +58,36 @@ class Graph(object):
         self.components_per_layer[l].append(component)
 
 
+  def merge(self, *graphs: "Graph"):
+    """
+    Adds the components of other graphs to this graph
+
+    This is the counterpart of building a graph in shards (see
+    "build_sharded"): each shard is a graph filled independently,
+    e.g. in a thread or worker process of its own. Merging 
+    combines the shards' indexes directly instead of adding the
+    components one by one. The other graphs are not modified.
+
+    The components are appended in the order of the graphs given.
+    """
+
+    for g in graphs:
+
+      if g is self:
+        raise Exception("A graph cannot be merged into itself")
+
+      self.components += g.components
+      self.x_indexes |= g.x_indexes
+      self.y_indexes |= g.y_indexes
+
+      for (target, source) in ((self.components_per_index, g.components_per_index), (self.components_per_layer, g.components_per_layer)):
+        for (key, components) in source.items():
+          mine = target.get(key)
+          if mine is None:
+            target[key] = list(components)
+          else:
+            mine += components
+
   def components_for_node(self, ixy: (int, int)) -> [Component]:
     """
     Gets the components attached to a certain node
@@ -55,4 +96,183 @@ class Graph(object):
       return []
     else:
       return self.components_per_index[ixy]
-      
+
+  def component_nodes(self, component: Component) -> [Node]:
+    """
+    Gets the nodes of a component (see "Component.nodes")
+
+    Components use this method instead of asking other components
+    directly, so a frozen graph can deliver the cached node lists.
+    """
+    return component.nodes()
+
+  def component_layers(self, component: Component) -> [int]:
+    """
+    Gets the layers of a component (see "Component.layers")
+    """
+    return component.layers()
+
+  def is_horizontal(self, component: Component) -> bool:
+    """
+    Gets a value indicating whether a component has horizontal orientation (see "Component.is_horizontal")
+    """
+    return component.is_horizontal()
+
+  def component_boxes(self, component: Component) -> [Box]:
+    """
+    Gets the abstract boxes of a component (see "Component.boxes")
+    """
+    return component.boxes(self)
+
+  def freeze(self) -> "FrozenGraph":
+    """
+    Compiles the graph into an immutable form
+
+    See "FrozenGraph" for details. The graph itself is not 
+    modified, but it must not be changed while the frozen
+    form is in use.
+    """
+    return FrozenGraph(self)
+
+
+class FrozenGraph(Graph):
+
+  """
+  An immutable, compiled form of a graph (see "Graph.freeze")
+
+  Component methods compute derived data on every call: for 
+  example, a MOSFET sorts its source and drain nodes each time
+  "nodes" is called, and vias and wires ask each neighbor
+  for its orientation while building their boxes. The frozen
+  graph computes the node lists, orientations and layers of
+  all components once, keeps the components per node as tuples
+  and computes the abstract boxes once, batched per component
+  class (see "Component.boxes_for_all"), when they are first
+  asked for.
+
+  Components receiving a frozen graph use these cached values
+  through the graph accessors ("component_nodes", "is_horizontal",
+  "component_layers", "component_boxes").
+
+  A frozen graph cannot be modified, and neither may its
+  components - e.g. changed wire widths are not reflected in the
+  cached boxes. Freeze the graph again after changing it.
+  """
+
+  def __init__(self, graph: Graph):
+    """
+    Creates the frozen form of the given graph
+
+    :param graph: the graph to freeze
+    """
+
+    self.components = tuple(graph.components)
+    self.x_indexes = frozenset(graph.x_indexes)
+    self.y_indexes = frozenset(graph.y_indexes)
+    self.components_per_index = { ixy: tuple(components) for (ixy, components) in graph.components_per_index.items() }
+    self.components_per_layer = { l: tuple(components) for (l, components) in graph.components_per_layer.items() }
+
+    # per distinct component (a component may have been added twice)
+    self._index = {}
+    self._unique = []
+    for c in self.components:
+      if id(c) not in self._index:
+        self._index[id(c)] = len(self._unique)
+        self._unique.append(c)
+
+    self._nodes = [ tuple(c.nodes()) for c in self._unique ]
+    self._layers = [ tuple(c.layers()) for c in self._unique ]
+    # components without nodes have no orientation ("Component.is_horizontal" needs a node)
+    self._horizontal = [ len(nodes) > 0 and c.is_horizontal() for (c, nodes) in zip(self._unique, self._nodes) ]
+    self._boxes = None
+    self._boxes_per_component = None
+
+  def add(self, component: Component):
+    """
+    Reimplements "Graph.add" - a frozen graph cannot be modified
+    """
+    raise Exception("A frozen graph cannot be modified")
+
+  def merge(self, *graphs: Graph):
+    """
+    Reimplements "Graph.merge" - a frozen graph cannot be modified
+    """
+    raise Exception("A frozen graph cannot be modified")
+
+  def freeze(self) -> "FrozenGraph":
+    """
+    Returns the graph itself, as it is frozen already
+    """
+    return self
+
+  def component_nodes(self, component: Component) -> [Node]:
+    """
+    Reimplements "Graph.component_nodes" with the cached node list
+    """
+    return self._nodes[self._index[id(component)]]
+
+  def component_layers(self, component: Component) -> [int]:
+    """
+    Reimplements "Graph.component_layers" with the cached layers
+    """
+    return self._layers[self._index[id(component)]]
+
+  def is_horizontal(self, component: Component) -> bool:
+    """
+    Reimplements "Graph.is_horizontal" with the cached orientation
+    """
+    return self._horizontal[self._index[id(component)]]
+
+  def component_boxes(self, component: Component) -> [Box]:
+    """
+    Reimplements "Graph.component_boxes" with the cached boxes
+
+    The boxes must not be modified.
+    """
+    self.boxes_per_component()
+    return self._boxes[self._index[id(component)]]
+
+  def boxes_per_component(self, check = None) -> [ [Box] ]:
+    """
+    Gets the abstract boxes for each component in the order of the components
+
+    The boxes are computed on the first call, batched per 
+    component class (see "Component.boxes_for_all"). If a 
+    component has been added more than once, each occurrence
+    has its own (identical) boxes.
+
+    :param check: a function called before each component class is processed, e.g. to abort
+    """
+
+    if self._boxes is None:
+
+      components_per_class = {}
+      for c in self._unique:
+        components = components_per_class.get(type(c))
+        if components is None:
+          components_per_class[type(c)] = [ c ]
+        else:
+          components.append(c)
+
+      boxes = [ None ] * len(self._unique)
+      for (cls, components) in components_per_class.items():
+        if check is not None:
+          check()
+        for (c, component_boxes) in zip(components, cls.boxes_for_all(self, components)):
+          boxes[self._index[id(c)]] = component_boxes
+
+      self._boxes = boxes
+
+      # a component added more than once delivers separate boxes for each occurrence,
+      # as the solver tracks boxes by identity
+      self._boxes_per_component = []
+      seen = set()
+      for c in self.components:
+        component_boxes = boxes[self._index[id(c)]]
+        if id(c) in seen:
+          component_boxes = [ Box(b.ix1, b.iy1, b.ix2, b.iy2, b.box, b.layer) for b in component_boxes ]
+        seen.add(id(c))
+        self._boxes_per_component.append(component_boxes)
+
+    return self._boxes_per_component
+
@@ -0,0 +1,184 @@
+
+from .node import Node
+from .box import Box
+from .component import Component
+import gc
+import tracemalloc
+
+class PhaseMemory(object):
+
+  """
+  The memory figures of one phase
+
+  Public attributes:
+  * name: the phase name
+  * calls: the number of times the phase was entered
+  * peak: the maximum peak allocation (in bytes, relative to the memory allocated when entering the phase)
+  * retained: the memory still allocated after leaving the phase (in bytes, summed over all calls)
+  * objects: per-class object counts of nodes, boxes and components after the phase
+  """
+
+  def __init__(self, name: str):
+    self.name = name
+    self.calls = 0
+    self.peak = 0
+    self.retained = 0
+    self.objects = {}
+
+  def to_dict(self) -> dict:
+    """
+    Returns the figures as a plain dict (e.g. for JSON output)
+    """
+    return dict(self.__dict__)
+
+
+class MemoryProfiler(object):
+
+  """
+  Opt-in memory accounting per phase
+
+  This object uses tracemalloc to record the peak and retained
+  allocations per phase. Pass it to "Solver.solve" and
+  "Solver.produce" to get the figures for box generation, the
+  compaction passes per axis and layout generation. Custom
+  phases such as graph building can be recorded with "phase":
+
+    profiler = MemoryProfiler()
+    with profiler.phase("build"):
+      graph = ...
+    solver.solve(memory = profiler)
+    solver.produce(layout, cell, memory = profiler)
+    print(profiler.format_report())
+
+  Phases can be nested and can be entered multiple times.
+  tracemalloc is started on the first phase and stopped when
+  the outermost phase is left, unless it was already running.
+  In that case, the peak of the running trace is left alone, as
+  it may belong to the caller's own measurement. A phase's peak 
+  is then only exact if the phase raises the overall peak - 
+  otherwise, the memory still allocated at its end is reported
+  as a lower bound.
+
+  After each phase, the number of Node, Box and component
+  objects alive is recorded per class. This requires a scan
+  over all objects, so it can be disabled with "count_objects".
+
+  tracemalloc only sees memory allocated through the Python 
+  allocator. The shapes and cells KLayout creates live in C++
+  memory and are not accounted. Hence the "produce" phase only
+  covers the Python side of layout generation (e.g. the geometry
+  lists). It typically shows a small peak and no retained memory
+  even if the layout has grown considerably. Use process-level 
+  figures such as the resident set size for the layout itself.
+  """
+
+  def __init__(self, count_objects: bool = True):
+    """
+    Creates a memory profiler
+
+    :param count_objects: if True, per-class object counts are recorded after each phase
+    """
+    self.phases = {}
+    self.count_objects = count_objects
+    self._stack = []
+    self._started = False
+
+  def phase(self, name: str) -> "_MemoryPhase":
+    """
+    Returns a context manager recording the memory figures of a phase
+    """
+    return _MemoryPhase(self, name)
+
+  def report(self) -> { str: dict }:
+    """
+    Returns the figures per phase as plain dicts
+    """
+    return { name: p.to_dict() for (name, p) in self.phases.items() }
+
+  def format_report(self) -> str:
+    """
+    Returns a human-readable report
+    """
+    lines = []
+    for p in self.phases.values():
+      lines.append(f"{p.name}: calls={p.calls} peak={p.peak} retained={p.retained}")
+      for (cls, count) in sorted(p.objects.items()):
+        lines.append(f"  {cls}: {count}")
+    return "\n".join(lines)
+
+  @staticmethod
+  def object_counts() -> { str: int }:
+    """
+    Gets the number of Node, Box and component objects alive per class
+    """
+    counts = {}
+    for o in gc.get_objects():
+      if isinstance(o, (Node, Box, Component)):
+        name = type(o).__name__
+        counts[name] = counts.get(name, 0) + 1
+    return counts
+
+  def _enter(self, name: str):
+
+    if len(self._stack) == 0 and not tracemalloc.is_tracing():
+      tracemalloc.start()
+      self._started = True
+
+    (current, peak) = tracemalloc.get_traced_memory()
+
+    if not self._started:
+      # someone else's trace: keep its peak and remember where it stood
+      self._stack.append([ name, current, current, peak ])
+      return
+
+    if len(self._stack) > 0:
+      # save the outer phase's peak as we are going to reset it
+      self._stack[-1][2] = max(self._stack[-1][2], peak)
+    tracemalloc.reset_peak()
+
+    self._stack.append([ name, current, current, None ])
+
+  def _leave(self):
+
+    (name, start, saved_peak, entry_peak) = self._stack.pop()
+
+    (current, peak) = tracemalloc.get_traced_memory()
+    if entry_peak is not None:
+      # the peak has not been reset - it only tells about this phase if it has grown
+      peak = peak if peak > entry_peak else current
+    peak = max(peak, saved_peak)
+
+    p = self.phases.get(name)
+    if p is None:
+      p = self.phases[name] = PhaseMemory(name)
+
+    p.calls += 1
+    p.peak = max(p.peak, peak - start)
+    p.retained += current - start
+
+    if self.count_objects:
+      p.objects = self.object_counts()
+
+    if len(self._stack) > 0:
+      self._stack[-1][2] = max(self._stack[-1][2], peak)
+      if self._started:
+        # don't account the object counting for the outer phase
+        tracemalloc.reset_peak()
+    elif self._started:
+      tracemalloc.stop()
+      self._started = False
+
+
+class _MemoryPhase(object):
+
+  def __init__(self, profiler: MemoryProfiler, name: str):
+    self.profiler = profiler
+    self.name = name
+
+  def __enter__(self):
+    self.profiler._enter(self.name)
+    return self
+
+  def __exit__(self, *unused):
+    self.profiler._leave()
+    return False
@@ -3,7 +3,7 @@ from .component import Component
 from .tech import Tech
 from .box import Box
 from .node import Node
-import klayout.db as kl
+from .rect import Rect
 
 class MOSFET(Component):
 
@@ -65,6 +65,19 @@ class MOSFET(Component):
     """
     return self.active_layer
 
+  def to_dict(self) -> dict:
+    """
+    Reimplements the Component interface
+    """
+    return { "gate": list(self.gate_node.ixy()), "source": list(self.source_node.ixy()), "drain": list(self.drain_node.ixy()), "width": self.width, "length": self.length }
+
+  @classmethod
+  def from_dict(cls, d: dict) -> "MOSFET":
+    """
+    Creates a MOSFET from the dict delivered by "to_dict"
+    """
+    return cls(Node(*d["gate"]), Node(*d["source"]), Node(*d["drain"]), d["width"], d["length"])
+
   def boxes(self, graph) -> [Box]:
 
     """
@@ -74,13 +87,54 @@ class MOSFET(Component):
     "gate_extensions" value from the technology singleton (Tech.mosfets).
     """
 
+    return self._boxes_for_footprints(self._footprints(), graph.component_nodes(self))
+
+  @classmethod
+  def boxes_for_all(cls, graph, mosfets: ["MOSFET"]) -> [ [Box] ]:
+    """
+    Reimplements the Component interface
+
+    The footprints only depend on width and length, so they are
+    computed once per device size.
+    """
+
+    if cls.boxes is not MOSFET.boxes:
+      # derived classes with their own box generation
+      return super().boxes_for_all(graph, mosfets)
+
+    footprints = {}
+    result = []
+
+    for m in mosfets:
+      key = (m.mosfet_tech_definitions, m.width, m.length)
+      fp = footprints.get(key)
+      if fp is None:
+        fp = footprints[key] = m._footprints()
+      result.append(m._boxes_for_footprints(fp, graph.component_nodes(m)))
+
+    return result
+
+  def _footprints(self) -> (Rect, Rect):
+    """
+    Computes the source/drain (active) and gate (poly) footprints
+    """
+
     sd_width = self.mosfet_tech_definitions.source_drain_active_width()
-    sd_box = kl.DBox(kl.DPoint(-0.5 * sd_width, -0.5 * self.width), kl.DPoint(0.5 * sd_width, 0.5 * self.width))
+    sd_box = Rect(-0.5 * sd_width, -0.5 * self.width, 0.5 * sd_width, 0.5 * self.width)
 
     gate_extension = self.mosfet_tech_definitions.gate_extension()
-    gate_box = kl.DBox(kl.DPoint(), kl.DPoint()).enlarged(0.5 * self.length, 0.5 * self.width + gate_extension)
+    gate_box = Rect(0.0, 0.0, 0.0, 0.0).enlarged(0.5 * self.length, 0.5 * self.width + gate_extension)
+
+    return (sd_box, gate_box)
+
+  def _boxes_for_footprints(self, footprints: (Rect, Rect), nodes: [Node]) -> [Box]:
+    """
+    Builds the boxes from the footprints and the (normalized) nodes
+    """
+
+    (sd_box, gate_box) = footprints
 
-    (sn, gn, dn) = self.nodes()
+    (sn, gn, dn) = nodes
 
     return [ Box(sn.ix, sn.iy, dn.ix, dn.iy, sd_box, self.active_layer),
              Box(gn.ix, gn.iy, gn.ix, gn.iy, gate_box, self.poly_layer) ]
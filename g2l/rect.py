@@ -0,0 +1,138 @@
+
+class Rect(object):
+
+  """
+  A lightweight axis-parallel rectangle with floating-point coordinates
+
+  This class is used for footprint boxes and physical geometry
+  inside the graph model and the solver. It provides the subset
+  of the KLayout DBox interface g2l needs, so the core does not
+  depend on KLayout. KLayout is only required for producing
+  layout - use "to_dbox" to convert a rectangle into a DBox.
+
+  Like DBox, a rectangle is normalized on construction and can
+  be empty. The default-constructed rectangle is empty.
+
+  Operators:
+  * a + b: the bounding box of both rectangles
+  * a & b: the intersection of both rectangles
+  * a * b: the convolution of both rectangles, i.e. "a" stretched by "b"
+
+  Public attributes:
+  * left, bottom, right, top: the coordinates
+  """
+
+  __slots__ = ( "left", "bottom", "right", "top" )
+
+  def __init__(self, *args):
+    """
+    Creates a rectangle
+
+    Rect() creates an empty rectangle.
+    Rect(left, bottom, right, top) creates a rectangle from the given coordinates.
+    Rect(other) creates a copy of another rectangle (also of a KLayout DBox).
+    """
+    if len(args) == 0:
+      self.left = 1.0
+      self.bottom = 1.0
+      self.right = -1.0
+      self.top = -1.0
+    elif len(args) == 1:
+      other = args[0]
+      self.left = other.left
+      self.bottom = other.bottom
+      self.right = other.right
+      self.top = other.top
+    else:
+      (x1, y1, x2, y2) = args
+      self.left = min(x1, x2)
+      self.bottom = min(y1, y2)
+      self.right = max(x1, x2)
+      self.top = max(y1, y2)
+
+  def empty(self) -> bool:
+    """
+    Returns a value indicating whether the rectangle is empty
+    """
+    return self.left > self.right or self.bottom > self.top
+
+  def width(self) -> float:
+    """
+    Gets the width of the rectangle
+    """
+    return self.right - self.left
+
+  def height(self) -> float:
+    """
+    Gets the height of the rectangle
+    """
+    return self.top - self.bottom
+
+  def moved(self, dx: float, dy: float) -> "Rect":
+    """
+    Returns the rectangle shifted by the given distance
+    """
+    if self.empty():
+      return Rect()
+    return Rect(self.left + dx, self.bottom + dy, self.right + dx, self.top + dy)
+
+  def enlarged(self, dx: float, dy: float = None) -> "Rect":
+    """
+    Returns the rectangle enlarged by dx horizontally and dy vertically on each side
+
+    If dy is not given, the rectangle is enlarged by dx in both directions.
+    Negative values shrink the rectangle.
+    """
+    if dy is None:
+      dy = dx
+    if self.empty():
+      return Rect()
+    return Rect(self.left - dx, self.bottom - dy, self.right + dx, self.top + dy)
+
+  def __add__(self, other: "Rect") -> "Rect":
+    if self.empty():
+      return Rect(other)
+    if other.empty():
+      return Rect(self)
+    return Rect(min(self.left, other.left), min(self.bottom, other.bottom), max(self.right, other.right), max(self.top, other.top))
+
+  def __and__(self, other: "Rect") -> "Rect":
+    left = max(self.left, other.left)
+    bottom = max(self.bottom, other.bottom)
+    right = min(self.right, other.right)
+    top = min(self.top, other.top)
+    if self.empty() or other.empty() or left > right or bottom > top:
+      return Rect()
+    return Rect(left, bottom, right, top)
+
+  def __mul__(self, other: "Rect") -> "Rect":
+    if self.empty() or other.empty():
+      return Rect()
+    return Rect(self.left + other.left, self.bottom + other.bottom, self.right + other.right, self.top + other.top)
+
+  def __eq__(self, other) -> bool:
+    if not isinstance(other, Rect):
+      return NotImplemented
+    return self.left == other.left and self.bottom == other.bottom and self.right == other.right and self.top == other.top
+
+  def __hash__(self) -> int:
+    return hash((self.left, self.bottom, self.right, self.top))
+
+  def __repr__(self) -> str:
+    """
+    Returns the string representation (same format than KLayout's DBox)
+    """
+    if self.empty():
+      return "()"
+    return f"({self.left:.12g},{self.bottom:.12g};{self.right:.12g},{self.top:.12g})"
+
+  def to_dbox(self):
+    """
+    Converts the rectangle into a KLayout DBox object
+
+    This method imports KLayout.
+    """
+    import klayout.db as kl
+    if self.empty():
+      return kl.DBox()
+    return kl.DBox(self.left, self.bottom, self.right, self.top)
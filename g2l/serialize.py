@@ -0,0 +1,83 @@
+
+from .graph import Graph
+from .wire import Wire
+from .via import Via
+from .mosfet import MOSFET
+import hashlib
+import json
+
+# The component classes which can be read, by type name
+_component_classes = {}
+
+def register_component(cls):
+  """
+  Registers a component class for deserialization
+
+  The class needs to implement "to_dict" and a "from_dict"
+  class method. It is registered under its class name.
+  The standard components are registered already.
+  """
+  _component_classes[cls.__name__] = cls
+  return cls
+
+register_component(Wire)
+register_component(Via)
+register_component(MOSFET)
+
+
+def graph_to_dict(graph: Graph) -> dict:
+  """
+  Converts a graph into a plain dict suitable for JSON serialization
+
+  The dict holds a "components" list with one dict per component.
+  Each component dict carries the type name as "type" plus
+  the component's parameters.
+  """
+  components = []
+  for c in graph.components:
+    d = c.to_dict()
+    if d is None:
+      raise Exception(f"Component of type {type(c).__name__} cannot be serialized")
+    d["type"] = type(c).__name__
+    components.append(d)
+  return { "components": components }
+
+
+def graph_from_dict(d: dict) -> Graph:
+  """
+  Creates a graph from a dict delivered by "graph_to_dict"
+  """
+  graph = Graph()
+  for cd in d["components"]:
+    cls = _component_classes.get(cd["type"])
+    if cls is None:
+      raise Exception(f"Unknown component type: {cd['type']}")
+    graph.add(cls.from_dict(cd))
+  return graph
+
+
+def dump_graph(graph: Graph, filename: str):
+  """
+  Writes a graph to a JSON file
+  """
+  with open(filename, "w") as file:
+    json.dump(graph_to_dict(graph), file)
+
+
+def load_graph(filename: str) -> Graph:
+  """
+  Reads a graph from a JSON file written by "dump_graph"
+  """
+  with open(filename, "r") as file:
+    return graph_from_dict(json.load(file))
+
+
+def graph_key(graph_dict: dict, **args) -> str:
+  """
+  Computes a hash key for a serialized graph and additional arguments
+
+  The key is suitable for caching solutions: identical graphs
+  and arguments deliver identical keys.
+  """
+  text = json.dumps([ graph_dict, args ], sort_keys = True)
+  return hashlib.sha256(text.encode("utf-8")).hexdigest()
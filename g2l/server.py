@@ -0,0 +1,278 @@
+
+from .serialize import graph_from_dict, graph_to_dict, graph_key
+from .solver import Solver
+from .graph import Graph
+from .batch import _init_worker
+from .via import Via
+import argparse
+import asyncio
+import base64
+import collections
+import concurrent.futures
+import importlib
+import json
+import os
+import socket
+import tempfile
+
+class SolveServer(object):
+
+  """
+  A long-running solve server on a local Unix socket
+
+  The server keeps a pool of worker processes with the technology
+  module already imported, so requests don't pay for Python
+  startup, the KLayout import and the technology setup. The 
+  workers keep the via templates across requests (see 
+  "Via.template_cache"). Results are kept in a solution cache, 
+  so repeated requests for the same graph are answered without 
+  solving.
+
+  The protocol is newline-delimited JSON. A request is a JSON
+  object with these keys:
+
+  * "id": an arbitrary request id which is copied to the response
+  * "graph": the graph as delivered by "graph_to_dict"
+  * "solve": optional arguments for "Solver.solve"
+  * "output": "coordinates" (default), "gds" or "oas"
+
+  The response carries the "id", the solver statistics as "stats",
+  and either the coordinates as "x" and "y" lists of [ index, value ]
+  pairs or the base64-encoded layout file as "data". In case of
+  an error, the response carries an "error" message instead.
+  Requests larger than "max_request_size" bytes are rejected
+  and the connection is closed.
+
+  Requests on one connection may be processed concurrently, so
+  responses can arrive in a different order. Use the ids to match
+  them. The number of requests solved at the same time is limited
+  by "max_concurrency".
+  """
+
+  def __init__(self, path: str, tech: str = None, jobs: int = None, max_concurrency: int = None, cache_size: int = 256, max_request_size: int = 64 * 1024 * 1024):
+    """
+    Creates a server object
+
+    :param path: the path of the Unix socket
+    :param tech: the name of the technology module to import in the workers (e.g. "sky130")
+    :param jobs: the number of worker processes (default: number of CPUs)
+    :param max_concurrency: the maximum number of requests being solved at the same time (default: twice the number of workers)
+    :param cache_size: the maximum number of solutions kept in the cache
+    :param max_request_size: the maximum size of a request line in bytes
+    """
+    self.path = path
+    self.tech = tech
+    self.jobs = jobs or os.cpu_count() or 1
+    self.max_concurrency = max_concurrency or 2 * self.jobs
+    self.cache_size = cache_size
+    self.max_request_size = max_request_size
+    self._cache = collections.OrderedDict()
+    self._executor = None
+    self._semaphore = None
+
+  def run(self):
+    """
+    Runs the server until it is interrupted
+    """
+    asyncio.run(self.serve())
+
+  async def serve(self):
+    """
+    Serves requests (coroutine)
+    """
+
+    self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    with concurrent.futures.ProcessPoolExecutor(self.jobs, initializer = _init_server_worker, initargs = (self.tech, )) as executor:
+      self._executor = executor
+      server = await asyncio.start_unix_server(self._handle_connection, path = self.path, limit = self.max_request_size)
+      async with server:
+        await server.serve_forever()
+
+  async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+
+    tasks = set()
+
+    async def send(response: dict):
+      writer.write(json.dumps(response).encode("utf-8") + b"\n")
+      await writer.drain()
+
+    async def respond(request: dict):
+      response = await self._process(request)
+      try:
+        await send(response)
+      except (ConnectionResetError, BrokenPipeError):
+        # the client has gone away - the solution is cached nevertheless
+        pass
+
+    try:
+      while True:
+        try:
+          line = await reader.readline()
+        except ValueError:
+          # line exceeds the stream limit: the stream cannot be resynchronized
+          await send({ "error": f"Request exceeds the maximum size of {self.max_request_size} bytes" })
+          break
+        if not line:
+          break
+        try:
+          request = json.loads(line)
+          if not isinstance(request, dict):
+            raise ValueError("not a JSON object")
+        except ValueError as ex:
+          await send({ "error": f"Invalid request: {ex}" })
+          continue
+        task = asyncio.ensure_future(respond(request))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+      if tasks:
+        await asyncio.gather(*tasks)
+    except (ConnectionResetError, BrokenPipeError):
+      pass
+    finally:
+      writer.close()
+
+  async def _process(self, request: dict) -> dict:
+
+    request_id = request.get("id")
+
+    try:
+
+      graph_dict = request["graph"]
+      solve_args = request.get("solve", {})
+      output = request.get("output", "coordinates")
+      if output not in ("coordinates", "gds", "oas"):
+        raise Exception(f"Invalid output type: {output}")
+
+      key = graph_key(graph_dict, solve = solve_args, output = output)
+      result = self._cache.get(key)
+
+      if result is not None:
+        self._cache.move_to_end(key)
+      else:
+        async with self._semaphore:
+          loop = asyncio.get_running_loop()
+          result = await loop.run_in_executor(self._executor, _solve_request, graph_dict, solve_args, output)
+        self._cache[key] = result
+        while len(self._cache) > self.cache_size:
+          self._cache.popitem(last = False)
+
+      response = dict(result)
+
+    except Exception as ex:
+      response = { "error": str(ex) }
+
+    response["id"] = request_id
+    return response
+
+
+class SolveClient(object):
+
+  """
+  A simple synchronous client for the solve server
+
+  Usage:
+
+    client = SolveClient("/tmp/g2l.sock")
+    (x_coordinates, y_coordinates, stats) = client.solve(graph)
+    gds_data = client.produce(graph, "gds")
+  """
+
+  def __init__(self, path: str):
+    """
+    Connects to the server at the given socket path
+    """
+    self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    self._socket.connect(path)
+    self._file = self._socket.makefile("rwb")
+    self._next_id = 0
+
+  def close(self):
+    """
+    Closes the connection
+    """
+    self._file.close()
+    self._socket.close()
+
+  def request(self, graph: Graph, output: str = "coordinates", **solve_args) -> dict:
+    """
+    Sends a request and returns the raw response
+    """
+    self._next_id += 1
+    request = { "id": self._next_id, "graph": graph_to_dict(graph), "solve": solve_args, "output": output }
+    self._file.write(json.dumps(request).encode("utf-8") + b"\n")
+    self._file.flush()
+    response = json.loads(self._file.readline())
+    if "error" in response:
+      raise Exception(response["error"])
+    return response
+
+  def solve(self, graph: Graph, **solve_args) -> ({ int: float }, { int: float }, dict):
+    """
+    Solves a graph on the server
+
+    :returns A tuple of x coordinates, y coordinates and the solver statistics (as a dict)
+    """
+    response = self.request(graph, "coordinates", **solve_args)
+    return ({ i: v for (i, v) in response["x"] }, { i: v for (i, v) in response["y"] }, response["stats"])
+
+  def produce(self, graph: Graph, format: str = "gds", **solve_args) -> bytes:
+    """
+    Solves a graph on the server and returns the layout file ("gds" or "oas" format)
+    """
+    return base64.b64decode(self.request(graph, format, **solve_args)["data"])
+
+
+def _init_server_worker(tech: str):
+  """
+  Prepares a server worker process
+  """
+  _init_worker(tech)
+  Via.template_cache = {}
+
+
+def _solve_request(graph_dict: dict, solve_args: dict, output: str) -> dict:
+  """
+  Solves one request (in the worker process)
+  """
+
+  graph = graph_from_dict(graph_dict)
+  solver = Solver(graph)
+  stats = solver.solve(**solve_args)
+
+  result = { "stats": stats.to_dict() }
+
+  if output == "coordinates":
+    result["x"] = [ [ i, v ] for (i, v) in solver.x_coordinates.items() ]
+    result["y"] = [ [ i, v ] for (i, v) in solver.y_coordinates.items() ]
+  else:
+    import klayout.db as kl
+    layout = kl.Layout()
+    solver.produce(layout, layout.create_cell("TOP"))
+    (fd, filename) = tempfile.mkstemp(suffix = "." + output)
+    os.close(fd)
+    try:
+      layout.write(filename)
+      with open(filename, "rb") as file:
+        result["data"] = base64.b64encode(file.read()).decode("ascii")
+    finally:
+      os.remove(filename)
+
+  return result
+
+
+if __name__ == "__main__":
+
+  parser = argparse.ArgumentParser(description = "Runs the g2l solve server")
+  parser.add_argument("--socket", required = True, help = "the path of the Unix socket")
+  parser.add_argument("--tech", help = "the technology module to import (e.g. sky130)")
+  parser.add_argument("--jobs", type = int, help = "the number of worker processes")
+  parser.add_argument("--max-concurrency", type = int, help = "the maximum number of requests solved at the same time")
+  parser.add_argument("--cache-size", type = int, default = 256, help = "the maximum number of cached solutions")
+  parser.add_argument("--max-request-size", type = int, default = 64 * 1024 * 1024, help = "the maximum size of a request in bytes")
+  args = parser.parse_args()
+
+  if args.tech is not None:
+    importlib.import_module(args.tech)
+
+  SolveServer(args.socket, args.tech, args.jobs, args.max_concurrency, args.cache_size, args.max_request_size).run()
@@ -0,0 +1,48 @@
+
+from .graph import Graph
+import concurrent.futures
+import os
+
+def build_sharded(builders, jobs: int = None, processes: bool = False) -> Graph:
+  """
+  Builds a graph from shards filled concurrently
+
+  Each builder is a callable without arguments which returns a
+  new Graph (the shard), typically a region of the final graph.
+  The builders run in a thread or process pool. The shards are
+  merged in the order of the builders (see "Graph.merge").
+
+  Pure Python graph building holds the interpreter lock, so
+  threads pay off if the builders spend their time outside of
+  Python (e.g. reading files). Use "processes" for CPU-bound
+  builders - the builders and the graphs need to be picklable then
+  (e.g. module-level functions or functools.partial objects), and
+  the technology module needs to be importable by the workers.
+
+  :param builders: the shard builders
+  :param jobs: the number of threads or processes (default: number of CPUs)
+  :param processes: if True, the builders run in worker processes instead of threads
+
+  :returns The merged graph
+  """
+
+  builders = list(builders)
+  jobs = jobs or os.cpu_count() or 1
+
+  if jobs <= 1 or len(builders) <= 1:
+    shards = [ builder() for builder in builders ]
+  else:
+    executor_class = concurrent.futures.ProcessPoolExecutor if processes else concurrent.futures.ThreadPoolExecutor
+    with executor_class(min(jobs, len(builders))) as executor:
+      shards = list(executor.map(_build_shard, builders))
+
+  graph = Graph()
+  graph.merge(*shards)
+  return graph
+
+
+def _build_shard(builder) -> Graph:
+  """
+  Runs one shard builder (in the worker)
+  """
+  return builder()
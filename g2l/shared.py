@@ -0,0 +1,301 @@
+
+from .box import Box
+from .component import Component
+from .graph import Graph
+from .rect import Rect
+from .solver import Solver
+from .tech import Tech
+from multiprocessing import shared_memory
+import array
+import math
+import struct
+
+# The shared memory block layout (native byte order):
+#
+#   offset  size      content
+#   0       4         magic "G2LS"
+#   4       4         format version (uint32, currently 1)
+#   8       8         number of x indexes NX (uint64)
+#   16      8         number of y indexes NY (uint64)
+#   24      8         number of layers NL (uint64)
+#   32      8         number of boxes NB (uint64)
+#   40      8*NX      x indexes (int64, ascending)
+#   ...     8*NY      y indexes (int64, ascending)
+#   ...     8*NL      layers (int64, ascending)
+#   ...     8*NL*NL   space table (float64, row l1, column l2, NaN for no rule)
+#   ...     40*NB     abstract boxes (int64 ix1, iy1, ix2, iy2, layer per box)
+#   ...     32*NB     footprints (float64 left, bottom, right, top per box)
+#
+# All arrays are 8-byte aligned, so they are accessed through
+# casted memoryviews without copying.
+
+_MAGIC = b"G2LS"
+_VERSION = 1
+_HEADER = struct.Struct("=4sIQQQQ")
+
+_NO_PRODUCE = "A shared graph cannot be produced - use the original graph with the solved coordinates"
+
+
+class SharedGraph(object):
+
+  """
+  A solve-ready graph published in shared memory
+
+  Sending graphs to worker processes means pickling the nodes,
+  boxes and components and requires the workers to import the
+  component classes and the technology. A shared graph instead
+  holds everything the solver needs in one
+  "multiprocessing.shared_memory" block: the grid indexes, the
+  abstract boxes with their footprints and the space rules of
+  the layers used. The block is identified by its name, which is
+  all a worker needs to receive:
+
+    with SharedGraph.publish(graph) as shared:
+      pool.map(solve_shared, [ shared.name ] * 4)
+
+    def solve_shared(name):
+      with SharedGraph.attach(name) as shared:
+        solver = shared.solver()
+        solver.solve()
+        return (solver.x_coordinates, solver.y_coordinates)
+
+  Attaching maps the block and does not copy the tables. The
+  solver materializes Box objects from them once when it starts.
+  A shared graph can be given to "Solver" in place of a (frozen)
+  Graph, but it cannot be produced - use the original graph together
+  with the coordinates for that.
+
+  The publishing object owns the block: leaving its "with" block
+  (or calling "close") removes it. Attached objects only close
+  their mapping. Attach from processes started by the publishing
+  process (e.g. a multiprocessing pool), so they share its
+  resource tracker.
+
+  Public attributes:
+  * x_indexes: the x grid indexes (a set, as in Graph)
+  * y_indexes: the y grid indexes (a set, as in Graph)
+  * components: a single pseudo-component delivering the boxes
+  * rules: the space rules of the layers used (a SharedRules object)
+  """
+
+  def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+    """
+    Creates the object from a shared memory block (use "publish" or "attach")
+    """
+
+    self._shm = shm
+    self._name = shm.name
+    self._owner = owner
+    self._views = []
+
+    buf = shm.buf
+    (magic, version, nx, ny, nl, nb) = _HEADER.unpack_from(buf, 0)
+    if magic != _MAGIC:
+      raise Exception(f"Not a shared g2l graph: {shm.name}")
+    if version != _VERSION:
+      raise Exception(f"Unsupported shared graph version {version}: {shm.name}")
+
+    offset = _HEADER.size
+    (x_indexes, offset) = self._view(offset, "q", nx)
+    (y_indexes, offset) = self._view(offset, "q", ny)
+    (layers, offset) = self._view(offset, "q", nl)
+    (spaces, offset) = self._view(offset, "d", nl * nl)
+    (self._box_indexes, offset) = self._view(offset, "q", nb * 5)
+    (self._footprints, offset) = self._view(offset, "d", nb * 4)
+
+    self.x_indexes = set(x_indexes)
+    self.y_indexes = set(y_indexes)
+    self.rules = SharedRules(layers, spaces)
+    self.components = [ _SharedBoxes(self) ]
+
+  @classmethod
+  def publish(cls, graph: Graph, rules = None, name: str = None) -> "SharedGraph":
+    """
+    Publishes a graph in a new shared memory block
+
+    The abstract boxes of all components are generated here, so
+    the technology needs to be set up in this process.
+
+    :param graph: the graph to publish
+    :param rules: the technology rules object (default: Tech.rules)
+    :param name: the name of the block (default: a generated unique name)
+
+    :returns The owning SharedGraph object
+    """
+
+    if rules is None:
+      rules = Tech.rules
+
+    boxes = [ b for component_boxes in graph.freeze().boxes_per_component() for b in component_boxes ]
+    x_indexes = sorted(graph.x_indexes)
+    y_indexes = sorted(graph.y_indexes)
+    layers = sorted(set(b.layer for b in boxes))
+
+    (nx, ny, nl, nb) = (len(x_indexes), len(y_indexes), len(layers), len(boxes))
+    size = _HEADER.size + 8 * (nx + ny + nl + nl * nl + 9 * nb)
+
+    shm = shared_memory.SharedMemory(name = name, create = True, size = size)
+
+    try:
+
+      _HEADER.pack_into(shm.buf, 0, _MAGIC, _VERSION, nx, ny, nl, nb)
+
+      offset = _HEADER.size
+      offset = _fill(shm.buf, offset, "q", x_indexes)
+      offset = _fill(shm.buf, offset, "q", y_indexes)
+      offset = _fill(shm.buf, offset, "q", layers)
+
+      spaces = []
+      for l1 in layers:
+        for l2 in layers:
+          s = rules.space(min(l1, l2), max(l1, l2))
+          spaces.append(math.nan if s is None else s)
+      offset = _fill(shm.buf, offset, "d", spaces)
+
+      offset = _fill(shm.buf, offset, "q", [ v for b in boxes for v in (b.ix1, b.iy1, b.ix2, b.iy2, b.layer) ])
+      offset = _fill(shm.buf, offset, "d", [ v for b in boxes for v in (b.box.left, b.box.bottom, b.box.right, b.box.top) ])
+
+      return cls(shm, True)
+
+    except:
+      shm.close()
+      shm.unlink()
+      raise
+
+  @classmethod
+  def attach(cls, name: str) -> "SharedGraph":
+    """
+    Attaches to a graph published under the given name
+
+    :param name: the name of the block (see "name")
+    """
+    return cls(shared_memory.SharedMemory(name = name), False)
+
+  @property
+  def name(self) -> str:
+    """
+    Gets the name of the shared memory block
+    """
+    return self._name
+
+  def boxes(self) -> [Box]:
+    """
+    Creates the Box objects from the shared tables
+    """
+    bi = self._box_indexes
+    fp = self._footprints
+    return [ Box(bi[k], bi[k + 1], bi[k + 2], bi[k + 3], Rect(fp[j], fp[j + 1], fp[j + 2], fp[j + 3]), bi[k + 4])
+             for (k, j) in zip(range(0, len(bi), 5), range(0, len(fp), 4)) ]
+
+  def freeze(self) -> "SharedGraph":
+    """
+    Returns the shared graph itself, as it is immutable already (see "Graph.freeze")
+    """
+    return self
+
+  def boxes_per_component(self, check = None) -> [ [Box] ]:
+    """
+    Delivers the boxes for the solver (see "FrozenGraph.boxes_per_component")
+
+    All boxes are delivered as belonging to one pseudo-component.
+    """
+    if check is not None:
+      check()
+    return [ self.boxes() ]
+
+  def solver(self) -> Solver:
+    """
+    Creates a solver for the shared graph using the shared space rules
+    """
+    solver = Solver(self)
+    solver.tech_rules = self.rules
+    return solver
+
+  def close(self):
+    """
+    Closes the mapping, and removes the block if this object has published it
+    """
+    if self._shm is None:
+      return
+    self.rules._release()
+    for v in self._views:
+      v.release()
+    self._views = []
+    self._shm.close()
+    if self._owner:
+      self._shm.unlink()
+    self._shm = None
+
+  def __enter__(self) -> "SharedGraph":
+    return self
+
+  def __exit__(self, *args):
+    self.close()
+
+  def _view(self, offset: int, fmt: str, count: int) -> (memoryview, int):
+    end = offset + 8 * count
+    view = self._shm.buf[offset:end].cast(fmt)
+    self._views.append(view)
+    return (view, end)
+
+
+class SharedRules(object):
+
+  """
+  The space rules table of a shared graph
+
+  This object provides the "space" method of the technology
+  rules for the layers used in the graph, so the solver can run
+  without the technology module.
+  """
+
+  def __init__(self, layers: memoryview, spaces: memoryview):
+    self._layer_index = { l: k for (k, l) in enumerate(layers) }
+    self._spaces = spaces
+    self._n = len(layers)
+
+  def space(self, layer1: int, layer2: int) -> float:
+    """
+    Gets the space between two layers or None if there is no space rule
+    """
+    s = self._spaces[self._layer_index[layer1] * self._n + self._layer_index[layer2]]
+    return None if math.isnan(s) else s
+
+  def create_layers(self, layout) -> { int: int }:
+    """
+    Not available: a shared graph cannot be produced
+    """
+    raise Exception(_NO_PRODUCE)
+
+  def _release(self):
+    self._spaces = None
+
+
+class _SharedBoxes(Component):
+
+  """
+  A pseudo-component delivering the boxes of a shared graph to the solver
+  """
+
+  def __init__(self, shared: SharedGraph):
+    super().__init__()
+    self._shared = shared
+
+  def boxes(self, graph) -> [Box]:
+    return self._shared.boxes()
+
+  def produce(self, graph, x_coordinates: { int: float }, y_coordinates: { int: float }, layout, cell, layers: { int: int }) -> list:
+    raise Exception(_NO_PRODUCE)
+
+
+def _fill(buf: memoryview, offset: int, fmt: str, values: list) -> int:
+  """
+  Writes an array of 8-byte values and returns the offset behind it
+  """
+  end = offset + 8 * len(values)
+  view = buf[offset:end].cast(fmt)
+  try:
+    view[:] = array.array(fmt, values)
+  finally:
+    view.release()
+  return end
@@ -0,0 +1,116 @@
+
+from .box import Box
+import bisect
+import heapq
+
+class ShieldingIndex(object):
+
+  """
+  A per-layer interval structure for the shielding test
+
+  During the sweep over the grid indexes of one axis, the
+  solver needs to know whether an interaction between two
+  boxes is shielded by another box which overlaps the gap
+  between them.
+
+  A shielding box needs to span the current sweep index, so
+  boxes which end before the sweep front can be retired.
+  The remaining ("active") boxes are kept per layer and
+  sorted by their perpendicular start index. A query
+  then only needs to look at the boxes of the two layers
+  involved whose perpendicular start is not beyond the
+  start of the gap.
+
+  Usage is:
+
+  * "retire" with the current sweep index before querying
+  * "is_shielded" for the candidate pairs of that index
+  * "add" the boxes of the current sweep index afterwards
+  """
+
+  def __init__(self, h: bool):
+    """
+    Creates an empty index
+
+    :param h: True for a horizontal sweep, False for a vertical one
+    """
+    self.h = h
+    self._keys_per_layer = {}
+    self._entries_per_layer = {}
+    self._heap = []
+    self._seq = 0
+
+  def add(self, boxes: [Box]):
+    """
+    Adds boxes to the index
+    """
+
+    h = self.h
+
+    for b in boxes:
+
+      key = b.iyorx1(h)
+      entry = (key, self._seq, b.iyorx2(h), b.yorxmin(h), b.yorxmax(h))
+      self._seq += 1
+
+      keys = self._keys_per_layer.get(b.layer)
+      if keys is None:
+        keys = self._keys_per_layer[b.layer] = []
+        self._entries_per_layer[b.layer] = []
+      entries = self._entries_per_layer[b.layer]
+
+      pos = bisect.bisect_right(keys, key)
+      keys.insert(pos, key)
+      entries.insert(pos, entry)
+
+      heapq.heappush(self._heap, (b.ixory2(h), entry, b.layer))
+
+  def retire(self, i: int):
+    """
+    Removes all boxes which end before the given sweep index
+    """
+
+    heap = self._heap
+
+    while len(heap) > 0 and heap[0][0] < i:
+
+      (unused, entry, layer) = heapq.heappop(heap)
+
+      keys = self._keys_per_layer[layer]
+      entries = self._entries_per_layer[layer]
+
+      pos = bisect.bisect_left(entries, entry)
+      del keys[pos]
+      del entries[pos]
+
+  def is_shielded(self, b: Box, wrt: Box) -> bool:
+    """
+    Determines whether the interaction of a box pair is shielded
+
+    Given an interacting pair of boxes (b, wrt), this
+    method determines whether one of the active boxes on
+    the layers of "b" or "wrt" shields this interaction
+    (overlaps the gap).
+    """
+
+    h = self.h
+
+    iyorx1 = max(b.iyorx1(h), wrt.iyorx1(h))
+    iyorx2 = min(b.iyorx2(h), wrt.iyorx2(h))
+    yorxmin = max(b.yorxmin(h), wrt.yorxmin(h)) + 1e-10
+    yorxmax = min(b.yorxmax(h), wrt.yorxmax(h)) - 1e-10
+
+    for layer in ((b.layer,) if b.layer == wrt.layer else (b.layer, wrt.layer)):
+
+      keys = self._keys_per_layer.get(layer)
+      if keys is None:
+        continue
+
+      entries = self._entries_per_layer[layer]
+
+      for pos in range(0, bisect.bisect_right(keys, iyorx1)):
+        (unused, unused_seq, oiyorx2, oyorxmin, oyorxmax) = entries[pos]
+        if oiyorx2 >= iyorx2 and oyorxmin <= yorxmin and oyorxmax >= yorxmax:
+          return True
+
+    return False
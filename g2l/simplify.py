@@ -0,0 +1,93 @@
+
+from .component import Component
+from .graph import Graph
+from .wire import Wire
+import json
+
+def simplify_graph(graph: Graph) -> (Graph, { Component: [Component] }):
+  """
+  Simplifies a graph before solving
+
+  This function performs two simplifications:
+
+  * Exact duplicates are removed. Two components are duplicates if
+    they are of the same type and deliver identical parameters
+    through "to_dict". Components which cannot be serialized are
+    never considered duplicates.
+  * Collinear wires on the same layer and with the same width are
+    merged if they meet in a node that no other component
+    attaches to. For example, poly wires n(1,1)->n(1,2) and
+    n(1,2)->n(1,3) become one wire n(1,1)->n(1,3).
+
+  Both reduce the number of boxes and pairs the solver has to
+  consider. Merging may drop grid indexes which are not used
+  otherwise.
+
+  The original graph is not modified.
+
+  :returns A tuple with the simplified graph and a dict mapping each component of the simplified graph to the original components it represents
+  """
+
+  origins = {}
+  kept = []
+  seen = {}
+
+  for c in graph.components:
+    d = c.to_dict()
+    if d is not None:
+      key = (type(c).__name__, json.dumps(d, sort_keys = True))
+      first = seen.get(key)
+      if first is not None:
+        origins[first].append(c)
+        continue
+      seen[key] = c
+    origins[c] = [ c ]
+    kept.append(c)
+
+  # find the nodes through which two collinear wires can be merged
+  deduped = Graph()
+  for c in kept:
+    deduped.add(c)
+
+  next_wire = {}
+  for (ixy, components) in deduped.components_per_index.items():
+    if len(components) != 2:
+      continue
+    (a, b) = components
+    if type(a) is not Wire or type(b) is not Wire:
+      continue
+    # a zero-length wire is listed twice at its node
+    if a is b or a.n1.ixy() == a.n2.ixy() or b.n1.ixy() == b.n2.ixy():
+      continue
+    if a.layer != b.layer or a.width != b.width or a.is_horizontal() != b.is_horizontal():
+      continue
+    if a.n1.ixy() == ixy:
+      (a, b) = (b, a)
+    # wires are normalized, so "a" needs to end and "b" needs to start at the node
+    if a.n2.ixy() != ixy or b.n1.ixy() != ixy:
+      continue
+    next_wire[a] = b
+
+  continued = set(next_wire.values())
+
+  simplified = Graph()
+  simplified_origins = {}
+
+  for c in kept:
+    if c in continued:
+      continue
+    if c not in next_wire:
+      simplified.add(c)
+      simplified_origins[c] = origins[c]
+      continue
+    # walk the chain of collinear wires
+    chain_origins = list(origins[c])
+    last = c
+    while last in next_wire:
+      last = next_wire[last]
+      chain_origins += origins[last]
+    merged = Wire(c.width, c.layer, c.n1, last.n2)
+    simplified.add(merged)
+    simplified_origins[merged] = chain_origins
+
+  return (simplified, simplified_origins)
@@ -1,10 +1,29 @@
 
-from .tech import Tech
+from .tech import Tech, LayerInteractions
 from .graph import Graph
 from .box import Box
-import klayout.db as kl
+from .rect import Rect
+from .shielding import ShieldingIndex
+from .stats import SolverStats, TraceRecorder
+from .cancel import CancellationToken
+from .memory import MemoryProfiler
+from .coordinates import write_coordinates, read_coordinates
+from .tracker import ProduceTracker
+import contextlib
+import heapq
 import math
 import logging
+import time
+import typing
+
+if typing.TYPE_CHECKING:
+  import klayout.db as kl
+
+# summaries (per iteration delta and number of moved indexes) are logged
+# on "g2l-solver" with level INFO, full coordinate dumps on the 
+# "g2l-solver.coordinates" channel with level DEBUG
+logger = logging.getLogger("g2l-solver")
+coordinate_logger = logging.getLogger("g2l-solver.coordinates")
 
 class Solver(object):
 
@@ -21,6 +40,17 @@ class Solver(object):
   To use the solver instantiate it with the graph and 
   use the "solve" method. After this, use "produce"
   to produce the physical layout as a KLayout Cell.
+
+  The solver works from the frozen form of the graph (see 
+  "Graph.freeze"), which is taken when the boxes are generated.
+  "produce" uses the same form, so it renders the graph as it
+  was solved.
+
+  The solver logs a summary of each iteration on the
+  "g2l-solver" logger (level INFO). Full coordinate dumps
+  are logged on the "g2l-solver.coordinates" logger with
+  level DEBUG. Set this logger's level to INFO or above to
+  get summaries only while debugging the solver.
   """
 
   def __init__(self, graph: Graph):
@@ -36,10 +66,31 @@ class Solver(object):
     self.iy = sorted([ v for v in graph.y_indexes ])
     self.x_coordinates = None
     self.y_coordinates = None
+    self.stats = None
 
     self.tech_rules = Tech.rules
 
-  def solve(self, initial_grid_x = 10.0, initial_grid_y = 10.0, threshold = 0.001, max_iter = 10, horizonal_first = True) -> bool:
+    self._frozen = None
+    self._boxes_per_index = None
+    self._boxes_per_perpendicular_index = None
+    self._layers = None
+    self._interactions = None
+    self._max_extension = None
+    self._component_boxes = None
+    self._changed_footprints = None
+    self._reuse_boxes = False
+    self._dependencies_valid = False
+    self._windowed = False
+    self._dependencies = None
+    self._dirty = None
+    self._pending_footprints = None
+    self._incremental = False
+    self._trace = None
+    self._memory = None
+    self._deadline = None
+    self._cancel = None
+
+  def solve(self, initial_grid_x = 10.0, initial_grid_y = 10.0, threshold = 0.001, max_iter = 10, horizonal_first = True, trace: TraceRecorder = None, time_budget: float = None, cancel: CancellationToken = None, progress = None, memory: MemoryProfiler = None, windowed: bool = False, initial_coordinates: ({ int: float }, { int: float }) = None) -> SolverStats:
     """
     Solves the constraint puzzle
 
@@ -55,7 +106,13 @@ class Solver(object):
     the same step in the vertical direction.
 
     It will iterate these steps until either the maximum number
-    of iterations is reached or the geometry converges.
+    of iterations is reached or the geometry converges. As one
+    axis is a function of the other one, the solver stops as soon
+    as a pass does not change its axis by more than the threshold.
+    The solver also stops when the coordinates return to a state
+    seen before, as it is cycling then and will not converge 
+    (status "cycle"). "SolverStats.convergence_report" tells how
+    the coordinates evolved.
 
     The idea of the initial grid is to be large enough, so that
     the iterations perform a compaction. During one-dimensional
@@ -64,52 +121,206 @@ class Solver(object):
     horizonal or vertical compaction - whatever gives a better
     result.
 
+    In windowed mode, the compaction passes only keep the boxes
+    within reach of the sweep front. This keeps the cost per 
+    column or row bounded for long rows. The result is the same
+    as without windowing, but if the sweep front moves backwards
+    (an index is placed before a preceding one) the boxes out of 
+    reach need to be checked again.
+
+    The solver can be given a time budget and a cancellation
+    token. If the budget is exhausted or the token is cancelled,
+    the solver stops and leaves the coordinates of the last
+    completed compaction pass (or the initial grid, if no pass
+    was completed). The "status" attribute of the returned
+    statistics tells why the solver stopped.
+
+    Instead of the initial grid, the solver can start from given
+    coordinates ("warm start"), e.g. the solution of a similar
+    graph. If these are close to the final result, fewer 
+    iterations are needed.
+
     :param initial_grid_x: the initial x spacing of the grid coordinates
     :param initial_grid_y: the initial y spacing of the grid coordinates
     :param threshold: the maximum coordinate change below which iteration will stop
     :param max_iter: the maxmum number of iterations
     :param horizontal_first: true, if the horizontal compaction is to be done first
+    :param trace: if given, spans for the solver phases are recorded there
+    :param time_budget: if given, the maximum wall time in seconds the solver may spend
+    :param cancel: if given, a CancellationToken which stops the solver when cancelled
+    :param progress: if given, a callable receiving the SolverStats object after each iteration (with the final status set in the last one) - if it returns False before the last iteration, the solver stops
+    :param memory: if given, the memory figures for box generation and the compaction passes are recorded there
+    :param windowed: if True, boxes are dropped from the sweep once they are out of reach of the maximum space
+    :param initial_coordinates: if given, a tuple of x and y coordinates per grid index to start from instead of the initial grid
+
+    :returns A SolverStats object which evaluates to True, if the algorithm converged
+
+    The statistics object is also available as "stats" attribute
+    after "solve" has been called.
+    """
 
-    :returns True, if the algorithm converged
+    stats = SolverStats()
+    self.stats = stats
+    self._trace = trace
+    self._memory = memory
+    self._windowed = windowed
+    self._deadline = None if time_budget is None else time.perf_counter() + time_budget
+    self._cancel = cancel
+
+    try:
+      with self._phase("solve", memory = False):
+        self._solve(stats, initial_grid_x, initial_grid_y, threshold, max_iter, horizonal_first, progress, initial_coordinates)
+    except _SolveAborted as ex:
+      stats.status = ex.status
+      if logger.isEnabledFor(logging.INFO):
+        logger.info("solver stopped (%s after %d iterations).", ex.status, stats.iterations)
+    finally:
+      self._trace = None
+      self._memory = None
+      self._deadline = None
+      self._cancel = None
+
+    return stats
+
+  def _solve(self, stats: SolverStats, initial_grid_x: float, initial_grid_y: float, threshold: float, max_iter: int, horizonal_first: bool, progress, initial_coordinates: ({ int: float }, { int: float })):
+    """
+    Implementation of "solve"
     """
 
-    self.x_coordinates = {}
-    self.y_coordinates = {}
-    for i in self.ix:
-      self.x_coordinates[i] = initial_grid_x * i
-    for i in self.iy:
-      self.y_coordinates[i] = initial_grid_y * i
+    # If only footprints have changed since the last solve and we start from 
+    # the last solution, the dependencies of the last solve stay valid. Only
+    # the indexes depending on the changed boxes need to be computed again.
+    incremental = (self._reuse_boxes and self._dependencies_valid and initial_coordinates is not None 
+                   and initial_coordinates[0] == self.x_coordinates and initial_coordinates[1] == self.y_coordinates)
+    self._dependencies_valid = False
+    self._incremental = incremental
+
+    if initial_coordinates is not None:
+      (x_start, y_start) = initial_coordinates
+      for (indexes, start, name) in ((self.ix, x_start, "x"), (self.iy, y_start, "y")):
+        missing = [ i for i in indexes if i not in start ]
+        if len(missing) > 0:
+          raise Exception(f"Initial coordinates are missing {name} index {missing[0]} (and maybe more)")
+      self.x_coordinates = { i: x_start[i] for i in self.ix }
+      self.y_coordinates = { i: y_start[i] for i in self.iy }
+    else:
+      self.x_coordinates = {}
+      self.y_coordinates = {}
+      for i in self.ix:
+        self.x_coordinates[i] = initial_grid_x * i
+      for i in self.iy:
+        self.y_coordinates[i] = initial_grid_y * i
+
+    start = time.perf_counter()
+    if self._reuse_boxes:
+      # footprints have been updated by "update_footprints" already
+      self._reuse_boxes = False
+    else:
+      with self._phase("box generation"):
+        self._generate_boxes()
+    stats.box_generation_time = time.perf_counter() - start
+
+    if incremental:
+      # the boxes with changed footprints are dirty for the next pass of either axis
+      self._pending_footprints = { True: self._changed_footprints, False: self._changed_footprints }
+    else:
+      # no pass done yet - all indexes need to be computed
+      self._dependencies = { True: {}, False: {} }
+      self._dirty = { True: None, False: None }
+      self._pending_footprints = { True: {}, False: {} }
 
-    delta = threshold * 2
     niter = 0
+    passes = 0
+    converged = False
+    status = SolverStats.MAX_ITER
 
-    logger = logging.getLogger("g2l-solver")
-    
-    logger.info("solving constraints")
-    logger.info(f"x=" + ",".join([ "%.12g" % v for v in self.x_coordinates.values() ]))
-    logger.info(f"y=" + ",".join([ "%.12g" % v for v in self.y_coordinates.values() ]))
+    # the coordinate states after each iteration for detecting cycles
+    states = {}
+
+    if logger.isEnabledFor(logging.INFO):
+      logger.info("solving constraints (%d x and %d y indexes)", len(self.ix), len(self.iy))
+    self._log_coordinates("initial")
 
-    while delta > threshold and niter < max_iter:
+    while not converged and niter < max_iter:
 
       xc = self.x_coordinates.copy()
       yc = self.y_coordinates.copy()
 
-      self._compute_coordinates(horizonal_first)
-      self._compute_coordinates(not horizonal_first)
+      times = {}
+      deltas = {}
+      for h in (horizonal_first, not horizonal_first):
+        axis = "x" if h else "y"
+        start = time.perf_counter()
+        with self._phase(f"compaction {axis}", iteration = niter + 1):
+          try:
+            self._compute_coordinates(h)
+          except _SolveAborted:
+            # fall back to the coordinates before this pass
+            if h:
+              self.x_coordinates = xc
+            else:
+              self.y_coordinates = yc
+            raise
+        times[axis] = time.perf_counter() - start
+        deltas[axis] = self._diff(xc, self.x_coordinates) if h else self._diff(yc, self.y_coordinates)
+        passes += 1
+        # A pass is a function of the other axis' coordinates. If it does not
+        # change anything and the other axis was computed from this axis' 
+        # coordinates in the previous pass, the other axis will not change 
+        # either - so there is no need to compute it again.
+        if passes > 1 and deltas[axis] <= threshold:
+          converged = True
+          break
 
       niter += 1
-      delta = max(self._diff(xc, self.x_coordinates), self._diff(yc, self.y_coordinates))
+      stats.iteration_times.append(times)
+      stats.deltas.append(deltas)
+      delta = max(deltas.values())
+
+      if logger.isEnabledFor(logging.INFO):
+        moved = self._moved(xc, self.x_coordinates, threshold) + self._moved(yc, self.y_coordinates, threshold)
+        logger.info("iteration %d: max delta %.12g (threshold is %.12g), %d indexes moved", niter, delta, threshold, moved)
+      self._log_coordinates(f"iteration {niter}")
+
+      stats.iterations = niter
+      stats.delta = delta
+
+      last = converged or niter >= max_iter
+
+      if converged:
+        status = SolverStats.CONVERGED
+      else:
+        # the passes are deterministic, so reaching a previous state again means 
+        # the solver is cycling and will never converge
+        state = (tuple(self.x_coordinates.values()), tuple(self.y_coordinates.values()))
+        previous = states.get(state)
+        if previous is not None:
+          stats.cycle_length = niter - previous
+          status = SolverStats.CYCLE
+          last = True
+        else:
+          states[state] = niter
+
+      if last:
+        # the progress callback sees the final status
+        stats.converged = converged
+        stats.status = status
+
+      if progress is not None and progress(stats) is False and not last:
+        raise _SolveAborted(SolverStats.CANCELLED)
+
+      if last:
+        break
 
-      logger.info(f"iteration {niter}:")
-      logger.info(f"x=" + ",".join([ "%.12g" % v for v in self.x_coordinates.values() ]))
-      logger.info(f"y=" + ",".join([ "%.12g" % v for v in self.y_coordinates.values() ]))
-      logger.info(f"difference to previous iteration: {'%.12g' % delta} (threshold is {'%.12g' % threshold})")
+    stats.converged = converged
+    stats.status = status
 
-    logger.info("solver stopped.")
+    self._dependencies_valid = True
 
-    return niter < max_iter
+    if logger.isEnabledFor(logging.INFO):
+      logger.info("solver stopped (%s after %d iterations).", stats.status, niter)
 
-  def produce(self, layout: kl.Layout, cell: kl.Cell):
+  def produce(self, layout: "kl.Layout", cell: "kl.Cell", memory: MemoryProfiler = None, tracker: ProduceTracker = None):
     """
     Generates the layout
 
@@ -118,16 +329,71 @@ class Solver(object):
 
     It uses the "create_layers" from the technology singleton
     (Tech.rules) to generate the output layers.
+
+    With a tracker, the cell is updated in place: only the objects
+    of components which are new, have moved or were removed since
+    the last "produce" with the same tracker are touched.
+
+    :param memory: if given, the memory figures for this step are recorded there as "produce" phase (Python allocations only - see MemoryProfiler)
+    :param tracker: if given, the cell is updated incrementally using this tracker (see ProduceTracker)
+    """
+
+    if memory is not None:
+      with memory.phase("produce"):
+        self._produce(layout, cell, tracker)
+    else:
+      self._produce(layout, cell, tracker)
+
+  def _produce(self, layout: "kl.Layout", cell: "kl.Cell", tracker: ProduceTracker):
+    """
+    Implementation of "produce"
     """
 
     layers = self.tech_rules.create_layers(layout)
 
-    for c in self.graph.components:
+    if self._frozen is None:
+      # e.g. coordinates read from a file
+      self._frozen = self.graph.freeze()
+    graph = self._frozen
+
+    if tracker is not None:
+      tracker.update(graph, self.x_coordinates, self.y_coordinates, layout, cell, layers)
+      return
+
+    for c in graph.components:
+      c.produce(graph, self.x_coordinates, self.y_coordinates, layout, cell, layers)
+
+  def write_coordinates(self, filename: str, key: str = None):
+    """
+    Writes the solved coordinates to a file
+
+    See "g2l.coordinates.write_coordinates" for the file formats.
+
+    :param filename: the file to write (".npz" for a numpy archive, otherwise raw binary)
+    :param key: an optional key stored in the file (e.g. a graph hash)
+    """
+    if self.x_coordinates is None:
+      raise Exception("Graph is not solved yet")
+    write_coordinates(filename, self.x_coordinates, self.y_coordinates, key)
+
+  def read_coordinates(self, filename: str) -> str:
+    """
+    Reads the coordinates from a file instead of solving
 
-      for g in c.geometry(self.graph, self.x_coordinates, self.y_coordinates):
-        (layer, box) = g
-        cell.shapes(layers[layer]).insert(box)
+    After this, "produce" can be used without calling "solve".
+    The file needs to provide coordinates for all grid indexes
+    of the graph.
 
+    :returns The key stored in the file (None if there is no key)
+    """
+    (x_coordinates, y_coordinates, key) = read_coordinates(filename)
+    for (indexes, coordinates, name) in ((self.ix, x_coordinates, "x"), (self.iy, y_coordinates, "y")):
+      missing = [ i for i in indexes if i not in coordinates ]
+      if len(missing) > 0:
+        raise Exception(f"Coordinate file {filename} is missing {name} index {missing[0]} (and maybe more)")
+    self.x_coordinates = x_coordinates
+    self.y_coordinates = y_coordinates
+    return key
 
   def _diff(self, a: [float], b: [float]) -> float:
     """
@@ -138,69 +404,313 @@ class Solver(object):
       d = max(d, abs(a[i] - b[i]))
     return d
 
+  def _moved(self, a: { int: float }, b: { int: float }, threshold: float) -> int:
+    """
+    Computes the number of coordinates which changed by more than the threshold
+    """
+    return sum([ 1 for i in a.keys() if abs(a[i] - b[i]) > threshold ])
+
+  def _log_coordinates(self, title: str):
+    """
+    Dumps the current coordinates on the debug channel
+    """
+    if coordinate_logger.isEnabledFor(logging.DEBUG):
+      coordinate_logger.debug("%s:", title)
+      coordinate_logger.debug("x=%s", self._format_coordinates(self.x_coordinates))
+      coordinate_logger.debug("y=%s", self._format_coordinates(self.y_coordinates))
+
+  def _format_coordinates(self, coordinates: { int: float }) -> str:
+    """
+    Formats the coordinates for the debug channel
+    """
+    return ",".join([ "%.12g" % v for v in coordinates.values() ])
+
+  def _phase(self, name: str, memory: bool = True, **args):
+    """
+    Returns a context manager recording a trace span and the memory figures of a phase if requested
+    """
+    stack = contextlib.ExitStack()
+    if self._trace is not None:
+      stack.enter_context(self._trace.span(name, cat = "solver", **args))
+    if memory and self._memory is not None:
+      stack.enter_context(self._memory.phase(name))
+    return stack
+
+  def _check_abort(self):
+    """
+    Stops the solver if the time budget is exhausted or the solver got cancelled
+    """
+    if self._deadline is not None and time.perf_counter() > self._deadline:
+      raise _SolveAborted(SolverStats.TIMEOUT)
+    if self._cancel is not None and self._cancel.cancelled:
+      raise _SolveAborted(SolverStats.CANCELLED)
+
+  def _generate_boxes(self):
+    """
+    Generates the abstract boxes of all components
+
+    The boxes are stored per axis and per start index, so the 
+    compaction passes can pick the boxes of one column or row.
+    In addition, the boxes are stored per perpendicular index
+    they touch for tracking the indexes which need an update.
+    """
+
+    self._boxes_per_index = { True: {}, False: {} }
+    self._boxes_per_perpendicular_index = { True: {}, False: {} }
+    self._layers = set()
+    self._max_extension = { True: 0.0, False: 0.0 }
+    # only set once all boxes are there, so "update_footprints" rejects an aborted box generation
+    self._component_boxes = None
+    all_boxes = []
+
+    check_abort = self._deadline is not None or self._cancel is not None
+
+    self._frozen = self.graph.freeze()
+
+    for component_boxes in self._frozen.boxes_per_component(self._check_abort if check_abort else None):
+      if check_abort:
+        self._check_abort()
+      all_boxes.append(component_boxes)
+      for b in component_boxes:
+        for h in (True, False):
+          i = b.ixory1(h)
+          boxes = self._boxes_per_index[h].get(i)
+          if boxes is None:
+            self._boxes_per_index[h][i] = [ b ]
+          else:
+            boxes.append(b)
+          for k in set([ b.iyorx1(h), b.iyorx2(h) ]):
+            boxes = self._boxes_per_perpendicular_index[h].get(k)
+            if boxes is None:
+              self._boxes_per_perpendicular_index[h][k] = [ b ]
+            else:
+              boxes.append(b)
+          self._max_extension[h] = max(self._max_extension[h], -b.xorymin(h))
+        self._layers.add(b.layer)
+
+    self._interactions = Tech.interactions(self._layers, self.tech_rules)
+    self._component_boxes = all_boxes
+
+  def update_footprints(self):
+    """
+    Updates the footprint boxes after component parameters have changed
+
+    Use this method after changing parameters such as wire widths
+    or device sizes which change the footprints, but not the 
+    nodes and layers of the components. The abstract boxes and 
+    their index are kept and only the footprints are replaced.
+    The next "solve" will use these boxes instead of generating
+    them again. If it is warm-started from the current solution
+    (initial_coordinates = (solver.x_coordinates, solver.y_coordinates)),
+    it will only compute the indexes affected by the changed 
+    footprints again.
+
+    "solve" needs to have been called before and must have got
+    past box generation (it may have been stopped later). The
+    graph given to the solver must not be a frozen one.
+    """
+
+    if self._component_boxes is None:
+      raise Exception("Graph needs to be solved before footprints can be updated (a solve stopped during box generation does not count)")
+
+    if len(self._component_boxes) != len(self.graph.components):
+      raise Exception("Components have been added or removed - graph needs to be solved from scratch")
+
+    frozen = self.graph.freeze()
+    if frozen is self.graph:
+      raise Exception("The footprints of a frozen graph cannot change - use the original graph with the solver")
+
+    self._changed_footprints = {}
+
+    for (c, boxes, new_boxes) in zip(self.graph.components, self._component_boxes, frozen.boxes_per_component()):
+      if len(new_boxes) != len(boxes):
+        raise Exception(f"Number of boxes of component {c!r} has changed - graph needs to be solved from scratch")
+      for (b, nb) in zip(boxes, new_boxes):
+        if (b.ix1, b.iy1, b.ix2, b.iy2, b.layer) != (nb.ix1, nb.iy1, nb.ix2, nb.iy2, nb.layer):
+          raise Exception(f"Boxes of component {c!r} have changed their location or layer - graph needs to be solved from scratch")
+        if b.box != nb.box:
+          self._changed_footprints.setdefault(b, b.box)
+          b.box = nb.box
+
+    for h in (True, False):
+      self._max_extension[h] = max([ 0.0 ] + [ -b.xorymin(h) for boxes in self._component_boxes for b in boxes ])
+
+    self._frozen = frozen
+    self._reuse_boxes = True
+
   def _compute_coordinates(self, h: bool):
 
     """
     One iteration step
 
     Updates the coordinates either in horizontal (h = True) or vertical (h = False) direction
+
+    The coordinate of an index is a function of the coordinates of
+    the preceding indexes on the same axis and the perpendicular
+    coordinates of the boxes involved. In incremental solves (see
+    "update_footprints"), indexes whose dependencies did not change
+    since the last pass keep their coordinate and are not evaluated
+    again. In other solves, almost every index moves in the first 
+    passes, so skipping is not attempted there. The dependencies
+    are recorded in any case for a following incremental solve.
     """
 
-    prev_boxes = []
+    # boxes of the preceding indexes which are still within reach (all if not windowed) per layer
+    prev_boxes = _BoxesPerLayer()
+    shields = ShieldingIndex(h)
+    boxes_per_index = self._boxes_per_index[h]
+    coordinates = self.x_coordinates if h else self.y_coordinates
     min_coord = 0.0
 
-    for i in (self.ix if h else self.iy):
+    # dependencies recorded in the last pass: index -> (same-axis indexes of interacting boxes, 
+    # index up to which boxes have been retired in windowed mode or None)
+    dependencies = self._dependencies[h]
+
+    # perpendicular indexes changed since the last pass (None: no previous pass)
+    dirty = self._dirty[h] if self._incremental else None
+    if dirty is not None:
+      dirty_boxes = _DirtyBoxes(h, self._interactions, self._boxes_per_perpendicular_index[h], dirty, self._pending_footprints[h])
+
+    # same-axis indexes changed in this pass
+    changed = set()
+    first_changed = None
+
+    if self._windowed:
+      window = _Window(self._interactions, self._max_extension[h])
+
+    # pairs evaluated, pairs pruned, shielding checks, shielding hits
+    counts = [ 0, 0, 0, 0 ]
+    indexes_skipped = 0
 
-      current_boxes = []
-      for j in (self.iy if h else self.ix):
-        for c in self.graph.components_for_node((i, j) if h else (j, i)):
-          for b in c.boxes(self.graph):
-            if b.ixory1(h) == i:
-              current_boxes.append(b)
+    check_abort = self._deadline is not None or self._cancel is not None
+
+    indexes = self.ix if h else self.iy
+
+    for (pos, i) in enumerate(indexes):
+
+      if check_abort:
+        self._check_abort()
+
+      current_boxes = boxes_per_index.get(i, [])
 
       if len(current_boxes) > 0:
 
-        min_coord = 0.0
+        if dirty is not None and i in dependencies and not self._needs_update(i, current_boxes, coordinates[i], dirty_boxes, dependencies[i], changed, first_changed):
+
+          # nothing this index depends on has changed
+          min_coord = coordinates[i]
+          indexes_skipped += 1
+
+        else:
+
+          depends_on = set()
+
+          # only boxes reaching up to this index can shield
+          shields.retire(i)
+
+          min_coord = self._max_coord(h, current_boxes, prev_boxes, 0.0, shields, depends_on, counts)
+
+          # retired boxes can only push the boxes of this index up to the watermark
+          if self._windowed and min_coord < window.watermark:
+            retired = window.retired(indexes[:pos], boxes_per_index, prev_boxes)
+            min_coord = self._max_coord(h, current_boxes, retired, min_coord, shields, depends_on, counts)
 
-        # NOTE: this is rather brute force - the complexity boils down to O(2)
-        for cb in current_boxes:
-          for pb in prev_boxes:
-            space = self.tech_rules.space(min(pb.layer, cb.layer), max(pb.layer, cb.layer))
-            if space is not None:
-              coord = self._compute_coord(space, pb, cb, h)
-              if coord is not None and coord > min_coord and not self._box_is_shielded(cb, pb, prev_boxes, h):
+          dependencies[i] = (depends_on, window.retired_upto if self._windowed and min_coord >= window.watermark else None)
+
+      if coordinates[i] != min_coord:
+        changed.add(i)
+        if first_changed is None:
+          first_changed = i
+        coordinates[i] = min_coord
+
+      prev_boxes.add(current_boxes)
+      shields.add(current_boxes)
+
+      if dirty is not None:
+        dirty_boxes.advance(i, coordinates)
+
+      if self._windowed:
+        window.advance(h, i, coordinates, current_boxes, prev_boxes)
+
+    # the perpendicular axis needs to consider the indexes changed in this pass
+    self._dirty[h] = set()
+    self._pending_footprints[h] = {}
+    if self._dirty[not h] is not None:
+      self._dirty[not h] |= changed
+
+    self.stats.indexes_skipped += indexes_skipped
+    self.stats.pairs_evaluated += counts[0]
+    self.stats.pairs_pruned += counts[1]
+    self.stats.shielding_checks += counts[2]
+    self.stats.shielding_hits += counts[3]
+
+  def _max_coord(self, h: bool, current_boxes: [Box], prev_boxes: "_BoxesPerLayer", min_coord: float, shields: ShieldingIndex, depends_on: set, counts: [int]) -> float:
+
+    """
+    Computes the minimum coordinate of an index imposed by the given preceding boxes
+
+    :param current_boxes: the boxes starting at the index
+    :param prev_boxes: the preceding boxes to check against
+    :param min_coord: the minimum coordinate so far
+    :param shields: the shielding index for the current sweep position
+    :param depends_on: receives the same-axis indexes of the interacting boxes
+    :param counts: pairs evaluated, pairs pruned, shielding checks and hits (updated)
+    """
+
+    pairs_ruled = 0
+    shielding_checks = 0
+    shielding_hits = 0
+
+    # NOTE: this is rather brute force - the complexity boils down to O(2)
+    # Only boxes on layers with a space rule are considered.
+    for cb in current_boxes:
+      for (layer, space) in self._interactions.spaces(cb.layer).items():
+        boxes = prev_boxes.boxes_per_layer.get(layer)
+        if boxes is None:
+          continue
+        pairs_ruled += len(boxes)
+        for pb in boxes:
+          coord = self._compute_coord(space, pb, cb, h)
+          if coord is not None:
+            depends_on.add(pb.ixory1(h))
+            depends_on.add(pb.ixory2(h))
+            if coord > min_coord:
+              shielding_checks += 1
+              if shields.is_shielded(cb, pb):
+                shielding_hits += 1
+              else:
                 min_coord = coord
 
-      if h:
-        self.x_coordinates[i] = min_coord
-      else:
-        self.y_coordinates[i] = min_coord
+    pairs_evaluated = len(current_boxes) * prev_boxes.count
+    counts[0] += pairs_evaluated
+    counts[1] += pairs_evaluated - pairs_ruled
+    counts[2] += shielding_checks
+    counts[3] += shielding_hits
 
-      prev_boxes += current_boxes
+    return min_coord
 
-  def _box_is_shielded(self, b: Box, wrt: Box, other_boxes: [Box], h: bool) -> bool:
+  def _needs_update(self, i: int, current_boxes: [Box], coord: float, dirty_boxes: "_DirtyBoxes", dependencies: (set, int), changed: set, first_changed: int) -> bool:
 
     """
-    Determines whether a box is shielded by other boxes
+    Determines whether the coordinate of an index needs to be computed again
+
+    This is the case if a same-axis index of an interacting box has 
+    changed in the current pass or if a box which changed since the
+    last pass may affect the boxes of this index (see "_DirtyBoxes").
 
-    Given an interacting pair of boxes (b, wrt), this
-    method determines whether other boxes from the "other_boxes"
-    collection shield this interaction (overlap the gap).
+    In windowed mode, the coordinate may also depend on the 
+    boxes retired from the sweep if one of their indexes changed.
     """
 
-    iyorx1 = max(b.iyorx1(h), wrt.iyorx1(h))
-    iyorx2 = min(b.iyorx2(h), wrt.iyorx2(h))
-    yorxmin = max(b.yorxmin(h), wrt.yorxmin(h))
-    yorxmax = min(b.yorxmax(h), wrt.yorxmax(h))
+    (depends_on, retired_upto) = dependencies
 
-    for ob in other_boxes:
-      if ob.iyorx1(h) > iyorx1 or ob.iyorx2(h) < iyorx2 or (b.layer != ob.layer and wrt.layer != ob.layer) or ob.ixory2(h) < b.ixory1(h):
-        continue
-      if ob.yorxmin(h) > yorxmin + 1e-10 or ob.yorxmax(h) < yorxmax - 1e-10:
-        continue
+    if not depends_on.isdisjoint(changed):
       return True
 
-    return False
+    if retired_upto is not None and first_changed is not None and first_changed <= retired_upto:
+      return True
+
+    return dirty_boxes.affects(current_boxes, coord)
 
   def _compute_coord(self, space: float, b1: Box, b2: Box, h: bool) -> float:
 
@@ -223,30 +733,246 @@ class Solver(object):
     if b1.ix2 >= b2.ix1:
       return None
 
-    dbox1 = b1.box * kl.DBox(self.x_coordinates[b1.ix1], self.y_coordinates[b1.iy1], self.x_coordinates[b1.ix2], self.y_coordinates[b1.iy2])
-    dbox2 = b2.box * kl.DBox(0.0, self.y_coordinates[b2.iy1], 0.0, self.y_coordinates[b2.iy2])
+    # This is the convolution of the footprint boxes with the grid 
+    # coordinates, enlarged by the space, with the arithmetics spelled
+    # out to avoid creating Rect objects in the inner loop.
+    # b2 is placed at x = 0.
 
-    dbox1 = dbox1.enlarged(space, space)
+    xc = self.x_coordinates
+    yc = self.y_coordinates
+    box1 = b1.box
+    box2 = b2.box
+
+    (y1, y2) = (yc[b1.iy1], yc[b1.iy2])
+    (y3, y4) = (yc[b2.iy1], yc[b2.iy2])
 
     # no perpendicular overlap
-    if dbox1.bottom > dbox2.top - 1e-10 or dbox1.top < dbox2.bottom + 1e-10:
+    if box1.bottom + min(y1, y2) - space > box2.top + max(y3, y4) - 1e-10 or box1.top + max(y1, y2) + space < box2.bottom + min(y3, y4) + 1e-10:
       return None 
     
-    return dbox1.right - dbox2.left
+    return box1.right + max(xc[b1.ix1], xc[b1.ix2]) + space - box2.left
 
   def _compute_coord_v(self, space: float, b1: Box, b2: Box) -> float:
 
     if b1.iy2 >= b2.iy1:
       return None
 
-    dbox1 = b1.box * kl.DBox(self.x_coordinates[b1.ix1], self.y_coordinates[b1.iy1], self.x_coordinates[b1.ix2], self.y_coordinates[b1.iy2])
-    dbox2 = b2.box * kl.DBox(self.x_coordinates[b2.ix1], 0.0, self.x_coordinates[b2.ix2], 0.0)
+    # see "_compute_coord_h" - b2 is placed at y = 0
+
+    xc = self.x_coordinates
+    yc = self.y_coordinates
+    box1 = b1.box
+    box2 = b2.box
 
-    dbox1 = dbox1.enlarged(space, space)
+    (x1, x2) = (xc[b1.ix1], xc[b1.ix2])
+    (x3, x4) = (xc[b2.ix1], xc[b2.ix2])
 
     # no perpendicular overlap
-    if dbox1.left > dbox2.right - 1e-10 or dbox1.right < dbox2.left + 1e-10:
+    if box1.left + min(x1, x2) - space > box2.right + max(x3, x4) - 1e-10 or box1.right + max(x1, x2) + space < box2.left + min(x3, x4) + 1e-10:
       return None 
     
-    return dbox1.top - dbox2.bottom
+    return box1.top + max(yc[b1.iy1], yc[b1.iy2]) + space - box2.bottom
+
+
+
+class _SolveAborted(Exception):
+
+  """
+  Internally used to unwind the solver when the time budget is exhausted or it got cancelled
+  """
+
+  def __init__(self, status: str):
+    self.status = status
+
+
+class _BoxesPerLayer(object):
+
+  """
+  Internally used to hold boxes per layer
+  """
+
+  def __init__(self):
+    self.boxes_per_layer = {}
+    self.count = 0
+
+  def add(self, boxes: [Box]):
+    for b in boxes:
+      boxes_on_layer = self.boxes_per_layer.get(b.layer)
+      if boxes_on_layer is None:
+        self.boxes_per_layer[b.layer] = { b: None }
+      else:
+        boxes_on_layer[b] = None
+    self.count += len(boxes)
+
+  def remove(self, b: Box):
+    del self.boxes_per_layer[b.layer][b]
+    self.count -= 1
+
+
+class _DirtyBoxes(object):
+
+  """
+  Internally used to find the indexes affected by boxes which changed since the last pass
+
+  A box is dirty if one of its perpendicular indexes has moved or
+  its footprint has changed. The coordinate of an index needs to
+  be computed again if
+
+  * one of its boxes is dirty,
+  * a dirty preceding box on an interacting layer reaches up to 
+    one of its boxes (its far edge plus the space is not left of
+    (below) the box's near edge at the current coordinate) - only
+    then it can push the box or may have been the one pushing it,
+  * a box with a changed footprint spans the index, as it may
+    shield differently now (shielding only depends on the indexes
+    and footprints).
+
+  "affects" tells whether an index needs to be computed again,
+  "advance" needs to be called after each index.
+  """
+
+  def __init__(self, h: bool, interactions: LayerInteractions, boxes_per_perpendicular_index: { int: [Box] }, dirty: set, footprints: { Box: Rect }):
+    """
+    :param dirty: the perpendicular indexes which have moved
+    :param footprints: the boxes whose footprint has changed with their previous footprint
+    """
+
+    self.h = h
+    self.interactions = interactions
+    self.footprints = footprints
+
+    self.boxes = set(footprints.keys())
+    for k in dirty:
+      self.boxes.update(boxes_per_perpendicular_index.get(k, []))
+
+    self._ending = {}
+    for b in self.boxes:
+      self._ending.setdefault(b.ixory2(h), []).append(b)
+
+    self._starting = {}
+    for b in footprints.keys():
+      self._starting.setdefault(b.ixory1(h), []).append(b)
+
+    # per layer: the maximum far edge of the dirty boxes passed and the number of changed footprints spanning the sweep front
+    self._far = {}
+    self._spanning = {}
+
+  def affects(self, current_boxes: [Box], coord: float) -> bool:
+    """
+    Determines whether the boxes of an index placed at the given coordinate are affected
+    """
+
+    h = self.h
+
+    for cb in current_boxes:
+      if cb in self.boxes or self._spanning.get(cb.layer, 0) > 0:
+        return True
+      near = coord + cb.xorymin(h) - 1e-10
+      for (layer, space) in self.interactions.spaces(cb.layer).items():
+        if self._spanning.get(layer, 0) > 0:
+          return True
+        far = self._far.get(layer)
+        if far is not None and far + space >= near:
+          return True
+
+    return False
+
+  def advance(self, i: int, coordinates: { int: float }):
+    """
+    Registers the final coordinate of index i
+    """
+
+    h = self.h
+
+    for b in self._starting.pop(i, []):
+      self._spanning[b.layer] = self._spanning.get(b.layer, 0) + 1
+
+    for b in self._ending.pop(i, []):
+      far = max(coordinates[b.ixory1(h)], coordinates[i]) + b.xorymax(h)
+      old = self.footprints.get(b)
+      if old is not None:
+        far = max(far, max(coordinates[b.ixory1(h)], coordinates[i]) + (old.right if h else old.top))
+        self._spanning[b.layer] -= 1
+      if far > self._far.get(b.layer, -math.inf):
+        self._far[b.layer] = far
+
+
+class _Window(object):
+
+  """
+  Internally used to retire boxes from the sweep in windowed mode
+
+  A box is retired once its far edge plus the halo of its layer and 
+  the maximum extension of a box below its start node is left
+  of (below) the sweep front. Assuming the sweep front is not
+  moving backwards, such a box can no longer interact with boxes
+  coming later. The "watermark" is the coordinate up to which 
+  retired boxes could still push other boxes. If an index ends
+  up below the watermark, the retired boxes need to be checked too.
+  "retired_upto" is the highest end index of the retired boxes.
+
+  Retired boxes are only kept once they are needed. As long as 
+  no index ends up below the watermark, the window only holds the
+  boxes within reach. Otherwise "retired" collects them from the
+  boxes of the preceding indexes on first use and they are kept
+  from then on.
+  """
+
+  def __init__(self, interactions: LayerInteractions, extension: float):
+    self.interactions = interactions
+    self.extension = extension
+    self.front = None
+    self.watermark = -math.inf
+    self.retired_upto = None
+    self._retired = None
+    self._ending = {}
+    self._heap = []
+    self._seq = 0
+
+  def advance(self, h: bool, i: int, coordinates: { int: float }, current_boxes: [Box], active_boxes: _BoxesPerLayer):
+
+    """
+    Registers the coordinate of index i and retires boxes which are out of reach
+    """
+
+    coord = coordinates[i]
+
+    for b in current_boxes:
+      self._ending.setdefault(b.ixory2(h), []).append(b)
+
+    # boxes ending at this index now have a known far edge
+    # NOTE: the start index may be placed beyond the end index, so we need to consider both
+    for b in self._ending.pop(i, []):
+      far = max(coord, coordinates[b.ixory1(h)]) + b.xorymax(h)
+      heapq.heappush(self._heap, (far + self.interactions.halo(b.layer) + self.extension, self._seq, b))
+      self._seq += 1
+
+    if self.front is None or coord > self.front:
+      self.front = coord
+
+    while len(self._heap) > 0 and self._heap[0][0] <= self.front:
+      (bound, unused, b) = heapq.heappop(self._heap)
+      active_boxes.remove(b)
+      if self._retired is not None:
+        self._retired.add([ b ])
+      self.watermark = max(self.watermark, bound)
+      if self.retired_upto is None or self.retired_upto < b.ixory2(h):
+        self.retired_upto = b.ixory2(h)
+
+  def retired(self, indexes: [int], boxes_per_index: { int: [Box] }, active_boxes: _BoxesPerLayer) -> _BoxesPerLayer:
+
+    """
+    Gets the retired boxes
+
+    On the first call, these are collected from the boxes of the 
+    given preceding indexes which are no longer active.
+    """
+
+    if self._retired is None:
+      self._retired = _BoxesPerLayer()
+      for k in indexes:
+        boxes = boxes_per_index.get(k)
+        if boxes is not None:
+          self._retired.add([ b for b in boxes if b not in active_boxes.boxes_per_layer.get(b.layer, {}) ])
 
+    return self._retired
@@ -0,0 +1,184 @@
+
+import json
+import os
+import threading
+import time
+
+class SolverStats(object):
+
+  """
+  Statistics of a solver run
+
+  An object of this kind is returned by "Solver.solve".
+  For backward compatibility, the object evaluates to
+  True in a boolean context if the solver converged.
+
+  Public attributes:
+  * converged: True, if the solver converged
+  * status: why the solver stopped (CONVERGED, MAX_ITER, CYCLE, TIMEOUT or CANCELLED)
+  * iterations: the number of iterations done (the last one may consist of one axis only)
+  * delta: the final maximum coordinate change
+  * deltas: a list with one dict per iteration giving the maximum coordinate change per axis ("x" and "y")
+  * cycle_length: if the solver was found cycling, the number of iterations after which the coordinates repeat
+  * box_generation_time: the wall time spent for generating the abstract boxes (seconds)
+  * iteration_times: a list with one dict per iteration giving the wall time per axis ("x" and "y", seconds)
+  * pairs_evaluated: the number of box pairs evaluated
+  * pairs_pruned: the number of box pairs skipped because there is no space rule
+  * shielding_checks: the number of shielding tests done
+  * shielding_hits: the number of shielding tests which found the interaction to be shielded
+  * indexes_skipped: the number of column or row evaluations skipped because their dependencies did not change
+  """
+
+  CONVERGED = "converged"
+  MAX_ITER = "max_iter"
+  CYCLE = "cycle"
+  TIMEOUT = "timeout"
+  CANCELLED = "cancelled"
+
+  def __init__(self):
+    self.converged = False
+    self.status = None
+    self.iterations = 0
+    self.delta = None
+    self.deltas = []
+    self.cycle_length = None
+    self.box_generation_time = 0.0
+    self.iteration_times = []
+    self.pairs_evaluated = 0
+    self.pairs_pruned = 0
+    self.shielding_checks = 0
+    self.shielding_hits = 0
+    self.indexes_skipped = 0
+
+  def __bool__(self) -> bool:
+    return self.converged
+
+  def total_time(self) -> float:
+    """
+    Gets the total wall time spent in box generation and iterations
+    """
+    return self.box_generation_time + sum([ sum(t.values()) for t in self.iteration_times ])
+
+  def to_dict(self) -> dict:
+    """
+    Returns the statistics as a plain dict (e.g. for JSON output)
+    """
+    return dict(self.__dict__)
+
+  def convergence_report(self) -> str:
+    """
+    Returns a human-readable report on how the solver converged or why it did not
+    """
+    lines = []
+    for (i, deltas) in enumerate(self.deltas):
+      lines.append(f"iteration {i + 1}: " + " ".join([ f"{axis}={d:.12g}" for (axis, d) in deltas.items() ]))
+    if self.status == self.CONVERGED:
+      lines.append(f"converged after {self.iterations} iterations")
+    elif self.status == self.CYCLE:
+      lines.append(f"not converged: coordinates repeat every {self.cycle_length} iterations")
+    elif self.status == self.MAX_ITER:
+      lines.append(f"not converged: maximum number of iterations ({self.iterations}) reached")
+    else:
+      lines.append(f"stopped: {self.status}")
+    return "\n".join(lines)
+
+  def __repr__(self) -> str:
+    """
+    Returns the string representation
+    """
+    return "SolverStats(" + ", ".join([ f"{k}={v!r}" for (k, v) in self.to_dict().items() if k not in ("iteration_times", "deltas") ]) + ")"
+
+
+class TraceRecorder(object):
+
+  """
+  Records time spans in Chrome trace format
+
+  Pass an object of this kind to "Solver.solve" to receive
+  spans for the solver phases (box generation, iterations and
+  the compaction passes per axis). The result can be written
+  to a JSON file and viewed with "chrome://tracing" or Perfetto.
+
+  Custom spans can be recorded with "span":
+
+    trace = TraceRecorder()
+    with trace.span("my phase", cat = "user"):
+      ...
+    trace.write("trace.json")
+  """
+
+  def __init__(self):
+    self.events = []
+    self._t0 = time.perf_counter()
+
+  def span(self, name: str, cat: str = "g2l", **args) -> "_Span":
+    """
+    Returns a context manager recording a complete event ("X" phase)
+
+    :param name: the name of the span
+    :param cat: the category
+    :param args: additional arguments attached to the event
+    """
+    return _Span(self, name, cat, args)
+
+  def add(self, name: str, cat: str, start: float, duration: float, args: dict = None):
+    """
+    Adds a complete event
+
+    :param start: the start time as given by time.perf_counter()
+    :param duration: the duration in seconds
+    """
+    event = {
+      "name": name,
+      "cat": cat,
+      "ph": "X",
+      "ts": (start - self._t0) * 1e6,
+      "dur": duration * 1e6,
+      "pid": os.getpid(),
+      "tid": threading.get_ident()
+    }
+    if args:
+      event["args"] = args
+    self.events.append(event)
+
+  def merge(self, other: "TraceRecorder"):
+    """
+    Adds the events of another recorder, e.g. one sent back from a worker process
+
+    The time stamps are shifted to this recorder's time base.
+    """
+    shift = (other._t0 - self._t0) * 1e6
+    for event in other.events:
+      event = dict(event)
+      event["ts"] += shift
+      self.events.append(event)
+
+  def to_json(self) -> str:
+    """
+    Returns the trace in Chrome trace JSON format
+    """
+    return json.dumps({ "traceEvents": self.events, "displayTimeUnit": "ms" })
+
+  def write(self, filename: str):
+    """
+    Writes the trace to the given file
+    """
+    with open(filename, "w") as file:
+      file.write(self.to_json())
+
+
+class _Span(object):
+
+  def __init__(self, trace: TraceRecorder, name: str, cat: str, args: dict):
+    self.trace = trace
+    self.name = name
+    self.cat = cat
+    self.args = args
+
+  def __enter__(self):
+    self.start = time.perf_counter()
+    return self
+
+  def __exit__(self, *unused):
+    self.trace.add(self.name, self.cat, self.start, time.perf_counter() - self.start, self.args)
+    return False
@@ -0,0 +1,124 @@
+
+from .component import Component
+from .graph import Graph
+from .solver import Solver
+from .stats import SolverStats
+from .batch import _init_worker
+import importlib
+import multiprocessing
+
+def solve_sweep(graph: Graph, variants: [ { Component: dict } ], warm_start: bool = True, tech: str = None, jobs: int = 1, **solve_args) -> [ ({ int: float }, { int: float }, SolverStats) ]:
+  """
+  Solves a family of variants of one graph which differ in component parameters only
+
+  Each variant is given as a dict mapping components of the graph
+  to the parameters to change, e.g.
+
+    variants = [ { mos1: { "width": w }, wire1: { "width": 0.5 * w } } for w in widths ]
+
+  Parameters not mentioned in a variant keep their original values.
+  The changes must not alter the nodes or layers of the components -
+  typically these are wire widths and device sizes.
+
+  The variants are solved in the given order with one solver.
+  The box index built for the first variant is kept and only the
+  footprints are updated for the next one (see "Solver.update_footprints").
+  With "warm_start", each variant starts from the solution of the
+  previous one, which saves iterations if neighboring variants
+  are similar. Warm-started solutions may differ slightly from
+  those of cold solves, as the solver may settle in a different
+  arrangement.
+
+  With "jobs" larger than 1, the variants are split into
+  contiguous chunks which are solved in worker processes (see
+  "solve_batch" for the requirements). Warm starts then happen
+  within each chunk.
+
+  The graph's components are restored to their original parameters
+  after the sweep.
+
+  :param graph: the graph to solve
+  :param variants: the parameter changes per variant
+  :param warm_start: if True, each variant starts from the solution of the previous one
+  :param tech: the name of the technology module to import in the workers (e.g. "sky130")
+  :param jobs: the number of worker processes (1: solve in this process, None: number of CPUs)
+  :param solve_args: additional arguments passed to "Solver.solve"
+
+  :returns A list with a tuple of x coordinates, y coordinates and the statistics per variant
+  """
+
+  # refer to the components by index, so the variants survive pickling
+  component_index = { id(c): k for (k, c) in enumerate(graph.components) }
+  indexed_variants = []
+  for v in variants:
+    iv = {}
+    for (c, params) in v.items():
+      k = component_index.get(id(c))
+      if k is None:
+        raise Exception(f"Component {c!r} is not part of the graph")
+      iv[k] = params
+    indexed_variants.append(iv)
+
+  if jobs is None:
+    jobs = multiprocessing.cpu_count()
+  jobs = max(1, min(jobs, len(indexed_variants)))
+
+  if jobs <= 1:
+    if tech is not None:
+      importlib.import_module(tech)
+    return _solve_chunk((graph, indexed_variants, warm_start, solve_args))
+
+  chunk_size = (len(indexed_variants) + jobs - 1) // jobs
+  tasks = [ (graph, indexed_variants[i:i + chunk_size], warm_start, solve_args) for i in range(0, len(indexed_variants), chunk_size) ]
+
+  results = []
+  with multiprocessing.Pool(len(tasks), initializer = _init_worker, initargs = (tech, )) as pool:
+    for chunk_results in pool.imap(_solve_chunk, tasks):
+      results += chunk_results
+
+  return results
+
+
+def _solve_chunk(task: (Graph, [ { int: dict } ], bool, dict)) -> [ ({ int: float }, { int: float }, SolverStats) ]:
+  """
+  Solves a contiguous chunk of variants with one solver
+  """
+
+  (graph, variants, warm_start, solve_args) = task
+
+  # original values of all parameters touched
+  original = {}
+  for v in variants:
+    for (k, params) in v.items():
+      c = graph.components[k]
+      for name in params.keys():
+        if (k, name) not in original:
+          original[(k, name)] = getattr(c, name)
+
+  solver = Solver(graph)
+  results = []
+
+  try:
+
+    for v in variants:
+
+      for ((k, name), value) in original.items():
+        setattr(graph.components[k], name, value)
+      for (k, params) in v.items():
+        for (name, value) in params.items():
+          setattr(graph.components[k], name, value)
+
+      args = dict(solve_args)
+      if len(results) > 0:
+        solver.update_footprints()
+        if warm_start:
+          args["initial_coordinates"] = (solver.x_coordinates, solver.y_coordinates)
+
+      stats = solver.solve(**args)
+      results.append((solver.x_coordinates, solver.y_coordinates, stats))
+
+  finally:
+    for ((k, name), value) in original.items():
+      setattr(graph.components[k], name, value)
+
+  return results
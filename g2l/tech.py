@@ -16,3 +16,91 @@ class Tech(object):
   vias = None
   mosfets = None
 
+  _interactions_cache = {}
+
+  @classmethod
+  def interactions(cls, layers: [int], rules = None) -> "LayerInteractions":
+    """
+    Gets the layer interactions derived from the space rules for the given layers
+
+    The result is cached for the rules object and the given
+    set of layers.
+
+    :param layers: the layers to consider
+    :param rules: the rules object to use (default: Tech.rules)
+    """
+    if rules is None:
+      rules = cls.rules
+    key = frozenset(layers)
+    cached = cls._interactions_cache.get(key)
+    if cached is None or cached.rules is not rules:
+      cached = LayerInteractions(rules, key)
+      cls._interactions_cache[key] = cached
+    return cached
+
+
+class LayerInteractions(object):
+
+  """
+  Per-layer interaction data derived from the space rules
+
+  For a given set of layers, this object tabulates the space
+  rules (Tech.rules.space) and derives for each layer the set
+  of layers it interacts with (there is a space rule) and its
+  halo - the maximum space to any other layer. No box can
+  influence the placement of another box beyond its halo.
+
+  Public attributes:
+  * rules: the rules object the data is derived from
+  * layers: the layers considered
+  """
+
+  def __init__(self, rules, layers: [int]):
+    """
+    Creates the interaction data
+
+    :param rules: the technology rules object (see Tech.rules)
+    :param layers: the layers to consider
+    """
+
+    self.rules = rules
+    self.layers = sorted(layers)
+    self._spaces = {}
+
+    for l1 in self.layers:
+      spaces = {}
+      for l2 in self.layers:
+        s = rules.space(min(l1, l2), max(l1, l2))
+        if s is not None:
+          spaces[l2] = s
+      self._spaces[l1] = spaces
+
+  def space(self, layer1: int, layer2: int) -> float:
+    """
+    Gets the space between two layers or None if there is no space rule
+    """
+    return self._spaces[layer1].get(layer2)
+
+  def spaces(self, layer: int) -> { int: float }:
+    """
+    Gets the space rules of a layer as a dict of other layer to space
+    """
+    return self._spaces[layer]
+
+  def interacting(self, layer: int) -> [int]:
+    """
+    Gets the layers with a space rule against the given layer
+    """
+    return list(self._spaces[layer].keys())
+
+  def halo(self, layer: int) -> float:
+    """
+    Gets the maximum space of the given layer to any other layer (0 if there is none)
+    """
+    return max([ 0.0 ] + list(self._spaces[layer].values()))
+
+  def max_halo(self) -> float:
+    """
+    Gets the maximum halo over all layers
+    """
+    return max([ 0.0 ] + [ self.halo(l) for l in self.layers ])
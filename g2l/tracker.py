@@ -0,0 +1,108 @@
+
+from .component import Component
+from .graph import Graph
+import typing
+
+if typing.TYPE_CHECKING:
+  import klayout.db as kl
+
+class ProduceTracker(object):
+
+  """
+  Remembers which layout objects were produced by which component
+
+  Pass a tracker to "Solver.produce" to update a cell in place
+  instead of filling it from scratch. On each "produce", the
+  tracker compares each component's placement against the one
+  from the previous call. Objects of components that were removed
+  from the graph or have moved are deleted. Only new or moved
+  components are produced again. So after a small edit and
+  re-solve, the cost of "produce" follows the size of the change.
+
+  The placement of a component is given by its abstract boxes
+  and the physical coordinates of the grid indexes they span.
+
+  A tracker is bound to the first cell it is used with. Objects
+  in that cell that were not produced through the tracker are
+  left untouched. The layout needs to be in editable mode
+  (the default for standalone KLayout layouts).
+
+  Public attributes (figures of the last "produce"):
+  * inserted: the number of components produced
+  * deleted: the number of components whose objects were deleted
+  * kept: the number of components left untouched
+  """
+
+  def __init__(self):
+    self.inserted = 0
+    self.deleted = 0
+    self.kept = 0
+    self._layout = None
+    self._cell_index = None
+    self._entries = {}
+
+  def clear(self):
+    """
+    Forgets all tracked objects (without deleting them)
+    """
+    self._layout = None
+    self._cell_index = None
+    self._entries = {}
+
+  def update(self, graph: Graph, x_coordinates: { int: float }, y_coordinates: { int: float }, layout: "kl.Layout", cell: "kl.Cell", layers: { int: int }):
+    """
+    Brings the cell in line with the given graph and coordinates
+
+    This method is called by "Solver.produce".
+    """
+
+    if self._layout is None:
+      self._layout = layout
+      self._cell_index = cell.cell_index()
+    elif self._layout is not layout or self._cell_index != cell.cell_index():
+      raise Exception("A ProduceTracker can only be used with one cell")
+
+    previous = self._entries
+    entries = {}
+    to_produce = []
+
+    self.inserted = 0
+    self.deleted = 0
+    self.kept = 0
+
+    # a component added more than once is tracked per occurrence
+    occurrences = {}
+
+    for c in graph.components:
+      occurrence = occurrences.get(id(c), 0)
+      occurrences[id(c)] = occurrence + 1
+      key = (id(c), occurrence)
+      signature = self._signature(c, graph, x_coordinates, y_coordinates)
+      entry = previous.pop(key, None)
+      if entry is not None and entry[1] == signature:
+        entries[key] = entry
+        self.kept += 1
+      else:
+        if entry is not None:
+          self._delete(entry)
+        to_produce.append((key, c, signature))
+
+    # components no longer present in the graph
+    for entry in previous.values():
+      self._delete(entry)
+
+    for (key, c, signature) in to_produce:
+      objects = c.produce(graph, x_coordinates, y_coordinates, layout, cell, layers)
+      entries[key] = (c, signature, objects)
+      self.inserted += 1
+
+    self._entries = entries
+
+  def _delete(self, entry: (Component, tuple, list)):
+    for obj in entry[2]:
+      obj.delete()
+    self.deleted += 1
+
+  @staticmethod
+  def _signature(c: Component, graph: Graph, x_coordinates: { int: float }, y_coordinates: { int: float }) -> tuple:
+    return tuple((b.layer, b.box, x_coordinates[b.ix1], x_coordinates[b.ix2], y_coordinates[b.iy1], y_coordinates[b.iy2]) for b in graph.component_boxes(c))
@@ -0,0 +1,160 @@
+
+from .component import Component
+from .solver import Solver
+from .tech import Tech
+import os
+
+class Violation(object):
+
+  """
+  A space violation found by "verify"
+
+  Public attributes:
+  * layer1, layer2: the layers involved (identical for a space violation on one layer)
+  * space: the required space
+  * distance: the actual distance
+  * edge_pair: the violating edges as a KLayout DEdgePair (first edge on layer1, second on layer2)
+  * components1: the components producing the first edge
+  * components2: the components producing the second edge
+  """
+
+  def __init__(self, layer1: int, layer2: int, space: float, distance: float, edge_pair, components1: [Component], components2: [Component]):
+    self.layer1 = layer1
+    self.layer2 = layer2
+    self.space = space
+    self.distance = distance
+    self.edge_pair = edge_pair
+    self.components1 = components1
+    self.components2 = components2
+
+  def __repr__(self) -> str:
+    """
+    Returns the string representation
+    """
+    return f"Violation(layers={self.layer1}/{self.layer2}, space={self.space}, distance={self.distance:.12g}, edges={self.edge_pair}, components={self.components1!r}/{self.components2!r})"
+
+
+def verify(solver: Solver, threads: int = None, tile_size: float = None, dbu: float = 0.001) -> [Violation]:
+  """
+  Checks the solved geometry against the space rules
+
+  This function renders the geometry of the solved graph as
+  KLayout regions per layer and runs a space check for each
+  layer and a separation check for each layer pair with a space
+  rule (Tech.rules.space). Touching and overlapping shapes are
+  merged, so connected shapes do not form violations.
+
+  The checks are executed by a KLayout TilingProcessor, so they
+  run multi-threaded and - if a tile size is given - tile by tile.
+  This keeps the check cheap enough to run after every solve.
+
+  Violations are mapped back to the components whose geometry
+  forms the violating edges.
+
+  This function imports KLayout.
+
+  :param solver: the solver after "solve"
+  :param threads: the number of threads to use (default: number of CPUs)
+  :param tile_size: if given, the checks are performed in tiles of this size (in micrometers)
+  :param dbu: the database unit used for the checks
+
+  :returns A list of violations (empty if the geometry is clean)
+  """
+
+  import klayout.db as kl
+
+  graph = solver.graph
+
+  # render the geometry per layer and remember the source components
+  regions = {}
+  sources = {}
+  for c in graph.components:
+    for (layer, box) in c.geometry(graph, solver.x_coordinates, solver.y_coordinates):
+      ibox = box.to_dbox().to_itype(dbu)
+      region = regions.get(layer)
+      if region is None:
+        region = regions[layer] = kl.Region()
+        sources[layer] = []
+      region.insert(ibox)
+      sources[layer].append((ibox, c))
+
+  interactions = Tech.interactions(regions.keys(), solver.tech_rules)
+
+  tp = kl.TilingProcessor()
+  tp.dbu = dbu
+  tp.threads = threads or os.cpu_count() or 1
+
+  for (layer, region) in regions.items():
+    # merge up front: a tile only receives the shapes touching it, so
+    # it would not see the shapes covering the inner edges otherwise
+    region.merge()
+    tp.input(f"l{layer}", region)
+
+  checks = []
+  max_space = 0.0
+  for l1 in interactions.layers:
+    for (l2, space) in interactions.spaces(l1).items():
+      if l2 < l1 or space <= 0.0:
+        continue
+      ispace = int(round(space / dbu))
+      output = kl.EdgePairs()
+      name = f"o{len(checks)}"
+      tp.output(name, output)
+      if l1 == l2:
+        tp.queue(f"_output({name}, l{l1}.space_check({ispace}))")
+      else:
+        tp.queue(f"_output({name}, l{l1}.separation_check(l{l2}, {ispace}))")
+      checks.append((l1, l2, space, output))
+      max_space = max(max_space, space)
+
+  if len(checks) == 0:
+    return []
+
+  if tile_size is not None:
+    tp.tile_size(tile_size, tile_size)
+    tp.tile_border(max_space, max_space)
+
+  tp.execute("g2l verification")
+
+  violations = []
+  for (l1, l2, space, output) in checks:
+    # tiles overlap by the border, so a violation may be reported more than once
+    # (for a space check with the edges swapped)
+    seen = set()
+    for ep in output.each():
+      key = str(ep.normalized())
+      if l1 == l2:
+        key = tuple(sorted((str(ep.first), str(ep.second))))
+      if key in seen:
+        continue
+      seen.add(key)
+      violations.append(Violation(l1, l2, space, ep.distance() * dbu, ep.to_dtype(dbu),
+                                  _components_for_edge(sources[l1], ep.first),
+                                  _components_for_edge(sources[l2], ep.second)))
+
+  return violations
+
+
+def _components_for_edge(sources: list, edge) -> [Component]:
+  """
+  Finds the components whose boxes contribute to the given edge
+  """
+
+  left = min(edge.p1.x, edge.p2.x)
+  right = max(edge.p1.x, edge.p2.x)
+  bottom = min(edge.p1.y, edge.p2.y)
+  top = max(edge.p1.y, edge.p2.y)
+
+  components = []
+  for (box, c) in sources:
+    if box.left > right or box.right < left or box.bottom > top or box.top < bottom:
+      continue
+    # skip boxes touching the edge in a single point only
+    if left < right and (min(box.right, right) <= max(box.left, left)):
+      continue
+    if bottom < top and (min(box.top, top) <= max(box.bottom, bottom)):
+      continue
+    if c not in components:
+      components.append(c)
+
+  return components
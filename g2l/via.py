@@ -3,7 +3,7 @@ from .component import Component
 from .tech import Tech
 from .box import Box
 from .node import Node
-import klayout.db as kl
+from .rect import Rect
 
 class Via(Component):
 
@@ -23,7 +23,16 @@ class Via(Component):
   technology singleton (Tech.vias), because the actual
   via generation is highly technology specific in terms
   of extensions or landing pad generation.
+
+  Class attributes:
+  * template_cache: if set to a dict, the via box templates (see 
+    "boxes_for_all") are kept there across calls. Long-running 
+    processes such as the solve server workers use this to keep 
+    them warm. The templates are not invalidated when the technology
+    definitions change, so reset the dict in that case.
   """
+
+  template_cache = None
   
   def __init__(self, node: Node, bottom_layer: int, via_layer: int, top_layer: int):
 
@@ -54,6 +63,19 @@ class Via(Component):
     """
     return [ self.bottom_layer, self.via_layer, self.top_layer ]
 
+  def to_dict(self) -> dict:
+    """
+    Reimplementation of the Component interface
+    """
+    return { "node": list(self.node.ixy()), "bottom_layer": self.bottom_layer, "via_layer": self.via_layer, "top_layer": self.top_layer }
+
+  @classmethod
+  def from_dict(cls, d: dict) -> "Via":
+    """
+    Creates a via from the dict delivered by "to_dict"
+    """
+    return cls(Node(*d["node"]), d["bottom_layer"], d["via_layer"], d["top_layer"])
+
   def boxes(self, graph) -> [Box]:
     """
     Gets the coarse form of the via boxes
@@ -69,7 +91,45 @@ class Via(Component):
 
     widths = self._get_widths(graph)
 
-    (bbox, vbox, tbox) = self.via_tech_definitions.boxes(self.bottom_layer, self.top_layer, widths[0], widths[1])
+    return self._boxes_for_template(self.via_tech_definitions.boxes(self.bottom_layer, self.top_layer, widths[0], widths[1]))
+
+  @classmethod
+  def boxes_for_all(cls, graph, vias: ["Via"]) -> [ [Box] ]:
+    """
+    Reimplements the Component interface
+
+    The via boxes only depend on the layers and the widths of the
+    attaching wires. Many vias share the same configuration, so
+    the boxes delivered by the technology (Tech.vias) are kept
+    as templates and computed only once per configuration.
+    """
+
+    if cls.boxes is not Via.boxes:
+      # derived classes with their own box generation
+      return super().boxes_for_all(graph, vias)
+
+    templates = Via.template_cache
+    if templates is None:
+      templates = {}
+
+    result = []
+
+    for v in vias:
+      widths = v._get_widths(graph)
+      key = (v.via_tech_definitions, v.bottom_layer, v.top_layer, tuple(widths[0]), tuple(widths[1]))
+      template = templates.get(key)
+      if template is None:
+        template = templates[key] = v.via_tech_definitions.boxes(v.bottom_layer, v.top_layer, widths[0], widths[1])
+      result.append(v._boxes_for_template(template))
+
+    return result
+
+  def _boxes_for_template(self, template: (Rect, Rect, Rect)) -> [Box]:
+    """
+    Builds the via boxes from the bottom, via and top footprints
+    """
+
+    (bbox, vbox, tbox) = template
 
     v = self.node
 
@@ -120,18 +180,19 @@ class Via(Component):
       elif c.via_top_layer() == self.top_layer:
         li = 1
       if li >= 0:
-        widths[li][self._direction_index(c)] = c.width
+        widths[li][self._direction_index(graph, c)] = c.width
 
     return widths
 
-  def _direction_index(self, component):
-    if component.is_horizontal():
-      if component.nodes()[0].ix < self.node.ix:
+  def _direction_index(self, graph, component):
+    first = graph.component_nodes(component)[0]
+    if graph.is_horizontal(component):
+      if first.ix < self.node.ix:
         return 0
       else:
         return 2
     else:
-      if component.nodes()[0].iy < self.node.iy:
+      if first.iy < self.node.iy:
         return 1
       else:
         return 3
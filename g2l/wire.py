@@ -2,7 +2,7 @@
 from .component import Component
 from .box import Box
 from .node import Node
-import klayout.db as kl
+from .rect import Rect
 
 class Wire(Component):
 
@@ -62,17 +62,64 @@ class Wire(Component):
     """
     return [ self.n1, self.n2 ]
 
+  def to_dict(self) -> dict:
+    """
+    Reimplements the Component interface
+    """
+    return { "width": self.width, "layer": self.layer, "n1": list(self.n1.ixy()), "n2": list(self.n2.ixy()) }
+
+  @classmethod
+  def from_dict(cls, d: dict) -> "Wire":
+    """
+    Creates a wire from the dict delivered by "to_dict"
+    """
+    return cls(d["width"], d["layer"], Node(*d["n1"]), Node(*d["n2"]))
+
   def boxes(self, graph) -> [Box]:
     """
     Delivers the abstract box for the wire
     """
 
-    box1 = self._min_box_per_node(graph, self.n1)
-    box2 = self._min_box_per_node(graph, self.n2)
-    if self.is_horizontal():
-      wire_box = kl.DBox(kl.DPoint(box1.left, -0.5 * self.width), kl.DPoint(box2.right, 0.5 * self.width))
+    return self._boxes_for_min_boxes(self._min_box_per_node(graph, self.n1), self._min_box_per_node(graph, self.n2), graph.is_horizontal(self))
+
+  @classmethod
+  def boxes_for_all(cls, graph, wires: ["Wire"]) -> [ [Box] ]:
+    """
+    Reimplements the Component interface
+
+    The minimum boxes at the wire ends only depend on the node
+    and the layer, so they are computed once per node and layer
+    and shared by all wires ending there.
+    """
+
+    if cls.boxes is not Wire.boxes or cls._min_box_per_node is not Wire._min_box_per_node:
+      # derived classes with their own box generation
+      return super().boxes_for_all(graph, wires)
+
+    min_boxes = {}
+    result = []
+
+    for w in wires:
+      ends = []
+      for v in (w.n1, w.n2):
+        key = (v.ix, v.iy, w.layer)
+        box = min_boxes.get(key)
+        if box is None:
+          box = min_boxes[key] = w._min_box_per_node(graph, v)
+        ends.append(box)
+      result.append(w._boxes_for_min_boxes(ends[0], ends[1], graph.is_horizontal(w)))
+
+    return result
+
+  def _boxes_for_min_boxes(self, box1: Rect, box2: Rect, horizontal: bool) -> [Box]:
+    """
+    Builds the wire box from the minimum boxes at both ends
+    """
+
+    if horizontal:
+      wire_box = Rect(box1.left, -0.5 * self.width, box2.right, 0.5 * self.width)
     else:
-      wire_box = kl.DBox(kl.DPoint(-0.5 * self.width, box1.bottom), kl.DPoint(0.5 * self.width, box2.top))
+      wire_box = Rect(-0.5 * self.width, box1.bottom, 0.5 * self.width, box2.top)
 
     ix1 = min(self.n1.ix, self.n2.ix)
     ix2 = max(self.n1.ix, self.n2.ix)
@@ -81,18 +128,20 @@ class Wire(Component):
 
     return [ Box(ix1, iy1, ix2, iy2, wire_box, self.layer) ]
 
-  def _min_box_per_node(self, graph, v: Node) -> kl.DBox:
+  def _min_box_per_node(self, graph, v: Node) -> Rect:
     """
     Computes the minimum box as imposed by perpendicular wires
     """
 
-    box = kl.DBox(0, 0, 0, 0)
+    layers = graph.component_layers(self)
+
+    box = Rect(0.0, 0.0, 0.0, 0.0)
     for c in graph.components_for_node(v.ixy()):
-      if type(c) is Wire and c.layer in self.layers():
-        if c.is_horizontal():
-          box += kl.DBox(0, -0.5 * c.width, 0, 0.5 * c.width)
+      if type(c) is Wire and c.layer in layers:
+        if graph.is_horizontal(c):
+          box += Rect(0.0, -0.5 * c.width, 0.0, 0.5 * c.width)
         else:
-          box += kl.DBox(-0.5 * c.width, 0, 0.5 * c.width, 0)
+          box += Rect(-0.5 * c.width, 0.0, 0.5 * c.width, 0.0)
 
     return box
 
@@ -1,6 +1,5 @@
 
-from g2l import Tech
-import klayout.db as kl
+from g2l import Tech, Rect
 import math
 
 # -------------------------------------------------------------
@@ -180,7 +179,7 @@ class ViaTechDefinitions(object):
 
     # For efficiency, we don't produce each single via, but just a common box on the cut layer
     # we will later replace the common box by individual boxes for the farm vias.
-    vbox = kl.DBox()
+    vbox = Rect()
     for b in self.via_geometry(bottom_layer, top_layer, bottom_widths, top_widths):
       vbox += b
     
@@ -259,8 +258,8 @@ class ViaTechDefinitions(object):
         
     # generate boxes
 
-    bbox = kl.DBox(-0.5 * bw, -0.5 * bh, 0.5 * bw, 0.5 * bh)
-    tbox = kl.DBox(-0.5 * tw, -0.5 * th, 0.5 * tw, 0.5 * th)
+    bbox = Rect(-0.5 * bw, -0.5 * bh, 0.5 * bw, 0.5 * bh)
+    tbox = Rect(-0.5 * tw, -0.5 * th, 0.5 * tw, 0.5 * th)
 
     return (bbox, tbox)
 
@@ -276,7 +275,7 @@ class ViaTechDefinitions(object):
       for j in range(0, ny):
         x = (i - (nx - 1) * 0.5) * (via_size + via_space)
         y = (j - (ny - 1) * 0.5) * (via_size + via_space)
-        geometry.append(kl.DBox(-0.5 * via_size, -0.5 * via_size, 0.5 * via_size, 0.5 * via_size).moved(x, y))
+        geometry.append(Rect(-0.5 * via_size, -0.5 * via_size, 0.5 * via_size, 0.5 * via_size).moved(x, y))
         
     return geometry
 
@@ -1,7 +1,10 @@
 
-from g2l import Tech
-import klayout.db as kl
+from g2l import Tech, Rect
 import math
+import typing
+
+if typing.TYPE_CHECKING:
+  import klayout.db as kl
 
 class TechRules(object):
 
@@ -22,7 +25,7 @@ class TechRules(object):
     """
     return None
 
-  def create_layers(self, layout: kl.Layout) -> { int: int }:
+  def create_layers(self, layout: "kl.Layout") -> { int: int }:
     """
     Creates the necessary layers inside the Layout object
 
@@ -53,7 +56,7 @@ class ViaTechDefinitions(object):
   def __init__(self):
     pass
 
-  def boxes(self, bottom_layer: int, top_layer: int, bottom_widths: [float], top_widths: [float]) -> (kl.DBox, kl.DBox, kl.DBox):
+  def boxes(self, bottom_layer: int, top_layer: int, bottom_widths: [float], top_widths: [float]) -> (Rect, Rect, Rect):
     """
     Gets the coarse via geometry
 
@@ -71,9 +74,9 @@ class ViaTechDefinitions(object):
     """
 
     # this is just a sample
-    return ( kl.DBox(-1, -1, 1, 1), kl.DBox(-0.5, -0.5, 0.5, 0.5), kl.DBox(-1, -1, 1, 1) )
+    return ( Rect(-1, -1, 1, 1), Rect(-0.5, -0.5, 0.5, 0.5), Rect(-1, -1, 1, 1) )
 
-  def via_geometry(self, bottom_layer: int, top_layer: int, bottom_widths: [float], top_widths: [float]) -> (kl.DBox, kl.DBox, kl.DBox):
+  def via_geometry(self, bottom_layer: int, top_layer: int, bottom_widths: [float], top_widths: [float]) -> (Rect, Rect, Rect):
     """
     Gets the detailed via geometry
 
@@ -82,7 +85,7 @@ class ViaTechDefinitions(object):
     """
 
     # this is just a sample
-    return ( kl.DBox(-1, -1, 1, 1), kl.DBox(-0.5, -0.5, 0.5, 0.5), kl.DBox(-1, -1, 1, 1) )
+    return ( Rect(-1, -1, 1, 1), Rect(-0.5, -0.5, 0.5, 0.5), Rect(-1, -1, 1, 1) )
 
 
 # install the technology singleton
@@ -0,0 +1,58 @@
+
+import logging
+import os
+import random
+import sys
+
+import pytest
+
+# the tests run against the sources and the sky130 technology in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import sky130
+from g2l import Graph, MOSFET, Tech, Via, Wire, n
+
+logging.getLogger("g2l-solver").setLevel(logging.WARNING)
+
+
+def make_random_graph(seed: int, size: int) -> Graph:
+  """
+  Builds a random graph of wires, vias and MOSFETs on a size x size grid
+  """
+
+  r = random.Random(seed)
+
+  diff = Tech.rules.layer("diff")
+  contact = Tech.rules.layer("contact")
+  poly = Tech.rules.layer("poly")
+  metal1 = Tech.rules.layer("metal1")
+  via1 = Tech.rules.layer("via1")
+  metal2 = Tech.rules.layer("metal2")
+
+  graph = Graph()
+
+  for k in range(size):
+    t = r.random()
+    x = r.randrange(0, size)
+    y = r.randrange(0, size)
+    if t < 0.5:
+      layer = r.choice([ poly, metal1, metal2 ])
+      width = r.choice([ 0.15, 0.17, 0.3 ])
+      if r.random() < 0.5:
+        graph.add(Wire(width, layer, n(x, y), n(x + r.randrange(1, 4), y)))
+      else:
+        graph.add(Wire(width, layer, n(x, y), n(x, y + r.randrange(1, 4))))
+    elif t < 0.8:
+      if r.random() < 0.5:
+        graph.add(Via(n(x, y), diff, contact, metal1))
+      else:
+        graph.add(Via(n(x, y), metal1, via1, metal2))
+    else:
+      graph.add(MOSFET(n(x + 1, y), n(x, y), n(x + 2, y), r.choice([ 0.42, 0.65 ]), 0.15))
+
+  return graph
+
+
+@pytest.fixture
+def random_graph():
+  return make_random_graph
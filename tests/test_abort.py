@@ -0,0 +1,63 @@
+import pytest
+
+from g2l import CancellationToken, Solver, SolverStats, generators
+
+
+def _reference() -> Solver:
+  solver = Solver(generators.inverter_chain(3))
+  solver.solve()
+  return solver
+
+
+def test_cancelled_before_start():
+  token = CancellationToken()
+  token.cancel()
+  solver = Solver(generators.inverter_chain(3))
+  stats = solver.solve(cancel = token)
+  assert stats.status == SolverStats.CANCELLED
+  assert not stats.converged and not stats
+  assert stats.iterations == 0
+  # the boxes are incomplete, so footprints cannot be updated
+  with pytest.raises(Exception, match = "needs to be solved"):
+    solver.update_footprints()
+  # a new solve starts from scratch
+  stats = solver.solve()
+  assert stats.status == SolverStats.CONVERGED
+  reference = _reference()
+  assert (solver.x_coordinates, solver.y_coordinates) == (reference.x_coordinates, reference.y_coordinates)
+  solver.update_footprints()
+
+
+def test_time_budget_expired():
+  solver = Solver(generators.inverter_chain(3))
+  stats = solver.solve(time_budget = 0.0)
+  assert stats.status == SolverStats.TIMEOUT
+  assert not stats.converged
+  with pytest.raises(Exception, match = "needs to be solved"):
+    solver.update_footprints()
+
+
+def test_time_budget_sufficient():
+  stats = Solver(generators.inverter_chain(3)).solve(time_budget = 60.0)
+  assert stats.status == SolverStats.CONVERGED
+
+
+def test_cancelled_between_iterations():
+  token = CancellationToken()
+  solver = Solver(generators.inverter_chain(3))
+  after_first = []
+
+  def progress(stats):
+    after_first.append((dict(solver.x_coordinates), dict(solver.y_coordinates)))
+    token.cancel()
+
+  stats = solver.solve(cancel = token, progress = progress)
+  assert stats.status == SolverStats.CANCELLED
+  assert stats.iterations == 1
+  # the coordinates fall back to those of the last complete iteration
+  assert (solver.x_coordinates, solver.y_coordinates) == after_first[0]
+  # the boxes are complete, so the solver can go on with updated footprints
+  solver.update_footprints()
+  assert solver.solve().status == SolverStats.CONVERGED
+  reference = _reference()
+  assert (solver.x_coordinates, solver.y_coordinates) == (reference.x_coordinates, reference.y_coordinates)
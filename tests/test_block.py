@@ -0,0 +1,55 @@
+import klayout.db as kl
+
+from g2l import Block, BlockInstance, Graph, Solver, Tech, Wire, n
+
+
+def _wire_block(name: str, layer: str) -> Block:
+  graph = Graph()
+  graph.add(Wire(0.2, Tech.rules.layer(layer), n(0, 0), n(1, 0)))
+  return Block(name, graph)
+
+
+def _layers(cell: kl.Cell) -> [str]:
+  layout = cell.layout()
+  return [ str(layout.get_info(li)) for li in layout.layer_indexes() if not cell.shapes(li).is_empty() ]
+
+
+def test_geometry_is_computed_once():
+  block = _wire_block("W", "metal1")
+  graph = Graph()
+  for k in range(3):
+    graph.add(BlockInstance(n(k, 0), block))
+  solver = Solver(graph)
+  solver.solve()
+  assert block.geometry() is block.geometry()
+  first = [ c.geometry(graph, solver.x_coordinates, solver.y_coordinates) for c in graph.components ]
+  assert first[0] != first[1]
+  assert first == [ c.geometry(graph, solver.x_coordinates, solver.y_coordinates) for c in graph.components ]
+
+
+def test_blocks_with_same_name_get_separate_cells():
+  (m1, m2) = (_wire_block("W", "metal1"), _wire_block("W", "metal2"))
+  graph = Graph()
+  graph.add(BlockInstance(n(0, 0), m1))
+  graph.add(BlockInstance(n(0, 1), m2))
+  graph.add(BlockInstance(n(1, 1), m2))
+  solver = Solver(graph)
+  solver.solve()
+  layout = kl.Layout()
+  top = layout.create_cell("TOP")
+  solver.produce(layout, top)
+  (a, b) = (m1.cell(layout), m2.cell(layout))
+  assert a.cell_index() != b.cell_index()
+  assert sorted([ a.name, b.name ]) == [ "W", "W$1" ]
+  assert _layers(a) != _layers(b)
+  assert sorted(i.cell_index for i in top.each_inst()) == sorted([ a.cell_index(), b.cell_index(), b.cell_index() ])
+
+
+def test_existing_cell_is_not_taken_over():
+  block = _wire_block("W", "metal1")
+  layout = kl.Layout()
+  other = layout.create_cell("W")
+  cell = block.cell(layout)
+  assert cell.cell_index() != other.cell_index()
+  assert other.is_empty() and not cell.is_empty()
+  assert block.cell(layout).cell_index() == cell.cell_index()
@@ -0,0 +1,57 @@
+import importlib
+import json
+import os
+import shutil
+import sys
+
+import klayout.db as kl
+import pytest
+
+import sky130
+from g2l import dump_graph, generators
+from g2l.__main__ import main
+
+
+@pytest.fixture
+def tech(tmp_path, monkeypatch):
+  # a private copy of the technology module which the test can edit
+  directory = tmp_path / "tech"
+  directory.mkdir()
+  shutil.copy(sky130.__file__, directory / "cli_tech.py")
+  monkeypatch.syspath_prepend(str(directory))
+  yield str(directory / "cli_tech.py")
+  sys.modules.pop("cli_tech", None)
+  # restore the technology singletons
+  importlib.reload(sky130)
+
+
+def _run(tmp_path, *graphs) -> dict:
+  output = str(tmp_path / "out.gds")
+  args = [ "--tech", "cli_tech", "--cache", str(tmp_path / "cache"), "--profile", "-o", output ]
+  assert main(args + [ str(g) for g in graphs ]) == 0
+  layout = kl.Layout()
+  layout.read(output)
+  assert sorted(c.name for c in layout.each_cell()) == sorted(os.path.splitext(os.path.basename(g))[0] for g in graphs)
+  with open(output + ".stats.json") as file:
+    return { name: s.get("cached", False) for (name, s) in json.load(file).items() }
+
+
+def test_cache(tmp_path, tech):
+
+  (inv, arr) = (tmp_path / "inv.json", tmp_path / "arr.json")
+  dump_graph(generators.inverter_chain(2), str(inv))
+  dump_graph(generators.mosfet_array(2, 2), str(arr))
+
+  # miss, then hit
+  assert _run(tmp_path, inv) == { "inv": False }
+  assert _run(tmp_path, inv, arr) == { "inv": True, "arr": False }
+  assert _run(tmp_path, inv, arr) == { "inv": True, "arr": True }
+
+  # a changed graph misses
+  dump_graph(generators.inverter_chain(3), str(inv))
+  assert _run(tmp_path, inv, arr) == { "inv": False, "arr": True }
+
+  # a changed technology invalidates everything
+  with open(tech, "a") as file:
+    file.write("\n# edited\n")
+  assert _run(tmp_path, inv, arr) == { "inv": False, "arr": False }
@@ -0,0 +1,64 @@
+import pytest
+
+from g2l import read_coordinates, write_coordinates
+
+
+_X = { 0: 0.0, 1: 0.5, 7: 1.25 }
+_Y = { -2: -1.0, 3: 2.5 }
+
+
+def test_round_trip(tmp_path):
+  filename = str(tmp_path / "coords.bin")
+  write_coordinates(filename, _X, _Y, key = "abc")
+  assert read_coordinates(filename) == (_X, _Y, "abc")
+
+
+def test_round_trip_without_key(tmp_path):
+  filename = str(tmp_path / "coords.bin")
+  write_coordinates(filename, _X, {})
+  assert read_coordinates(filename) == (_X, {}, None)
+
+
+def test_key_too_long(tmp_path):
+  with pytest.raises(Exception, match = "Key too long"):
+    write_coordinates(str(tmp_path / "coords.bin"), _X, _Y, key = "k" * 33)
+
+
+@pytest.mark.parametrize("cut", [ 1, 4, 8, 13 ])
+def test_truncated(tmp_path, cut):
+  filename = str(tmp_path / "coords.bin")
+  write_coordinates(filename, _X, _Y)
+  with open(filename, "rb") as file:
+    data = file.read()
+  with open(filename, "wb") as file:
+    file.write(data[:-cut])
+  with pytest.raises(Exception, match = "Invalid coordinate file"):
+    read_coordinates(filename)
+
+
+def test_trailing_data(tmp_path):
+  filename = str(tmp_path / "coords.bin")
+  write_coordinates(filename, _X, _Y)
+  with open(filename, "ab") as file:
+    file.write(b"\0" * 8)
+  with pytest.raises(Exception, match = "Invalid coordinate file"):
+    read_coordinates(filename)
+
+
+def test_not_a_coordinate_file(tmp_path):
+  filename = str(tmp_path / "coords.bin")
+  with open(filename, "wb") as file:
+    file.write(b"GDS" * 40)
+  with pytest.raises(Exception, match = "invalid magic"):
+    read_coordinates(filename)
+  with open(filename, "wb") as file:
+    file.write(b"G2LC")
+  with pytest.raises(Exception, match = "too short"):
+    read_coordinates(filename)
+
+
+def test_npz_round_trip(tmp_path):
+  pytest.importorskip("numpy")
+  filename = str(tmp_path / "coords.npz")
+  write_coordinates(filename, _X, _Y, key = "abc")
+  assert read_coordinates(filename) == (_X, _Y, "abc")
@@ -0,0 +1,43 @@
+from g2l import Solver, SolverStats, generators
+
+
+class _Oscillating(Solver):
+
+  """
+  A solver whose passes flip all coordinates between two values
+  """
+
+  def _compute_coordinates(self, h: bool):
+    coordinates = self.x_coordinates if h else self.y_coordinates
+    for i in coordinates.keys():
+      coordinates[i] = 1.0 - coordinates[i]
+
+
+def test_oscillation_is_detected():
+  solver = _Oscillating(generators.inverter_chain(2))
+  seen = []
+  stats = solver.solve(max_iter = 50, progress = lambda s: seen.append(s.status))
+  assert stats.status == SolverStats.CYCLE
+  assert not stats.converged
+  assert stats.cycle_length == 2
+  # the state after iteration 1 repeats after iteration 3
+  assert stats.iterations == 3
+  assert seen == [ None, None, SolverStats.CYCLE ]
+  assert "repeat every 2 iterations" in stats.convergence_report()
+
+
+def test_cycle_of_real_graph(random_graph):
+  stats = Solver(random_graph(3, 40)).solve(max_iter = 50)
+  assert stats.status == SolverStats.CYCLE
+  assert stats.iterations < 50
+  # the final state is the one from cycle_length iterations before
+  (a, b) = (Solver(random_graph(3, 40)), Solver(random_graph(3, 40)))
+  a.solve(max_iter = stats.iterations)
+  b.solve(max_iter = stats.iterations - stats.cycle_length)
+  assert (a.x_coordinates, a.y_coordinates) == (b.x_coordinates, b.y_coordinates)
+
+
+def test_no_cycle_when_converging():
+  stats = Solver(generators.inverter_chain(3)).solve(max_iter = 50)
+  assert stats.status == SolverStats.CONVERGED
+  assert stats.cycle_length is None
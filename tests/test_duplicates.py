@@ -0,0 +1,33 @@
+
+import pytest
+
+from g2l import Graph, Solver, Tech, Wire, n
+
+
+def _graph(duplicate: bool) -> Graph:
+  metal1 = Tech.rules.layer("metal1")
+  graph = Graph()
+  w = Wire(0.2, metal1, n(0, 0), n(1, 0))
+  graph.add(w)
+  if duplicate:
+    graph.add(w)
+  graph.add(Wire(0.2, metal1, n(2, 0), n(3, 0)))
+  graph.add(Wire(0.2, metal1, n(0, 1), n(3, 1)))
+  return graph
+
+
+@pytest.mark.parametrize("windowed", [ False, True ])
+def test_component_added_twice(windowed):
+  solver = Solver(_graph(True))
+  stats = solver.solve(windowed = windowed)
+  reference = Solver(_graph(False))
+  reference.solve(windowed = windowed)
+  assert stats.converged
+  assert (solver.x_coordinates, solver.y_coordinates) == (reference.x_coordinates, reference.y_coordinates)
+
+
+def test_component_added_twice_has_separate_boxes():
+  frozen = _graph(True).freeze()
+  (first, second) = frozen.boxes_per_component()[0:2]
+  assert [ repr(b) for b in first ] == [ repr(b) for b in second ]
+  assert all(a is not b for (a, b) in zip(first, second))
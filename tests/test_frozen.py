@@ -0,0 +1,74 @@
+
+import klayout.db as kl
+import pytest
+
+from g2l import FrozenGraph, Graph, Solver, Tech, Via, Wire, n
+from g2l import generators
+
+
+def _shapes(cell: kl.Cell) -> [str]:
+  layout = cell.layout()
+  return sorted(f"{layout.get_info(li)} {s}" for li in layout.layer_indexes() for s in cell.shapes(li).each())
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_frozen_graph_solves_and_produces_the_same(random_graph, seed):
+  graph = random_graph(seed, 40)
+  plain = Solver(graph)
+  plain.solve()
+  frozen = Solver(graph.freeze())
+  frozen.solve()
+  assert (plain.x_coordinates, plain.y_coordinates) == (frozen.x_coordinates, frozen.y_coordinates)
+  layout = kl.Layout()
+  a = layout.create_cell("A")
+  b = layout.create_cell("B")
+  plain.produce(layout, a)
+  frozen.produce(layout, b)
+  assert _shapes(a) == _shapes(b)
+
+
+def test_frozen_graph_caches_derived_data():
+  graph = generators.inverter_chain(2)
+  frozen = graph.freeze()
+  assert isinstance(frozen, FrozenGraph)
+  assert frozen.freeze() is frozen
+  for c in graph.components:
+    assert list(frozen.component_nodes(c)) == list(c.nodes())
+    assert frozen.is_horizontal(c) == c.is_horizontal()
+    assert list(frozen.component_layers(c)) == list(c.layers())
+    assert [ repr(b) for b in frozen.component_boxes(c) ] == [ repr(b) for b in c.boxes(graph) ]
+  assert frozen.boxes_per_component() is frozen.boxes_per_component()
+
+
+def test_frozen_graph_is_immutable():
+  graph = generators.inverter_chain(1)
+  frozen = graph.freeze()
+  with pytest.raises(Exception):
+    frozen.add(Wire(0.2, Tech.rules.layer("metal1"), n(0, 0), n(1, 0)))
+  with pytest.raises(Exception):
+    frozen.merge(generators.inverter_chain(1))
+  solver = Solver(frozen)
+  solver.solve()
+  with pytest.raises(Exception):
+    solver.update_footprints()
+
+
+class _VerticalStub(Wire):
+
+  """
+  A zero-length wire declaring vertical orientation
+  """
+
+  def is_horizontal(self) -> bool:
+    return False
+
+
+def test_frozen_graph_uses_is_horizontal():
+  metal1 = Tech.rules.layer("metal1")
+  graph = Graph()
+  stub = _VerticalStub(0.3, metal1, n(1, 1), n(1, 1))
+  graph.add(stub)
+  graph.add(Via(n(1, 1), metal1, Tech.rules.layer("via1"), Tech.rules.layer("metal2")))
+  frozen = graph.freeze()
+  assert frozen.is_horizontal(stub) is False
+  assert [ [ repr(b) for b in graph.component_boxes(c) ] for c in graph.components ] == [ [ repr(b) for b in boxes ] for boxes in frozen.boxes_per_component() ]
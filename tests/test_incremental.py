@@ -0,0 +1,63 @@
+
+from g2l import MOSFET, Solver, Wire, solve_sweep
+from g2l import generators
+
+
+def _warm_solve(graph, start):
+  solver = Solver(graph)
+  solver.solve(initial_coordinates = start)
+  return (solver.x_coordinates, solver.y_coordinates)
+
+
+def _incremental(graph, component, width):
+  """
+  Changes the width of a component after a solve and solves again incrementally
+
+  Returns the incremental solution, its statistics and the full warm-started solution for comparison.
+  """
+  solver = Solver(graph)
+  solver.solve()
+  start = (dict(solver.x_coordinates), dict(solver.y_coordinates))
+  original = component.width
+  component.width = width
+  try:
+    solver.update_footprints()
+    stats = solver.solve(initial_coordinates = (solver.x_coordinates, solver.y_coordinates))
+    full = _warm_solve(graph, start)
+  finally:
+    component.width = original
+  return ((solver.x_coordinates, solver.y_coordinates), stats, full)
+
+
+def test_incremental_last_mosfet_skips_indexes():
+  graph = generators.mosfet_array(10, 6)
+  mos = [ c for c in graph.components if type(c) is MOSFET ][-1]
+  (result, stats, full) = _incremental(graph, mos, mos.width * 1.5)
+  assert result == full
+  assert stats.indexes_skipped > 0
+
+
+def test_incremental_equals_full_solve():
+  graph = generators.routing_mesh(8, 8)
+  wires = [ c for c in graph.components if type(c) is Wire ]
+  for w in (wires[0], wires[len(wires) // 2], wires[-1]):
+    for factor in (0.5, 2.0):
+      (result, stats, full) = _incremental(graph, w, w.width * factor)
+      assert result == full
+
+
+def test_sweep_matches_cold_solves_of_variants():
+  graph = generators.mosfet_array(6, 2)
+  mos = [ c for c in graph.components if type(c) is MOSFET ][-2]
+  widths = [ mos.width * f for f in (1.0, 1.2, 1.4) ]
+  results = solve_sweep(graph, [ { mos: { "width": w } } for w in widths ], warm_start = False)
+  original = mos.width
+  try:
+    for (w, (x, y, stats)) in zip(widths, results):
+      mos.width = w
+      solver = Solver(graph)
+      solver.solve()
+      assert (x, y) == (solver.x_coordinates, solver.y_coordinates)
+  finally:
+    mos.width = original
+  assert mos.width == original
@@ -0,0 +1,75 @@
+import pytest
+
+from g2l import Graph, LayerInteractions, Solver, Tech, Wire, n
+
+
+class _Rules(object):
+
+  """
+  Space rules given by a table (plus the technology's rules for everything else)
+  """
+
+  def __init__(self, spaces: { (int, int): float }):
+    self.spaces = spaces
+
+  def space(self, layer1: int, layer2: int) -> float:
+    return self.spaces.get((layer1, layer2))
+
+  def __getattr__(self, name):
+    return getattr(Tech.rules, name)
+
+
+def _solve(graph: Graph, rules, **kwargs) -> (Solver, object):
+  solver = Solver(graph)
+  solver.tech_rules = rules
+  return (solver, solver.solve(**kwargs))
+
+
+def _parallel_wires(layer1: int, layer2: int, count: int = 2) -> Graph:
+  graph = Graph()
+  for k in range(count):
+    graph.add(Wire(0.2, layer1 if k % 2 == 0 else layer2, n(0, k), n(1, k)))
+  return graph
+
+
+def test_interaction_table():
+  (metal1, metal2, poly) = (Tech.rules.layer("metal1"), Tech.rules.layer("metal2"), Tech.rules.layer("poly"))
+  rules = _Rules({ (metal1, metal1): 0.2, (metal1, metal2): 0.5 })
+  li = LayerInteractions(rules, [ poly, metal2, metal1 ])
+  assert li.layers == sorted([ poly, metal1, metal2 ])
+  assert li.spaces(metal1) == { metal1: 0.2, metal2: 0.5 }
+  assert li.space(metal2, metal1) == 0.5
+  assert li.space(poly, metal1) is None
+  assert sorted(li.interacting(metal1)) == sorted([ metal1, metal2 ])
+  assert li.interacting(poly) == []
+  assert (li.halo(metal1), li.halo(metal2), li.halo(poly)) == (0.5, 0.5, 0.0)
+  assert li.max_halo() == 0.5
+
+
+@pytest.mark.parametrize("windowed", [ False, True ])
+def test_halo_changes_spacing(windowed):
+  metal1 = Tech.rules.layer("metal1")
+  pitches = []
+  for space in (0.17, 0.5, 1.5):
+    (solver, stats) = _solve(_parallel_wires(metal1, metal1, 4), _Rules({ (metal1, metal1): space }), windowed = windowed)
+    assert stats.converged
+    y = solver.y_coordinates
+    # the wires are 0.2 wide
+    assert [ y[k + 1] - y[k] for k in range(3) ] == pytest.approx([ 0.2 + space ] * 3)
+    pitches.append(y[1] - y[0])
+  assert pitches == sorted(pitches)
+
+
+def test_absent_interaction_skips_pair():
+  (metal1, metal2) = (Tech.rules.layer("metal1"), Tech.rules.layer("metal2"))
+  graph = _parallel_wires(metal1, metal2)
+  (solver, stats) = _solve(graph, _Rules({ (metal1, metal1): 0.17, (metal2, metal2): 0.17 }))
+  assert stats.converged
+  # nothing keeps the wires apart
+  assert solver.y_coordinates[1] == solver.y_coordinates[0]
+  assert stats.pairs_evaluated > 0
+  assert stats.pairs_pruned == stats.pairs_evaluated
+  (solver, stats) = _solve(_parallel_wires(metal1, metal2), _Rules({ (metal1, metal2): 0.3 }))
+  assert solver.y_coordinates[1] - solver.y_coordinates[0] == pytest.approx(0.5)
+  assert stats.pairs_evaluated > 0
+  assert stats.pairs_pruned == 0
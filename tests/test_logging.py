@@ -0,0 +1,58 @@
+import logging
+
+import pytest
+
+from g2l import Solver, generators
+
+
+@pytest.fixture
+def calls(monkeypatch):
+  calls = { "format": 0, "moved": 0 }
+  (format_coordinates, moved) = (Solver._format_coordinates, Solver._moved)
+
+  def counting_format(self, *args):
+    calls["format"] += 1
+    return format_coordinates(self, *args)
+
+  def counting_moved(self, *args):
+    calls["moved"] += 1
+    return moved(self, *args)
+
+  monkeypatch.setattr(Solver, "_format_coordinates", counting_format)
+  monkeypatch.setattr(Solver, "_moved", counting_moved)
+  return calls
+
+
+@pytest.fixture
+def levels():
+  loggers = [ logging.getLogger("g2l-solver"), logging.getLogger("g2l-solver.coordinates") ]
+  saved = [ l.level for l in loggers ]
+  yield loggers
+  for (l, level) in zip(loggers, saved):
+    l.setLevel(level)
+
+
+def test_no_formatting_above_debug(calls, levels):
+  (summary, coordinates) = levels
+  summary.setLevel(logging.WARNING)
+  coordinates.setLevel(logging.INFO)
+  Solver(generators.inverter_chain(3)).solve()
+  assert calls == { "format": 0, "moved": 0 }
+
+
+def test_summaries_only_at_info(calls, levels):
+  (summary, coordinates) = levels
+  summary.setLevel(logging.INFO)
+  coordinates.setLevel(logging.INFO)
+  stats = Solver(generators.inverter_chain(3)).solve()
+  assert calls == { "format": 0, "moved": 2 * stats.iterations }
+
+
+def test_dumps_at_debug(calls, levels):
+  (summary, coordinates) = levels
+  summary.setLevel(logging.WARNING)
+  coordinates.setLevel(logging.DEBUG)
+  stats = Solver(generators.inverter_chain(3)).solve()
+  # initial coordinates and one dump per iteration, x and y each
+  assert calls["format"] == 2 * (stats.iterations + 1)
+  assert calls["moved"] == 0
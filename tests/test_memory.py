@@ -0,0 +1,54 @@
+import tracemalloc
+
+import klayout.db as kl
+
+from g2l import MemoryProfiler, Solver, generators
+
+
+def test_phases():
+  profiler = MemoryProfiler()
+  with profiler.phase("build"):
+    graph = generators.inverter_chain(3)
+  solver = Solver(graph)
+  solver.solve(memory = profiler)
+  layout = kl.Layout()
+  solver.produce(layout, layout.create_cell("TOP"), memory = profiler)
+  report = profiler.report()
+  assert list(report.keys()) == [ "build", "box generation", "compaction x", "compaction y", "produce" ]
+  assert report["build"]["calls"] == 1 and report["build"]["retained"] > 0
+  assert report["build"]["objects"]["MOSFET"] == 6
+  assert not tracemalloc.is_tracing()
+
+
+def test_nested_phases():
+  profiler = MemoryProfiler(count_objects = False)
+  with profiler.phase("outer"):
+    with profiler.phase("inner"):
+      data = [ bytearray(100000) ]
+    del data
+  report = profiler.report()
+  assert report["inner"]["peak"] >= 100000
+  assert report["outer"]["peak"] >= report["inner"]["peak"]
+  assert report["outer"]["objects"] == {}
+
+
+def test_running_trace_keeps_its_peak():
+  tracemalloc.start()
+  try:
+    data = bytearray(2000000)
+    del data
+    caller_peak = tracemalloc.get_traced_memory()[1]
+    profiler = MemoryProfiler(count_objects = False)
+    with profiler.phase("small"):
+      small = [ bytearray(1000) ]
+    assert tracemalloc.get_traced_memory()[1] >= caller_peak
+    with profiler.phase("outer"):
+      with profiler.phase("large"):
+        large = [ bytearray(5000000) ]
+    assert tracemalloc.is_tracing()
+    report = profiler.report()
+    assert report["small"]["peak"] < caller_peak
+    assert report["large"]["peak"] >= 5000000
+    assert report["outer"]["peak"] >= 5000000
+  finally:
+    tracemalloc.stop()
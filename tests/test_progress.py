@@ -0,0 +1,34 @@
+from g2l import Solver, SolverStats, generators
+
+
+def _record(graph, **kwargs) -> ([ (str, bool) ], SolverStats):
+  seen = []
+  stats = Solver(graph).solve(progress = lambda s: seen.append((s.status, s.converged)), **kwargs)
+  return (seen, stats)
+
+
+def test_progress_sees_final_status():
+  (seen, stats) = _record(generators.inverter_chain(3))
+  assert stats.status == SolverStats.CONVERGED
+  assert len(seen) == stats.iterations
+  assert seen[-1] == (SolverStats.CONVERGED, True)
+  assert all(s == (None, False) for s in seen[:-1])
+
+
+def test_progress_sees_max_iter():
+  (seen, stats) = _record(generators.inverter_chain(3), max_iter = 1)
+  assert stats.status == SolverStats.MAX_ITER
+  assert seen == [ (SolverStats.MAX_ITER, False) ]
+
+
+def test_progress_cancels():
+  stats = Solver(generators.inverter_chain(3)).solve(progress = lambda s: False)
+  assert stats.status == SolverStats.CANCELLED
+  assert stats.iterations == 1
+
+
+def test_progress_sees_cycle(random_graph):
+  (seen, stats) = _record(random_graph(3, 40))
+  assert stats.status == SolverStats.CYCLE
+  assert len(seen) == stats.iterations
+  assert seen[-1] == (SolverStats.CYCLE, False)
@@ -0,0 +1,75 @@
+import itertools
+
+import klayout.db as kl
+import pytest
+
+from g2l import Rect
+
+
+_RECTS = [ Rect(), Rect(0, 0, 1, 2), Rect(0.5, -1, 3, 0.25), Rect(2, 2, 2, 2), Rect(-1.5, 0.125, 0, 4), Rect(5, 5, 6, 6) ]
+
+
+def _same(rect: Rect, dbox: kl.DBox) -> bool:
+  if dbox.empty():
+    return rect.empty()
+  return (rect.left, rect.bottom, rect.right, rect.top) == (dbox.left, dbox.bottom, dbox.right, dbox.top)
+
+
+def test_construction():
+  assert Rect().empty()
+  r = Rect(3, 4, 1, 2)
+  assert (r.left, r.bottom, r.right, r.top) == (1, 2, 3, 4)
+  assert (r.width(), r.height()) == (2, 2)
+  assert not Rect(1, 1, 1, 1).empty()
+  assert Rect(r) == r and Rect(r) is not r
+
+
+def test_dbox_conversion():
+  for r in _RECTS:
+    d = r.to_dbox()
+    assert _same(r, d)
+    assert Rect(d) == r
+    assert str(r) == str(d)
+
+
+@pytest.mark.parametrize("a,b", list(itertools.product(_RECTS, _RECTS)))
+def test_operators_like_dbox(a, b):
+  (da, db) = (a.to_dbox(), b.to_dbox())
+  assert _same(a + b, da + db)
+  assert _same(a & b, da & db)
+  assert _same(a * b, da * db)
+
+
+def test_add_in_place():
+  r = Rect()
+  acc = r
+  acc += Rect(0, 0, 1, 1)
+  assert acc == Rect(0, 0, 1, 1)
+  # "+=" creates a new object, so the original is not modified
+  assert r.empty()
+  acc += Rect()
+  assert acc == Rect(0, 0, 1, 1)
+  acc += Rect(2, -1, 3, 0)
+  assert acc == Rect(0, -1, 3, 1)
+
+
+def test_moved_and_enlarged():
+  r = Rect(0, 0, 1, 2)
+  assert r.moved(0.5, -1) == Rect(0.5, -1, 1.5, 1)
+  assert r == Rect(0, 0, 1, 2)
+  assert r.enlarged(0.5) == Rect(-0.5, -0.5, 1.5, 2.5)
+  assert r.enlarged(0.5, 0) == Rect(-0.5, 0, 1.5, 2)
+  assert Rect().moved(1, 1).empty()
+  assert Rect().enlarged(1).empty()
+  for rect in _RECTS:
+    assert _same(rect.moved(0.5, -1), rect.to_dbox().moved(0.5, -1))
+    assert _same(rect.enlarged(0.5, 0.25), rect.to_dbox().enlarged(0.5, 0.25))
+
+
+def test_equality_and_hashing():
+  assert Rect(0, 0, 1, 1) == Rect(1, 1, 0, 0)
+  assert Rect(0, 0, 1, 1) != Rect(0, 0, 1, 2)
+  assert Rect() == Rect()
+  assert (Rect(0, 0, 1, 1) == "(0,0;1,1)") is False
+  assert len({ Rect(0, 0, 1, 1), Rect(1, 1, 0, 0), Rect(0, 0, 1, 2), Rect(), Rect() }) == 3
+  assert { Rect(0, 0, 1, 1): 1 }[Rect(0, 0, 1, 1)] == 1
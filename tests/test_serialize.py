@@ -0,0 +1,49 @@
+import pytest
+
+from g2l import Graph, Solver, Tech, Via, generators
+from g2l.serialize import dump_graph, graph_from_dict, graph_key, graph_to_dict, load_graph
+
+
+def _solve(graph: Graph) -> ({ int: float }, { int: float }):
+  solver = Solver(graph)
+  solver.solve()
+  return (solver.x_coordinates, solver.y_coordinates)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_round_trip(random_graph, seed):
+  graph = random_graph(seed, 40)
+  d = graph_to_dict(graph)
+  copy = graph_from_dict(d)
+  assert graph_to_dict(copy) == d
+  assert _solve(copy) == _solve(graph)
+
+
+def test_file_round_trip(tmp_path):
+  graph = generators.inverter_chain(2)
+  filename = str(tmp_path / "graph.json")
+  dump_graph(graph, filename)
+  assert graph_to_dict(load_graph(filename)) == graph_to_dict(graph)
+
+
+def test_graph_key():
+  d = graph_to_dict(generators.mosfet_array(2, 2))
+  assert graph_key(d, output = "gds") == graph_key(graph_to_dict(graph_from_dict(d)), output = "gds")
+  assert graph_key(d, output = "gds") != graph_key(d, output = "oas")
+
+
+def test_unknown_component_type():
+  with pytest.raises(Exception, match = "Unknown component type"):
+    graph_from_dict({ "components": [ { "type": "Resistor" } ] })
+
+
+def test_via_template_cache():
+  graph = generators.via_farm(4, 4)
+  reference = [ [ repr(b) for b in boxes ] for boxes in graph.freeze().boxes_per_component() ]
+  Via.template_cache = {}
+  try:
+    for k in range(2):
+      assert [ [ repr(b) for b in boxes ] for boxes in graph.freeze().boxes_per_component() ] == reference
+    assert len(Via.template_cache) > 0
+  finally:
+    Via.template_cache = None
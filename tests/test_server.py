@@ -0,0 +1,110 @@
+import asyncio
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+
+import pytest
+
+from g2l import Solver, generators
+from g2l.serialize import graph_to_dict
+from g2l.server import SolveClient, SolveServer
+
+
+@pytest.fixture(scope = "module")
+def server_path():
+  # Unix socket paths are limited in length, so don't use the pytest tmp_path
+  directory = tempfile.mkdtemp()
+  path = os.path.join(directory, "g2l.sock")
+  server = SolveServer(path, "sky130", jobs = 1, max_request_size = 1024 * 1024)
+  loop = asyncio.new_event_loop()
+  task = loop.create_task(server.serve())
+
+  def run():
+    try:
+      loop.run_until_complete(task)
+    except asyncio.CancelledError:
+      pass
+    pending = asyncio.all_tasks(loop)
+    for t in pending:
+      t.cancel()
+    loop.run_until_complete(asyncio.gather(*pending, return_exceptions = True))
+
+  thread = threading.Thread(target = run, daemon = True)
+  thread.start()
+  while not os.path.exists(path):
+    time.sleep(0.01)
+  yield path
+  loop.call_soon_threadsafe(task.cancel)
+  thread.join()
+  loop.close()
+  shutil.rmtree(directory)
+
+
+def _exchange(path: str, data: bytes) -> dict:
+  with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+    s.connect(path)
+    s.sendall(data)
+    with s.makefile("rb") as file:
+      return json.loads(file.readline())
+
+
+def test_solve(server_path):
+  graph = generators.inverter_chain(2)
+  solver = Solver(graph)
+  solver.solve()
+  client = SolveClient(server_path)
+  try:
+    (x, y, stats) = client.solve(graph)
+    assert stats["status"] == "converged"
+    assert (x, y) == (solver.x_coordinates, solver.y_coordinates)
+    assert client.produce(graph, "gds")[0:4] == b"\x00\x06\x00\x02"
+  finally:
+    client.close()
+
+
+@pytest.mark.parametrize("data", [ b"{ no json\n", b"[ 1 ]\n", b"42\n" ])
+def test_invalid_request(server_path, data):
+  assert "Invalid request" in _exchange(server_path, data)["error"]
+
+
+def test_request_errors(server_path):
+  assert _exchange(server_path, b'{ "id": 7 }\n') == { "id": 7, "error": "'graph'" }
+  request = { "id": 8, "graph": graph_to_dict(generators.inverter_chain(1)), "output": "svg" }
+  assert _exchange(server_path, json.dumps(request).encode("utf-8") + b"\n")["error"] == "Invalid output type: svg"
+
+
+def test_request_too_large(server_path):
+
+  def send(s):
+    try:
+      s.sendall(b" " * (2 * 1024 * 1024) + b"{}\n")
+    except BrokenPipeError:
+      # the server closes the connection after the error message
+      pass
+
+  with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+    s.connect(server_path)
+    sender = threading.Thread(target = send, args = (s, ))
+    sender.start()
+    with s.makefile("rb") as file:
+      response = json.loads(file.readline())
+    sender.join()
+
+  assert "maximum size" in response["error"]
+
+
+def test_client_going_away(server_path):
+  request = { "id": 1, "graph": graph_to_dict(generators.mosfet_array(3, 3)) }
+  with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+    s.connect(server_path)
+    s.sendall(json.dumps(request).encode("utf-8") + b"\n")
+  # the server keeps serving
+  client = SolveClient(server_path)
+  try:
+    assert client.solve(generators.mosfet_array(3, 3))[2]["status"] == "converged"
+  finally:
+    client.close()
@@ -0,0 +1,68 @@
+import functools
+
+import pytest
+
+from conftest import make_random_graph
+from g2l import Graph, Solver, build_sharded
+
+
+def _shard(seed: int) -> Graph:
+  return make_random_graph(seed, 30)
+
+
+def _state(graph: Graph) -> tuple:
+  ids = lambda components: [ id(c) for c in components ]
+  return (ids(graph.components), set(graph.x_indexes), set(graph.y_indexes),
+          { k: ids(v) for (k, v) in graph.components_per_index.items() },
+          { k: ids(v) for (k, v) in graph.components_per_layer.items() })
+
+
+def test_merge_is_same_as_adding():
+  shards = [ _shard(seed) for seed in range(3) ]
+  before = [ _state(s) for s in shards ]
+  merged = Graph()
+  merged.merge(*shards)
+  added = Graph()
+  for s in shards:
+    for c in s.components:
+      added.add(c)
+  assert _state(merged) == _state(added)
+  # the shards are not modified
+  assert [ _state(s) for s in shards ] == before
+  # neither are they affected by changes of the merged graph
+  merged.add(shards[1].components[0])
+  assert [ _state(s) for s in shards ] == before
+
+
+def test_merge_into_non_empty_graph():
+  (a, b) = (_shard(1), _shard(2))
+  merged = Graph()
+  for c in a.components:
+    merged.add(c)
+  merged.merge(b)
+  added = Graph()
+  for c in a.components + b.components:
+    added.add(c)
+  assert _state(merged) == _state(added)
+
+
+def test_merge_into_itself():
+  graph = _shard(1)
+  with pytest.raises(Exception, match = "cannot be merged into itself"):
+    graph.merge(graph)
+  with pytest.raises(Exception, match = "frozen graph cannot be modified"):
+    graph.freeze().merge(_shard(2))
+
+
+@pytest.mark.parametrize("jobs,processes", [ (1, False), (3, False), (3, True) ])
+def test_build_sharded(jobs, processes):
+  graph = build_sharded([ functools.partial(_shard, seed) for seed in range(3) ], jobs = jobs, processes = processes)
+  sequential = Graph()
+  for seed in range(3):
+    for c in _shard(seed).components:
+      sequential.add(c)
+  assert len(graph.components) == len(sequential.components)
+  assert (graph.x_indexes, graph.y_indexes) == (sequential.x_indexes, sequential.y_indexes)
+  (a, b) = (Solver(graph), Solver(sequential))
+  assert a.solve(max_iter = 3).status == b.solve(max_iter = 3).status
+  assert (a.x_coordinates, a.y_coordinates) == (b.x_coordinates, b.y_coordinates)
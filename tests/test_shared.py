@@ -0,0 +1,52 @@
+import klayout.db as kl
+import pytest
+
+from g2l import SharedGraph, Solver, generators, solve_batch
+
+
+def _shapes(cell: kl.Cell) -> [str]:
+  layout = cell.layout()
+  return sorted(f"{layout.get_info(li)} {s}" for li in layout.layer_indexes() for s in cell.shapes(li).each())
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("windowed", [ False, True ])
+def test_shared_graph_solves_the_same(random_graph, seed, windowed):
+  graph = random_graph(seed, 40)
+  plain = Solver(graph)
+  plain_stats = plain.solve(windowed = windowed)
+  with SharedGraph.publish(graph) as published:
+    with SharedGraph.attach(published.name) as shared:
+      assert (shared.x_indexes, shared.y_indexes) == (graph.x_indexes, graph.y_indexes)
+      solver = shared.solver()
+      stats = solver.solve(windowed = windowed)
+  assert stats.status == plain_stats.status
+  assert (solver.x_coordinates, solver.y_coordinates) == (plain.x_coordinates, plain.y_coordinates)
+
+
+def test_shared_graph_cannot_be_produced():
+  with SharedGraph.publish(generators.inverter_chain(1)) as shared:
+    solver = shared.solver()
+    solver.solve()
+    layout = kl.Layout()
+    with pytest.raises(Exception, match = "cannot be produced"):
+      solver.produce(layout, layout.create_cell("TOP"))
+
+
+def test_closed_block_is_removed():
+  shared = SharedGraph.publish(generators.inverter_chain(1))
+  name = shared.name
+  shared.close()
+  shared.close()
+  with pytest.raises(FileNotFoundError):
+    SharedGraph.attach(name)
+
+
+def test_batch_shared(random_graph):
+  graphs = { f"G{k}": random_graph(k, 30) for k in range(3) }
+  (plain, shared) = (kl.Layout(), kl.Layout())
+  plain_stats = solve_batch(graphs, plain, tech = "sky130", jobs = 2)
+  shared_stats = solve_batch(graphs, shared, tech = "sky130", jobs = 2, shared = True)
+  assert { k: s.status for (k, s) in plain_stats.items() } == { k: s.status for (k, s) in shared_stats.items() }
+  for name in graphs.keys():
+    assert _shapes(plain.cell(name)) == _shapes(shared.cell(name))
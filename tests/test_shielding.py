@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from g2l import Box, Rect
+from g2l.shielding import ShieldingIndex
+
+
+def _reference(b: Box, wrt: Box, others: [Box], h: bool) -> bool:
+  """
+  The brute-force shielding test the index replaces
+  """
+  iyorx1 = max(b.iyorx1(h), wrt.iyorx1(h))
+  iyorx2 = min(b.iyorx2(h), wrt.iyorx2(h))
+  yorxmin = max(b.yorxmin(h), wrt.yorxmin(h))
+  yorxmax = min(b.yorxmax(h), wrt.yorxmax(h))
+  for ob in others:
+    if ob.iyorx1(h) > iyorx1 or ob.iyorx2(h) < iyorx2 or (b.layer != ob.layer and wrt.layer != ob.layer) or ob.ixory2(h) < b.ixory1(h):
+      continue
+    if ob.yorxmin(h) > yorxmin + 1e-10 or ob.yorxmax(h) < yorxmax - 1e-10:
+      continue
+    return True
+  return False
+
+
+def _random_box(r: random.Random, i: int, h: bool) -> Box:
+  (i1, i2) = (i, i + r.randrange(0, 4))
+  j1 = r.randrange(0, 10)
+  j2 = j1 + r.randrange(0, 3)
+  lo = r.choice([ -0.2, -0.1, 0.0 ])
+  hi = r.choice([ 0.0, 0.1, 0.2 ])
+  rect = Rect(-0.1, lo, 0.1, hi) if h else Rect(lo, -0.1, hi, 0.1)
+  (ix1, ix2, iy1, iy2) = (i1, i2, j1, j2) if h else (j1, j2, i1, i2)
+  return Box(ix1, iy1, ix2, iy2, rect, r.choice([ 1, 2, 3 ]))
+
+
+@pytest.mark.parametrize("h", [ True, False ])
+@pytest.mark.parametrize("seed", range(5))
+def test_against_reference(h, seed):
+  r = random.Random(seed)
+  index = ShieldingIndex(h)
+  previous = []
+  for i in range(30):
+    current = [ _random_box(r, i, h) for k in range(r.randrange(0, 6)) ]
+    index.retire(i)
+    for b in current:
+      for wrt in previous:
+        assert index.is_shielded(b, wrt) == _reference(b, wrt, previous, h), (b, wrt)
+    index.add(current)
+    previous += current
+
+
+def test_shielding_box():
+  h = True
+  index = ShieldingIndex(h)
+  fp = Rect(-0.1, -0.1, 0.1, 0.1)
+  wrt = Box(0, 2, 0, 2, fp, 1)
+  shield = Box(1, 0, 1, 5, fp, 1)
+  index.add([ wrt, shield ])
+  index.retire(2)
+  # the shield ends before the sweep front
+  assert not index.is_shielded(Box(2, 2, 2, 2, fp, 1), wrt)
+  index = ShieldingIndex(h)
+  index.add([ wrt, shield ])
+  index.retire(1)
+  assert index.is_shielded(Box(1, 2, 1, 2, fp, 1), wrt)
+  # the shield is on an unrelated layer
+  assert not index.is_shielded(Box(1, 2, 1, 2, fp, 2), Box(0, 2, 0, 2, fp, 2))
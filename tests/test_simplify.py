@@ -0,0 +1,105 @@
+import klayout.db as kl
+
+from g2l import Graph, Solver, Tech, Via, Wire, generators, n, simplify_graph
+
+
+def _solve(graph: Graph) -> ({ int: float }, { int: float }):
+  solver = Solver(graph)
+  solver.solve()
+  return (solver.x_coordinates, solver.y_coordinates)
+
+
+def test_duplicates_are_removed():
+  metal1 = Tech.rules.layer("metal1")
+  graph = Graph()
+  a = Wire(0.2, metal1, n(0, 0), n(0, 1))
+  b = Wire(0.2, metal1, n(0, 0), n(0, 1))
+  c = Wire(0.3, metal1, n(0, 0), n(0, 1))
+  for w in (a, b, c):
+    graph.add(w)
+  (simplified, origins) = simplify_graph(graph)
+  assert simplified.components == [ a, c ]
+  assert origins == { a: [ a, b ], c: [ c ] }
+  assert len(graph.components) == 3
+
+
+def test_collinear_wires_are_merged():
+  poly = Tech.rules.layer("poly")
+  graph = Graph()
+  wires = [ Wire(0.15, poly, n(1, k), n(1, k + 1)) for k in range(3) ]
+  for w in wires:
+    graph.add(w)
+  (simplified, origins) = simplify_graph(graph)
+  assert len(simplified.components) == 1
+  merged = simplified.components[0]
+  assert (merged.n1.ixy(), merged.n2.ixy()) == ((1, 0), (1, 3))
+  assert origins[merged] == wires
+
+
+def test_wires_are_not_merged_at_attached_nodes():
+  poly = Tech.rules.layer("poly")
+  metal1 = Tech.rules.layer("metal1")
+  contact = Tech.rules.layer("contact")
+  graph = Graph()
+  graph.add(Wire(0.15, poly, n(1, 0), n(1, 1)))
+  graph.add(Wire(0.15, poly, n(1, 1), n(1, 2)))
+  graph.add(Via(n(1, 1), poly, contact, metal1))
+  # different widths and directions don't merge either
+  graph.add(Wire(0.15, poly, n(5, 0), n(5, 1)))
+  graph.add(Wire(0.3, poly, n(5, 1), n(5, 2)))
+  graph.add(Wire(0.15, poly, n(7, 0), n(7, 1)))
+  graph.add(Wire(0.15, poly, n(7, 1), n(8, 1)))
+  (simplified, origins) = simplify_graph(graph)
+  assert len(simplified.components) == len(graph.components)
+
+
+def test_simplified_graph_solves_the_same():
+  graph = generators.mosfet_array(3, 2)
+  doubled = Graph()
+  for c in graph.components:
+    doubled.add(c)
+  for c in generators.mosfet_array(3, 2).components:
+    doubled.add(c)
+  (simplified, origins) = simplify_graph(doubled)
+  assert len(simplified.components) == len(graph.components)
+  assert _solve(simplified) == _solve(graph)
+
+
+def test_zero_length_wire_is_kept():
+  metal1 = Tech.rules.layer("metal1")
+  graph = Graph()
+  dot = Wire(0.2, metal1, n(0, 0), n(0, 0))
+  graph.add(dot)
+  graph.add(Wire(0.2, metal1, n(1, 0), n(2, 0)))
+  (simplified, origins) = simplify_graph(graph)
+  assert dot in simplified.components
+  assert origins[dot] == [ dot ]
+  assert len(simplified.components) == 2
+
+
+def _merged_regions(graph: Graph) -> { str: kl.Region }:
+  solver = Solver(graph)
+  solver.solve()
+  layout = kl.Layout()
+  cell = layout.create_cell("TOP")
+  solver.produce(layout, cell)
+  return { str(layout.get_info(li)): kl.Region(cell.begin_shapes_rec(li)).merged() for li in layout.layer_indexes() if not cell.shapes(li).is_empty() }
+
+
+def test_merged_chains_produce_the_same_geometry():
+  poly = Tech.rules.layer("poly")
+  metal1 = Tech.rules.layer("metal1")
+  contact = Tech.rules.layer("contact")
+  graph = Graph()
+  for k in range(3):
+    graph.add(Wire(0.15, poly, n(1, k), n(1, k + 1)))
+    graph.add(Wire(0.2, metal1, n(k, 5), n(k + 1, 5)))
+  graph.add(Via(n(1, 3), poly, contact, metal1))
+  graph.add(Wire(0.2, metal1, n(1, 3), n(1, 5)))
+  (simplified, origins) = simplify_graph(graph)
+  assert len(simplified.components) < len(graph.components)
+  original = _merged_regions(graph)
+  merged = _merged_regions(simplified)
+  assert original.keys() == merged.keys()
+  for (layer, region) in original.items():
+    assert (region ^ merged[layer]).is_empty(), layer
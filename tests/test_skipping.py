@@ -0,0 +1,72 @@
+
+import random
+
+import pytest
+
+from g2l import MOSFET, Solver, Wire
+from g2l import generators
+
+
+def _solve_twice(graph, change, windowed):
+  """
+  Solves the graph, applies the change and solves again incrementally and from scratch
+
+  Both second solves start from the first solution. Returns the 
+  incremental solution, its statistics and the other solution.
+  """
+
+  solver = Solver(graph)
+  solver.solve(windowed = windowed)
+  start = (dict(solver.x_coordinates), dict(solver.y_coordinates))
+
+  undo = change()
+  try:
+    solver.update_footprints()
+    stats = solver.solve(initial_coordinates = (solver.x_coordinates, solver.y_coordinates), windowed = windowed)
+    reference = Solver(graph)
+    reference.solve(initial_coordinates = start, windowed = windowed)
+  finally:
+    undo()
+
+  return ((solver.x_coordinates, solver.y_coordinates), stats, (reference.x_coordinates, reference.y_coordinates))
+
+
+def _width_change(component, factor):
+  def change():
+    original = component.width
+    component.width = original * factor
+    def undo():
+      component.width = original
+    return undo
+  return change
+
+
+@pytest.mark.parametrize("seed", range(8))
+@pytest.mark.parametrize("windowed", [ False, True ])
+def test_incremental_solve_equals_full_solve(random_graph, seed, windowed):
+  graph = random_graph(seed, 40)
+  r = random.Random(seed)
+  candidates = [ c for c in graph.components if type(c) in (Wire, MOSFET) ]
+  component = r.choice(candidates)
+  (result, stats, reference) = _solve_twice(graph, _width_change(component, r.choice([ 0.5, 1.5, 3.0 ])), windowed)
+  assert result == reference
+
+
+@pytest.mark.parametrize("windowed", [ False, True ])
+def test_unchanged_footprints_skip_everything(windowed):
+  # a converged solution does not change if nothing changed
+  graph = generators.mosfet_array(6, 3)
+  (result, stats, reference) = _solve_twice(graph, lambda: (lambda: None), windowed)
+  assert result == reference
+  assert stats.converged
+  assert stats.indexes_skipped > 0
+  assert stats.pairs_evaluated == 0
+
+
+def test_no_skipping_outside_incremental_solves(random_graph):
+  graph = random_graph(5, 40)
+  solver = Solver(graph)
+  stats = solver.solve()
+  assert stats.indexes_skipped == 0
+  stats = solver.solve(initial_coordinates = (solver.x_coordinates, solver.y_coordinates))
+  assert stats.indexes_skipped == 0
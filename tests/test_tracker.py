@@ -0,0 +1,73 @@
+
+import klayout.db as kl
+
+from g2l import Graph, ProduceTracker, Solver, Tech, Wire, n
+from g2l import generators
+
+
+def _shapes(cell: kl.Cell) -> [str]:
+  layout = cell.layout()
+  return sorted(f"{layout.get_info(li)} {s}" for li in layout.layer_indexes() for s in cell.shapes(li).each())
+
+
+def test_tracker_produces_same_as_plain_produce():
+  solver = Solver(generators.inverter_chain(3))
+  solver.solve()
+  layout = kl.Layout()
+  plain = layout.create_cell("PLAIN")
+  solver.produce(layout, plain)
+  tracked = layout.create_cell("TRACKED")
+  tracker = ProduceTracker()
+  solver.produce(layout, tracked, tracker = tracker)
+  assert _shapes(plain) == _shapes(tracked)
+  assert tracker.inserted == len(solver.graph.components)
+  solver.produce(layout, tracked, tracker = tracker)
+  assert (tracker.inserted, tracker.deleted, tracker.kept) == (0, 0, len(solver.graph.components))
+  assert _shapes(plain) == _shapes(tracked)
+
+
+def test_tracker_updates_moved_and_removed_components():
+  metal1 = Tech.rules.layer("metal1")
+  graph = Graph()
+  a = Wire(0.2, metal1, n(0, 0), n(1, 0))
+  b = Wire(0.2, metal1, n(2, 0), n(3, 0))
+  graph.add(a)
+  graph.add(b)
+  layout = kl.Layout()
+  cell = layout.create_cell("TOP")
+  tracker = ProduceTracker()
+  solver = Solver(graph)
+  solver.solve()
+  solver.produce(layout, cell, tracker = tracker)
+
+  # rebuild without "a" - "b" moves to the left
+  graph = Graph()
+  graph.add(b)
+  solver = Solver(graph)
+  solver.solve()
+  solver.produce(layout, cell, tracker = tracker)
+  assert (tracker.inserted, tracker.deleted, tracker.kept) == (1, 2, 0)
+
+  fresh = layout.create_cell("FRESH")
+  solver.produce(layout, fresh)
+  assert _shapes(cell) == _shapes(fresh)
+
+
+def test_tracker_with_component_added_twice():
+  metal1 = Tech.rules.layer("metal1")
+  graph = Graph()
+  w = Wire(0.2, metal1, n(0, 0), n(1, 0))
+  graph.add(w)
+  graph.add(w)
+  graph.add(Wire(0.2, metal1, n(0, 1), n(1, 1)))
+  solver = Solver(graph)
+  solver.solve()
+  layout = kl.Layout()
+  cell = layout.create_cell("TOP")
+  tracker = ProduceTracker()
+  solver.produce(layout, cell, tracker = tracker)
+  assert tracker.inserted == 3
+  count = len(_shapes(cell))
+  solver.produce(layout, cell, tracker = tracker)
+  assert (tracker.inserted, tracker.deleted, tracker.kept) == (0, 0, 3)
+  assert len(_shapes(cell)) == count
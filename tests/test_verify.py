@@ -0,0 +1,74 @@
+import klayout.db as kl
+import pytest
+
+from g2l import Graph, Solver, Tech, Wire, generators, n, verify
+
+
+def _solved(graph: Graph) -> Solver:
+  solver = Solver(graph)
+  solver.solve()
+  return solver
+
+
+def _key(v) -> (int, int, str):
+  ep = v.edge_pair.normalized()
+  # the edges of a space check may come in either order
+  return (v.layer1, v.layer2) + tuple(sorted((str(ep.first), str(ep.second))))
+
+
+def test_clean():
+  for graph in (generators.inverter_chain(3), generators.routing_mesh(5, 5)):
+    assert verify(_solved(graph)) == []
+
+
+def test_space_violation():
+  metal1 = Tech.rules.layer("metal1")
+  graph = Graph()
+  a = Wire(0.2, metal1, n(0, 0), n(2, 0))
+  b = Wire(0.2, metal1, n(0, 1), n(2, 1))
+  graph.add(a)
+  graph.add(b)
+  solver = _solved(graph)
+  # the wires shrink to zero length otherwise
+  solver.x_coordinates[2] = 1.0
+  assert verify(solver) == []
+  space = Tech.rules.space(metal1, metal1)
+  # move the upper wire closer than the space, but not touching
+  solver.y_coordinates[1] = solver.y_coordinates[0] + 0.2 + space / 2
+  violations = verify(solver)
+  assert len(violations) == 1
+  v = violations[0]
+  assert (v.layer1, v.layer2, v.space) == (metal1, metal1, space)
+  assert v.distance == pytest.approx(space / 2)
+  assert { id(c) for c in v.components1 + v.components2 } == { id(a), id(b) }
+
+
+def _squeezed() -> Solver:
+  solver = _solved(generators.routing_mesh(8, 8))
+  # squeeze the layout to produce violations
+  for coordinates in (solver.x_coordinates, solver.y_coordinates):
+    for i in coordinates.keys():
+      coordinates[i] *= 0.8
+  return solver
+
+
+def test_overlapping_shapes_are_merged():
+  solver = _squeezed()
+  regions = {}
+  for c in solver.graph.components:
+    for (layer, box) in c.geometry(solver.graph, solver.x_coordinates, solver.y_coordinates):
+      regions.setdefault(layer, kl.Region()).insert(box.to_dbox().to_itype(0.001))
+  violations = verify(solver)
+  for (layer, region) in regions.items():
+    space = Tech.rules.space(layer, layer)
+    if space is not None:
+      expected = region.merged().space_check(int(round(space / 0.001)))
+      assert len([ v for v in violations if v.layer1 == layer and v.layer2 == layer ]) == expected.count()
+
+
+def test_tiled_is_same_as_untiled():
+  solver = _squeezed()
+  untiled = sorted(_key(v) for v in verify(solver))
+  assert len(untiled) > 0
+  tiled = sorted(_key(v) for v in verify(solver, tile_size = 1.0, threads = 2))
+  assert tiled == untiled
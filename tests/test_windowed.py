@@ -0,0 +1,20 @@
+import pytest
+
+from g2l import Solver, generators
+
+
+def _solve(graph, **kwargs):
+  solver = Solver(graph)
+  stats = solver.solve(**kwargs)
+  return (stats.status, solver.x_coordinates, solver.y_coordinates)
+
+
+@pytest.mark.parametrize("seed", [ 1, 2, 5, 7 ])
+def test_windowed_random(random_graph, seed):
+  # random graphs place indexes below the watermark, which needs the retired boxes
+  assert _solve(random_graph(seed, 80), windowed = True) == _solve(random_graph(seed, 80))
+
+
+@pytest.mark.parametrize("make_graph", [ lambda: generators.inverter_chain(4), lambda: generators.mosfet_array(4, 3), lambda: generators.routing_mesh(6, 6) ])
+def test_windowed_generators(make_graph):
+  assert _solve(make_graph(), windowed = True) == _solve(make_graph())